@@ -0,0 +1,64 @@
+"""Daily analytics rollup tables
+
+Revision ID: 002_analytics_rollups
+Revises: 001_initial
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002_analytics_rollups'
+down_revision = '001_initial'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    is_postgres = bind.dialect.name == 'postgresql'
+    
+    if is_postgres:
+        timestamp_default = sa.text('now()')
+    else:
+        timestamp_default = sa.text("(datetime('now'))")
+    
+    # Event counts per day and event type
+    op.create_table(
+        'analytics_daily_events',
+        sa.Column('day', sa.Date(), primary_key=True),
+        sa.Column('event_type', sa.String(), primary_key=True),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0')
+    )
+    
+    # Submission counts per day and status
+    op.create_table(
+        'analytics_daily_submissions',
+        sa.Column('day', sa.Date(), primary_key=True),
+        sa.Column('status', sa.String(), primary_key=True),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0')
+    )
+    
+    # Distinct sessions per day
+    op.create_table(
+        'analytics_daily_sessions',
+        sa.Column('day', sa.Date(), primary_key=True),
+        sa.Column('unique_sessions', sa.Integer(), nullable=False, server_default='0')
+    )
+    
+    # Rollup job bookkeeping
+    op.create_table(
+        'analytics_rollup_state',
+        sa.Column('name', sa.String(), primary_key=True),
+        sa.Column('covered_through', sa.Date(), nullable=True),
+        sa.Column('last_run_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=timestamp_default)
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('analytics_rollup_state')
+    op.drop_table('analytics_daily_sessions')
+    op.drop_table('analytics_daily_submissions')
+    op.drop_table('analytics_daily_events')
@@ -0,0 +1,38 @@
+"""Replace per-day session counts with HyperLogLog sketches
+
+Revision ID: 003_analytics_sketches
+Revises: 002_analytics_rollups
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003_analytics_sketches'
+down_revision = '002_analytics_rollups'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'analytics_daily_sketches',
+        sa.Column('day', sa.Date(), primary_key=True),
+        sa.Column('kind', sa.String(), primary_key=True),
+        sa.Column('sketch', sa.LargeBinary(), nullable=False)
+    )
+    op.drop_table('analytics_daily_sessions')
+    
+    # Force the rollup job to backfill sketches for every day
+    op.execute("DELETE FROM analytics_rollup_state")
+
+
+def downgrade() -> None:
+    op.create_table(
+        'analytics_daily_sessions',
+        sa.Column('day', sa.Date(), primary_key=True),
+        sa.Column('unique_sessions', sa.Integer(), nullable=False, server_default='0')
+    )
+    op.drop_table('analytics_daily_sketches')
+    op.execute("DELETE FROM analytics_rollup_state")
@@ -0,0 +1,106 @@
+"""Convert analytics_events to monthly range partitions (PostgreSQL only)
+
+Revision ID: 004_partition_analytics_events
+Revises: 003_analytics_sketches
+Create Date: 2026-10-18
+
+The primary key becomes (id, timestamp) because PostgreSQL requires the
+partition key in every unique constraint. Partitions are named
+analytics_events_pYYYYMM; rows outside every partition land in
+analytics_events_default. Future partitions and retention are handled by
+scripts/manage_partitions.py (or the in-process maintenance task).
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from datetime import date, datetime
+
+# revision identifiers, used by Alembic.
+revision = '004_partition_analytics_events'
+down_revision = '003_analytics_sketches'
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+COLUMNS = """
+    id UUID NOT NULL,
+    event_type VARCHAR NOT NULL,
+    event_data JSON,
+    session_id VARCHAR,
+    ip_address VARCHAR,
+    user_agent VARCHAR,
+    referrer VARCHAR,
+    timestamp TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now()
+"""
+
+
+def _add_months(day: date, months: int) -> date:
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _create_indexes() -> None:
+    op.create_index('ix_analytics_events_event_type', 'analytics_events', ['event_type'])
+    op.create_index('ix_analytics_events_session_id', 'analytics_events', ['session_id'])
+    op.create_index('ix_analytics_events_timestamp', 'analytics_events', ['timestamp'])
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        # SQLite has no declarative partitioning; keep the plain table
+        return
+    
+    op.execute("ALTER TABLE analytics_events RENAME TO analytics_events_legacy")
+    op.execute("ALTER TABLE analytics_events_legacy RENAME CONSTRAINT analytics_events_pkey TO analytics_events_legacy_pkey")
+    for column in ('event_type', 'session_id', 'timestamp'):
+        op.execute(f"ALTER INDEX IF EXISTS ix_analytics_events_{column} RENAME TO ix_analytics_events_legacy_{column}")
+    
+    op.execute(f"""
+        CREATE TABLE analytics_events (
+            {COLUMNS},
+            PRIMARY KEY (id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+    op.execute("CREATE TABLE analytics_events_default PARTITION OF analytics_events DEFAULT")
+    
+    # One partition per month from the oldest event through MONTHS_AHEAD months out
+    oldest = bind.execute(sa.text("SELECT min(timestamp) FROM analytics_events_legacy")).scalar()
+    current = datetime.utcnow().date().replace(day=1)
+    month = (oldest.date().replace(day=1) if oldest else current)
+    last = _add_months(current, MONTHS_AHEAD)
+    while month <= last:
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE analytics_events_p{month:%Y%m} PARTITION OF analytics_events "
+            f"FOR VALUES FROM ('{month}') TO ('{upper}')"
+        )
+        month = upper
+    
+    op.execute("INSERT INTO analytics_events SELECT id, event_type, event_data, session_id, ip_address, user_agent, referrer, timestamp FROM analytics_events_legacy")
+    op.execute("DROP TABLE analytics_events_legacy")
+    
+    # Indexes on the parent cascade to every partition
+    _create_indexes()
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    
+    op.execute("ALTER TABLE analytics_events RENAME TO analytics_events_partitioned")
+    for column in ('event_type', 'session_id', 'timestamp'):
+        op.execute(f"ALTER INDEX IF EXISTS ix_analytics_events_{column} RENAME TO ix_analytics_events_partitioned_{column}")
+    
+    op.execute(f"""
+        CREATE TABLE analytics_events (
+            {COLUMNS},
+            CONSTRAINT analytics_events_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute("INSERT INTO analytics_events SELECT id, event_type, event_data, session_id, ip_address, user_agent, referrer, timestamp FROM analytics_events_partitioned")
+    # Dropping the parent drops every partition
+    op.execute("DROP TABLE analytics_events_partitioned")
+    _create_indexes()
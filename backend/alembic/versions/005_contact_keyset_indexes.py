@@ -0,0 +1,32 @@
+"""Composite indexes for keyset pagination of contact submissions
+
+Revision ID: 005_contact_keyset_indexes
+Revises: 004_partition_analytics_events
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '005_contact_keyset_indexes'
+down_revision = '004_partition_analytics_events'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_contact_submissions_submitted_at_id',
+        'contact_submissions',
+        ['submitted_at', 'id']
+    )
+    op.create_index(
+        'ix_contact_submissions_status_submitted_at_id',
+        'contact_submissions',
+        ['status', 'submitted_at', 'id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contact_submissions_status_submitted_at_id', table_name='contact_submissions')
+    op.drop_index('ix_contact_submissions_submitted_at_id', table_name='contact_submissions')
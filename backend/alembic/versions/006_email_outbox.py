@@ -0,0 +1,60 @@
+"""Email outbox for background delivery
+
+Revision ID: 006_email_outbox
+Revises: 005_contact_keyset_indexes
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '006_email_outbox'
+down_revision = '005_contact_keyset_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    is_postgres = bind.dialect.name == 'postgresql'
+
+    if is_postgres:
+        id_type = postgresql.UUID(as_uuid=True)
+        timestamp_default = sa.text('now()')
+    else:
+        id_type = sa.String(36)
+        timestamp_default = sa.text("(datetime('now'))")
+
+    op.create_table(
+        'email_outbox',
+        sa.Column('id', id_type, primary_key=True),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('to_email', sa.String(), nullable=False),
+        sa.Column('subject', sa.String(), nullable=False),
+        sa.Column('html_body', sa.Text(), nullable=False),
+        sa.Column(
+            'submission_id',
+            id_type,
+            sa.ForeignKey('contact_submissions.id', ondelete='SET NULL'),
+            nullable=True
+        ),
+        sa.Column('status', sa.String(), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False, server_default=timestamp_default),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=timestamp_default),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=timestamp_default)
+    )
+    op.create_index(
+        'ix_email_outbox_status_next_attempt_at',
+        'email_outbox',
+        ['status', 'next_attempt_at']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_email_outbox_status_next_attempt_at', table_name='email_outbox')
+    op.drop_table('email_outbox')
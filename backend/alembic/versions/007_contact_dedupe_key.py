@@ -0,0 +1,32 @@
+"""Unique dedupe key on contact submissions
+
+Revision ID: 007_contact_dedupe_key
+Revises: 006_email_outbox
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007_contact_dedupe_key'
+down_revision = '006_email_outbox'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Nullable: existing rows have no key, and NULLs never conflict
+    op.add_column('contact_submissions', sa.Column('dedupe_key', sa.String(), nullable=True))
+    # A unique index rather than a constraint: SQLite cannot ALTER constraints
+    op.create_index(
+        'uq_contact_submissions_dedupe_key',
+        'contact_submissions',
+        ['dedupe_key'],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_contact_submissions_dedupe_key', table_name='contact_submissions')
+    op.drop_column('contact_submissions', 'dedupe_key')
@@ -0,0 +1,36 @@
+"""Per-table change versions for ETags
+
+Revision ID: 008_change_versions
+Revises: 007_contact_dedupe_key
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+from datetime import datetime
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008_change_versions'
+down_revision = '007_contact_dedupe_key'
+branch_labels = None
+depends_on = None
+
+TRACKED_TABLES = ('contact_submissions', 'analytics_events', 'analytics_rollups')
+
+
+def upgrade() -> None:
+    change_versions = op.create_table(
+        'change_versions',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+    now = datetime.utcnow()
+    op.bulk_insert(change_versions, [
+        {'name': name, 'version': 0, 'updated_at': now} for name in TRACKED_TABLES
+    ])
+
+
+def downgrade() -> None:
+    op.drop_table('change_versions')
@@ -1,11 +1,17 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Generator, Optional
+from app.core.config import settings
+from app.db.profiler import expose_profile
+from app.db.replica import replica_router
 from app.db.session import get_db
 from app.core.security import decode_token
 from app.models.user import User, UserRole
+from app.services.last_login import last_login_tracker
+from app.services.principals import Principal, principal_cache, revocations
 from datetime import datetime
+import uuid
 
 security = HTTPBearer()
 
@@ -13,8 +19,12 @@ security = HTTPBearer()
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user from JWT token."""
+) -> Principal:
+    """
+    Get current authenticated principal from JWT token.
+    Served from the token's role claim or the principal cache when possible,
+    so most requests do not touch the database.
+    """
     token = credentials.credentials
     payload = decode_token(token)
     
@@ -24,40 +34,84 @@ def get_current_user(
             detail="Could not validate credentials"
         )
     
-    user_id: str = payload.get("sub")
-    if user_id is None:
+    try:
+        user_id = uuid.UUID(payload.get("sub"))
+    except (TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials"
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
+    principal = _principal_from_claims(user_id, payload) or principal_cache.get(user_id)
+    
+    if principal is None:
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+        principal = Principal.from_user(user)
+        principal_cache.put(principal)
     
-    if not user.active:
+    if not principal.active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Inactive user"
         )
     
-    # Update last login
-    user.last_login = datetime.utcnow()
-    db.commit()
+    # Record activity; the tracker writes last_login in batches
+    last_login_tracker.record(principal.id)
+    revocations.track(principal.id)
+    
+    return principal
+
+
+def _principal_from_claims(user_id: uuid.UUID, payload: dict) -> Optional[Principal]:
+    """
+    Trust the token's role claim unless the user changed after it was issued.
+    Only inactive users are refused a token, so a trusted claim implies active.
+    """
+    if not settings.AUTH_ROLE_CLAIMS or not revocations.fresh:
+        return None
+    
+    role = payload.get("role")
+    issued_at = payload.get("iat")
+    if role is None or issued_at is None:
+        return None
+    
+    try:
+        role = UserRole(role)
+    except ValueError:
+        return None
     
-    return user
+    if revocations.is_revoked(user_id, datetime.utcfromtimestamp(issued_at)):
+        return None
+    return Principal(user_id, role)
 
 
 def get_current_admin(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     """Require admin role."""
     if current_user.role not in [UserRole.ADMIN, UserRole.EDITOR]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
+    expose_profile()
     return current_user
+
+
+def get_read_db(
+    current_user: Principal = Depends(get_current_user)
+) -> Generator[Session, None, None]:
+    """
+    Session for read-only endpoints: the read replica when one is configured,
+    unless this user wrote recently or the replica is lagging.
+    """
+    db = replica_router.session_factory(current_user.id)()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -1,13 +1,32 @@
-from fastapi import APIRouter, Depends, Request, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, Query, status
+from fastapi.responses import ORJSONResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import datetime, date, timedelta
-from typing import Optional
-from app.db.session import get_db
-from app.schemas.analytics import AnalyticsEventCreate, AnalyticsEventResponse, AnalyticsSummary
-from app.models.analytics import AnalyticsEvent
-from app.models.contact import ContactSubmission
-from app.api.deps import get_current_admin
+from datetime import date, timedelta
+from typing import Any, List, Optional
+from app.core.cache import cache, cache_key
+from app.core.config import settings
+from app.core.etag import etag_headers, etag_matches, not_modified, weak_etag
+from app.core.rate_limit import rate_limiter
+from app.db.session import get_async_db
+from app.models.change_version import ANALYTICS_EVENTS, ANALYTICS_ROLLUPS, CONTACT_SUBMISSIONS
+from app.schemas.analytics import (
+    AnalyticsEventCreate,
+    AnalyticsEventBatchItemResult,
+    AnalyticsEventBatchResponse,
+    AnalyticsSummary
+)
+from app.services.analytics_service import (
+    LIVE_SUMMARY_CACHE_TAG,
+    build_analytics_summary,
+    build_event_row,
+    async_record_events,
+    summary_cache_tags
+)
+from app.services.analytics_buffer import analytics_buffer
+from app.services.change_versions import get_versions
+from app.api.deps import get_current_admin, get_read_db
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,15 +34,25 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-@router.post("/event", response_model=dict, status_code=201)
+@router.post(
+    "/event",
+    response_model=dict,
+    status_code=201,
+    dependencies=[Depends(rate_limiter.limit(
+        "analytics-event",
+        per_minute=settings.RATE_LIMIT_PER_MINUTE,
+        burst=settings.RATE_LIMIT_BURST
+    ))]
+)
 async def track_event(
     event: AnalyticsEventCreate,
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Track an analytics event.
     Public endpoint - no authentication required.
+    Events are buffered and written in bulk by a background flusher.
     """
     try:
         # Get client info
@@ -31,37 +60,139 @@ async def track_event(
         user_agent = request.headers.get("user-agent")
         referrer = request.headers.get("referer")
         
-        # Create event
-        analytics_event = AnalyticsEvent(
-            event_type=event.event_type,
-            event_data=event.event_data,
-            session_id=event.session_id,
-            ip_address=client_host,
-            user_agent=user_agent,
-            referrer=referrer or event.referrer
-        )
+        row = build_event_row(event, client_host, user_agent, referrer)
+        
+        if analytics_buffer.running:
+            if not await analytics_buffer.enqueue(row):
+                return {"success": False, "message": "Event dropped"}
+            return {"success": True, "message": "Event tracked"}
         
-        db.add(analytics_event)
-        db.commit()
+        # Buffer disabled - write the event directly
+        await async_record_events(db, [row])
+        cache.invalidate(LIVE_SUMMARY_CACHE_TAG)
         
         return {"success": True, "message": "Event tracked"}
         
     except Exception as e:
         logger.error(f"Analytics tracking failed: {str(e)}")
-        db.rollback()
+        await db.rollback()
         # Don't fail the request - analytics should be silent
         return {"success": False, "message": "Event tracking failed"}
 
 
+@router.post(
+    "/events/batch",
+    response_model=AnalyticsEventBatchResponse,
+    status_code=201,
+    dependencies=[Depends(rate_limiter.limit(
+        "analytics-batch",
+        per_minute=settings.RATE_LIMIT_BATCH_PER_MINUTE,
+        burst=settings.RATE_LIMIT_BATCH_BURST
+    ))]
+)
+async def track_events_batch(
+    request: Request,
+    events: List[Any] = Body(...),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Track a batch of analytics events in a single transaction.
+    Public endpoint - no authentication required.
+    Invalid items are rejected individually; valid items are still stored.
+    """
+    if len(events) > settings.ANALYTICS_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch too large (max {settings.ANALYTICS_BATCH_MAX_SIZE} events)"
+        )
+    
+    # Get client info once for the whole batch
+    client_host = request.client.host if request.client else None
+    user_agent = request.headers.get("user-agent")
+    referrer = request.headers.get("referer")
+    
+    # Validate every item before touching the database
+    rows = []
+    results = []
+    for index, item in enumerate(events):
+        try:
+            event = AnalyticsEventCreate.model_validate(item)
+        except ValidationError as e:
+            results.append(AnalyticsEventBatchItemResult(
+                index=index,
+                accepted=False,
+                error=_format_validation_error(e)
+            ))
+            continue
+        
+        rows.append(build_event_row(event, client_host, user_agent, referrer))
+        results.append(AnalyticsEventBatchItemResult(index=index, accepted=True))
+    
+    success = True
+    try:
+        await async_record_events(db, rows)
+        if rows:
+            cache.invalidate(LIVE_SUMMARY_CACHE_TAG)
+    except Exception as e:
+        success = False
+        logger.error(f"Analytics batch tracking failed: {str(e)}")
+        await db.rollback()
+        # Don't fail the request - analytics should be silent
+        for result in results:
+            if result.accepted:
+                result.accepted = False
+                result.error = "Event tracking failed"
+        rows = []
+    
+    return AnalyticsEventBatchResponse(
+        success=success,
+        accepted=len(rows),
+        rejected=len(results) - len(rows),
+        results=results
+    )
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    """Summarize a pydantic validation error as a single line."""
+    first = error.errors()[0]
+    location = ".".join(str(part) for part in first.get("loc", ()))
+    return f"{location}: {first['msg']}" if location else first["msg"]
+
+
+@router.get("/ingest/stats", response_model=dict)
+def get_ingest_stats(
+    current_user = Depends(get_current_admin)
+):
+    """
+    Get analytics ingestion buffer counters (admin only).
+    """
+    return analytics_buffer.stats()
+
+
+@router.get("/cache/stats", response_model=dict)
+def get_cache_stats(
+    current_user = Depends(get_current_admin)
+):
+    """
+    Get application cache counters (admin only).
+    """
+    return cache.stats()
+
+
 @router.get("/summary", response_model=AnalyticsSummary)
 def get_analytics_summary(
+    request: Request,
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
-    db: Session = Depends(get_db),
+    exact: bool = Query(False, description="Count unique sessions/visitors exactly from raw events (slow, for audits)"),
+    db: Session = Depends(get_read_db),
     current_user = Depends(get_current_admin)
 ):
     """
     Get analytics summary (admin only).
+    Cached for CACHE_SUMMARY_TTL_SECONDS; concurrent requests for the same
+    range share one computation. Honors If-None-Match: 304 while no event,
+    submission or rollup has changed.
     """
     # Default to last 30 days if no dates provided
     if not end_date:
@@ -69,70 +200,17 @@ def get_analytics_summary(
     if not start_date:
         start_date = end_date - timedelta(days=30)
     
-    # Convert dates to datetime for queries
-    start_datetime = datetime.combine(start_date, datetime.min.time())
-    end_datetime = datetime.combine(end_date, datetime.max.time())
-    
-    # Total events in date range
-    total_events = db.query(func.count(AnalyticsEvent.id)).filter(
-        AnalyticsEvent.timestamp >= start_datetime,
-        AnalyticsEvent.timestamp <= end_datetime
-    ).scalar()
-    
-    # Total submissions in date range
-    total_submissions = db.query(func.count(ContactSubmission.id)).filter(
-        ContactSubmission.submitted_at >= start_datetime,
-        ContactSubmission.submitted_at <= end_datetime
-    ).scalar()
-    
-    # Unique sessions
-    unique_sessions = db.query(
-        func.count(func.distinct(AnalyticsEvent.session_id))
-    ).filter(
-        AnalyticsEvent.timestamp >= start_datetime,
-        AnalyticsEvent.timestamp <= end_datetime,
-        AnalyticsEvent.session_id.isnot(None)
-    ).scalar()
-    
-    # Top events
-    top_events_query = db.query(
-        AnalyticsEvent.event_type,
-        func.count(AnalyticsEvent.id).label('count')
-    ).filter(
-        AnalyticsEvent.timestamp >= start_datetime,
-        AnalyticsEvent.timestamp <= end_datetime
-    ).group_by(
-        AnalyticsEvent.event_type
-    ).order_by(
-        func.count(AnalyticsEvent.id).desc()
-    ).limit(10).all()
-    
-    top_events = [
-        {"event_type": event_type, "count": count}
-        for event_type, count in top_events_query
-    ]
-    
-    # Submissions by status
-    submissions_by_status_query = db.query(
-        ContactSubmission.status,
-        func.count(ContactSubmission.id).label('count')
-    ).filter(
-        ContactSubmission.submitted_at >= start_datetime,
-        ContactSubmission.submitted_at <= end_datetime
-    ).group_by(
-        ContactSubmission.status
-    ).all()
-    
-    submissions_by_status = {
-        status.value: count
-        for status, count in submissions_by_status_query
-    }
+    versions = get_versions(db, CONTACT_SUBMISSIONS, ANALYTICS_EVENTS, ANALYTICS_ROLLUPS)
+    etag = weak_etag(*versions, start_date, end_date, exact)
+    if etag_matches(request, etag):
+        return not_modified(etag)
     
-    return AnalyticsSummary(
-        total_events=total_events or 0,
-        total_submissions=total_submissions or 0,
-        unique_sessions=unique_sessions or 0,
-        date_range={"start": start_date, "end": end_date},
-        top_events=top_events,
-        submissions_by_status=submissions_by_status
+    # The cached value is already the serialized response. Keyed by version
+    # too, so a lagging replica cannot cache numbers the primary has moved past
+    summary = cache.get_or_load(
+        cache_key("analytics-summary", start_date, end_date, exact, *versions),
+        lambda: build_analytics_summary(db, start_date, end_date, exact=exact).model_dump(mode="json"),
+        ttl=settings.CACHE_SUMMARY_TTL_SECONDS,
+        tags=summary_cache_tags(end_date)
     )
+    return ORJSONResponse(summary, headers=etag_headers(etag))
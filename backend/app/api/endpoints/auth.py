@@ -1,9 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db
+from app.db.sqlite import serialize_writes
 from app.schemas.user import UserLogin, TokenResponse, UserResponse
 from app.models.user import User
-from app.core.security import verify_password, create_access_token
+from app.core.security import PasswordHasherBusy, create_access_token, password_hasher
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,15 +14,17 @@ router = APIRouter()
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(
+async def login(
     credentials: UserLogin,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Login with email and password to get access token.
     """
     # Find user by email
-    user = db.query(User).filter(User.email == credentials.email).first()
+    user = (await db.execute(
+        select(User).where(User.email == credentials.email)
+    )).scalar_one_or_none()
     
     if not user:
         raise HTTPException(
@@ -28,8 +32,17 @@ def login(
             detail="Incorrect email or password"
         )
     
-    # Verify password
-    if not verify_password(credentials.password, user.password):
+    # Verify password on the bounded hashing pool
+    try:
+        valid = await password_hasher.verify_async(credentials.password, user.password)
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts in progress. Please try again shortly.",
+            headers={"Retry-After": "1"}
+        )
+    
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -42,8 +55,12 @@ def login(
             detail="User account is inactive"
         )
     
+    # Upgrade the hash if BCRYPT_ROUNDS changed since it was made
+    if password_hasher.needs_rehash(user.password):
+        await _rehash_password(db, user, credentials.password)
+    
     # Create access token
-    access_token = create_access_token(data={"sub": str(user.id)})
+    access_token = create_access_token(data={"sub": str(user.id), "role": user.role.value})
     
     return TokenResponse(
         access_token=access_token,
@@ -58,3 +75,25 @@ def logout():
     Logout (client should discard the token).
     """
     return {"success": True, "message": "Logged out successfully"}
+
+
+async def _rehash_password(db: AsyncSession, user: User, password: str) -> None:
+    """Store a new hash with the current work factor. Failures never block login."""
+    try:
+        new_hash = await password_hasher.hash_async(password)
+        # Core UPDATE: a new hash is not a role/active change, so it should not
+        # touch updated_at or revoke the user's tokens
+        async with serialize_writes(db):
+            await db.execute(
+                update(User).where(User.id == user.id).values(
+                    password=new_hash,
+                    updated_at=User.updated_at
+                )
+            )
+            await db.commit()
+    except PasswordHasherBusy:
+        # Try again on a later login
+        pass
+    except Exception as e:
+        logger.error(f"Password rehash failed for user {user.id}: {str(e)}")
+        await db.rollback()
@@ -1,33 +1,101 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
 from typing import Optional
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
+from app.db.sqlite import serialize_writes
 from app.schemas.contact import (
     ContactSubmissionCreate,
     ContactSubmissionResponse,
     ContactSubmissionUpdate,
-    ContactSubmissionList
+    ContactSubmissionList,
+    TotalMode
 )
+from app.models.change_version import CONTACT_SUBMISSIONS
 from app.models.contact import ContactSubmission, ContactStatus
+from app.services.analytics_service import SUMMARY_CACHE_TAG
+from app.services.change_versions import async_bump_versions, bump_versions, get_versions
 from app.services.email_service import email_service
-from app.api.deps import get_current_admin
+from app.services.email_outbox import email_outbox_worker, outbox_counts
+from app.services.submission_filter import submission_filter
+from app.core.cache import cache, cache_key
+from app.core.config import settings
+from app.core.etag import etag_headers, etag_matches, not_modified, weak_etag
+from app.core.pagination import count_rows, decode_cursor, encode_cursor
+from app.core.rate_limit import rate_limiter
+from app.api.deps import get_current_admin, get_read_db
+from app.db.replica import replica_router
 import logging
+import time
+import uuid
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Cache tag for submission detail entries, invalidated by updates
+SUBMISSIONS_CACHE_TAG = "contact-submissions"
 
-@router.post("/", response_model=dict, status_code=status.HTTP_201_CREATED)
+# Columns of ContactSubmissionResponse, selected directly for list pages
+SUBMISSION_COLUMNS = tuple(
+    getattr(ContactSubmission, name) for name in ContactSubmissionResponse.model_fields
+)
+
+
+@router.post(
+    "/",
+    response_model=dict,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limiter.limit(
+        "contact",
+        per_minute=settings.RATE_LIMIT_CONTACT_PER_MINUTE,
+        burst=settings.RATE_LIMIT_CONTACT_BURST
+    ))]
+)
 async def create_contact_submission(
     contact: ContactSubmissionCreate,
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Submit a contact form.
     Public endpoint - no authentication required.
+    Resubmitting the same email and message within the dedupe window returns
+    the original submission instead of storing (and emailing) it again.
     """
+    fingerprint = submission_filter.fingerprint(contact.email, contact.message)
+    
+    # Duplicates and spam are rejected before any database work
+    existing_id = submission_filter.recent(fingerprint)
+    if existing_id is not None:
+        return _submission_accepted(existing_id)
+    
+    if submission_filter.is_spam(contact):
+        logger.info(f"Contact submission rejected as spam from {contact.email}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Your message could not be submitted. Please email us directly."
+        )
+    
+    now = time.time()
+    dedupe_key = submission_filter.dedupe_key(fingerprint, now)
+    
+    # Stored by another worker in the previous dedupe bucket, within the window
+    existing_id = await db.scalar(
+        select(ContactSubmission.id).where(
+            ContactSubmission.dedupe_key == submission_filter.previous_dedupe_key(fingerprint, now),
+            ContactSubmission.submitted_at >= datetime.utcnow() - timedelta(seconds=submission_filter.window)
+        )
+    )
+    if existing_id is not None:
+        submission_filter.record_db_duplicate()
+        submission_filter.remember(fingerprint, existing_id)
+        return _submission_accepted(existing_id)
+    
     try:
         # Get client info
         client_host = request.client.host if request.client else None
@@ -40,100 +108,180 @@ async def create_contact_submission(
             company=contact.company,
             message=contact.message,
             ip_address=client_host,
-            user_agent=user_agent
+            user_agent=user_agent,
+            dedupe_key=dedupe_key
         )
         
-        db.add(submission)
-        db.commit()
-        db.refresh(submission)
-        
-        # Send emails asynchronously (don't block the response)
-        try:
-            await email_service.send_lead_notification(
-                contact_name=contact.name,
-                contact_email=contact.email,
-                contact_company=contact.company or "Not provided",
-                contact_message=contact.message,
-                submission_id=str(submission.id)
-            )
+        async with serialize_writes(db):
+            db.add(submission)
+            await db.flush()
             
-            await email_service.send_auto_reply(
-                contact_name=contact.name,
-                contact_email=contact.email
-            )
-        except Exception as e:
-            logger.error(f"Email sending failed: {str(e)}")
-            # Don't fail the request if email fails
-        
-        return {
-            "success": True,
-            "message": "Thank you for your message. We'll be in touch within 24 hours!",
-            "submission_id": str(submission.id)
-        }
+            # Queue the notification and auto-reply in the same transaction;
+            # the outbox worker delivers them after the response is sent
+            email_service.queue_contact_emails(db, submission)
+            await async_bump_versions(db, CONTACT_SUBMISSIONS)
+            await db.commit()
+        email_outbox_worker.notify()
+        cache.invalidate(SUMMARY_CACHE_TAG)
         
+    except IntegrityError:
+        # Same payload already stored by another request or worker
+        await db.rollback()
+        existing_id = await db.scalar(
+            select(ContactSubmission.id).where(ContactSubmission.dedupe_key == dedupe_key)
+        )
+        if existing_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to submit contact form. Please try again."
+            )
+        submission_filter.record_db_duplicate()
+        submission_filter.remember(fingerprint, existing_id)
+        return _submission_accepted(existing_id)
+    
     except Exception as e:
         logger.error(f"Contact submission failed: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to submit contact form. Please try again."
         )
+    
+    submission_filter.remember(fingerprint, submission.id)
+    return _submission_accepted(submission.id)
+
+
+def _submission_accepted(submission_id: uuid.UUID) -> dict:
+    return {
+        "success": True,
+        "message": "Thank you for your message. We'll be in touch within 24 hours!",
+        "submission_id": str(submission_id)
+    }
 
 
 @router.get("/submissions", response_model=ContactSubmissionList)
 def get_contact_submissions(
+    request: Request,
     skip: int = 0,
-    limit: int = 50,
+    limit: int = Query(50, ge=1),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    total: TotalMode = Query(TotalMode.EXACT, description="How to compute the total: exact, estimate or none"),
     status_filter: Optional[ContactStatus] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user = Depends(get_current_admin)
 ):
     """
     Get all contact submissions (admin only).
+    Newest first. Pass `cursor` (keyset pagination) instead of `skip` to page
+    without OFFSET; `skip` is kept for compatibility.
+    Honors If-None-Match: 304 while no submission has changed.
+    Rows are serialized straight to JSON without building response models.
     """
-    query = db.query(ContactSubmission)
+    etag = weak_etag(
+        *get_versions(db, CONTACT_SUBMISSIONS),
+        skip, limit, cursor, total.value, status_filter.value if status_filter else None
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    query = select(*SUBMISSION_COLUMNS)
     
     if status_filter:
-        query = query.filter(ContactSubmission.status == status_filter)
-    
-    total = query.count()
-    submissions = query.order_by(
-        ContactSubmission.submitted_at.desc()
-    ).offset(skip).limit(limit).all()
-    
-    return ContactSubmissionList(
-        total=total,
-        items=submissions,
-        skip=skip,
-        limit=limit
+        query = query.where(ContactSubmission.status == status_filter)
+    
+    total_count, total_is_estimate = None, False
+    if total != TotalMode.NONE:
+        total_count, total_is_estimate = count_rows(
+            db, query, estimate=total == TotalMode.ESTIMATE
+        )
+    
+    if cursor:
+        try:
+            after_submitted_at, after_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        query = query.where(
+            tuple_(ContactSubmission.submitted_at, ContactSubmission.id)
+            < tuple_(after_submitted_at, after_id)
+        )
+        skip = 0
+    
+    # Fetch one extra row to know whether another page exists
+    result = db.execute(
+        query.order_by(
+            ContactSubmission.submitted_at.desc(),
+            ContactSubmission.id.desc()
+        ).offset(skip).limit(limit + 1)
+    )
+    keys = list(result.keys())
+    items = [dict(zip(keys, row)) for row in result]
+    
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor(last["submitted_at"], last["id"])
+    
+    # Same shape as ContactSubmissionList; orjson handles UUIDs, datetimes and enums
+    return ORJSONResponse(
+        {
+            "total": total_count,
+            "total_is_estimate": total_is_estimate,
+            "items": items,
+            "skip": skip,
+            "limit": limit,
+            "next_cursor": next_cursor,
+        },
+        headers=etag_headers(etag)
     )
 
 
 @router.get("/submissions/{submission_id}", response_model=ContactSubmissionResponse)
 def get_contact_submission(
-    submission_id: str,
-    db: Session = Depends(get_db),
+    submission_id: uuid.UUID,
+    request: Request,
+    db: Session = Depends(get_read_db),
     current_user = Depends(get_current_admin)
 ):
     """
     Get a specific contact submission (admin only).
+    Honors If-None-Match: 304 while no submission has changed.
     """
-    submission = db.query(ContactSubmission).filter(
-        ContactSubmission.id == submission_id
-    ).first()
+    versions = get_versions(db, CONTACT_SUBMISSIONS)
+    etag = weak_etag(*versions, submission_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
     
-    if not submission:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Submission not found"
-        )
+    def load():
+        submission = db.query(ContactSubmission).filter(
+            ContactSubmission.id == submission_id
+        ).first()
+        
+        if not submission:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Submission not found"
+            )
+        
+        return ContactSubmissionResponse.model_validate(submission).model_dump(mode="json")
     
-    return submission
+    # The cached value is already the serialized response. Keyed by version
+    # too, so a lagging replica cannot cache a row the primary has since changed
+    submission = cache.get_or_load(
+        cache_key("contact-submission", submission_id, *versions),
+        load,
+        ttl=settings.CACHE_SUBMISSION_TTL_SECONDS,
+        tags=[SUBMISSIONS_CACHE_TAG]
+    )
+    return ORJSONResponse(submission, headers=etag_headers(etag))
 
 
 @router.patch("/submissions/{submission_id}", response_model=ContactSubmissionResponse)
 def update_contact_submission(
-    submission_id: str,
+    submission_id: uuid.UUID,
     update_data: ContactSubmissionUpdate,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_admin)
@@ -159,7 +307,34 @@ def update_contact_submission(
     if update_data.notes is not None:
         submission.notes = update_data.notes
     
+    bump_versions(db, CONTACT_SUBMISSIONS)
     db.commit()
     db.refresh(submission)
+    replica_router.record_write(current_user.id)
+    # Status counts feed the analytics summary
+    cache.invalidate(SUBMISSIONS_CACHE_TAG, SUMMARY_CACHE_TAG)
     
     return submission
+
+
+@router.get("/email-outbox", response_model=dict)
+async def get_email_outbox_stats(
+    current_user = Depends(get_current_admin)
+):
+    """
+    Get email outbox counts per status and worker counters (admin only).
+    """
+    return {
+        "counts": await outbox_counts(),
+        "worker": email_outbox_worker.stats()
+    }
+
+
+@router.get("/filter-stats", response_model=dict)
+async def get_submission_filter_stats(
+    current_user = Depends(get_current_admin)
+):
+    """
+    Get duplicate and spam filter counters (admin only).
+    """
+    return submission_filter.stats()
@@ -0,0 +1,88 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from datetime import date, datetime
+from typing import Optional
+from app.models.analytics import AnalyticsEvent
+from app.models.contact import ContactSubmission, ContactStatus
+from app.services.export_service import (
+    EXPORT_FORMATS,
+    MEDIA_TYPES,
+    export_filename,
+    stream_export
+)
+from app.db.replica import replica_router
+from app.api.deps import get_current_admin
+
+router = APIRouter()
+
+FORMAT_PATTERN = f"^({'|'.join(EXPORT_FORMATS)})$"
+
+
+@router.get("/events")
+def export_events(
+    format: str = Query("csv", pattern=FORMAT_PATTERN),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    event_type: Optional[str] = Query(None),
+    gzip: bool = Query(False, description="Compress the export on the fly"),
+    current_user = Depends(get_current_admin)
+):
+    """
+    Stream analytics events as CSV or NDJSON (admin only).
+    """
+    table = AnalyticsEvent.__table__
+    statement = select(table).order_by(table.c.timestamp)
+    
+    if start_date:
+        statement = statement.where(table.c.timestamp >= datetime.combine(start_date, datetime.min.time()))
+    if end_date:
+        statement = statement.where(table.c.timestamp <= datetime.combine(end_date, datetime.max.time()))
+    if event_type:
+        statement = statement.where(table.c.event_type == event_type)
+    
+    return _streaming_response(
+        statement, table.columns.keys(), "analytics-events", format, gzip,
+        replica_router.session_factory(current_user.id)
+    )
+
+
+@router.get("/submissions")
+def export_submissions(
+    format: str = Query("csv", pattern=FORMAT_PATTERN),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    status_filter: Optional[ContactStatus] = None,
+    gzip: bool = Query(False, description="Compress the export on the fly"),
+    current_user = Depends(get_current_admin)
+):
+    """
+    Stream contact submissions as CSV or NDJSON (admin only).
+    """
+    table = ContactSubmission.__table__
+    # dedupe_key is an internal duplicate guard, not submission data
+    columns = [column for column in table.columns if column.key != "dedupe_key"]
+    statement = select(*columns).order_by(table.c.submitted_at)
+    
+    if start_date:
+        statement = statement.where(table.c.submitted_at >= datetime.combine(start_date, datetime.min.time()))
+    if end_date:
+        statement = statement.where(table.c.submitted_at <= datetime.combine(end_date, datetime.max.time()))
+    if status_filter:
+        statement = statement.where(table.c.status == status_filter)
+    
+    return _streaming_response(
+        statement, [column.key for column in columns], "contact-submissions", format, gzip,
+        replica_router.session_factory(current_user.id)
+    )
+
+
+def _streaming_response(
+    statement, columns, name: str, fmt: str, compress: bool, session_factory
+) -> StreamingResponse:
+    filename = export_filename(name, fmt, compress)
+    return StreamingResponse(
+        stream_export(statement, columns, fmt, compress, session_factory),
+        media_type="application/gzip" if compress else MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -0,0 +1,103 @@
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.replica import replica_router
+from app.db.session import async_engine, engine, read_engine
+from app.services.analytics_buffer import analytics_buffer
+from app.services.email_outbox import email_outbox_worker
+import hmac
+
+router = APIRouter()
+
+POOLS = (("primary", engine), ("primary-async", async_engine.sync_engine))
+if read_engine is not None:
+    POOLS += (("replica", read_engine),)
+
+
+def _pool_gauge(method: str):
+    """Samples of a QueuePool accessor for every engine (read at scrape time)."""
+    def collect():
+        for name, pool_engine in POOLS:
+            accessor = getattr(pool_engine.pool, method, None)
+            if accessor is not None:
+                yield (name,), accessor()
+    return collect
+
+
+metrics.callback("db_pool_size", "Connections the pool keeps open.", ("pool",), _pool_gauge("size"))
+metrics.callback("db_pool_checked_out", "Connections currently checked out.", ("pool",), _pool_gauge("checkedout"))
+metrics.callback("db_pool_checked_in", "Idle connections in the pool.", ("pool",), _pool_gauge("checkedin"))
+metrics.callback("db_pool_overflow", "Connections open beyond pool_size (negative while below it).", ("pool",), _pool_gauge("overflow"))
+metrics.callback(
+    "db_reads_total",
+    "Admin reads by the database that served them and why.",
+    ("target", "reason"),
+    lambda: [
+        (("replica", "default"), replica_router.replica_reads),
+        (("primary", "recent_write"), replica_router.primary_reads_recent_write),
+        (("primary", "replica_lag"), replica_router.primary_reads_lag),
+    ] if replica_router.enabled else [],
+    kind="counter"
+)
+metrics.callback(
+    "db_replica_lag_seconds",
+    "Replica replay lag at the last check.",
+    (),
+    lambda: [((), replica_router.stats()["replica_lag_seconds"])] if replica_router.enabled else []
+)
+metrics.callback(
+    "analytics_buffer_depth",
+    "Analytics events waiting to be written.",
+    (),
+    lambda: [((), analytics_buffer.depth)]
+)
+metrics.callback(
+    "analytics_buffer_capacity",
+    "Maximum analytics events the buffer holds.",
+    (),
+    lambda: [((), analytics_buffer.max_size)]
+)
+metrics.callback(
+    "analytics_events_total",
+    "Analytics events by buffer outcome.",
+    ("outcome",),
+    lambda: [
+        (("queued",), analytics_buffer.queued),
+        (("flushed",), analytics_buffer.flushed),
+        (("dropped",), analytics_buffer.dropped),
+        (("failed",), analytics_buffer.failed),
+    ],
+    kind="counter"
+)
+metrics.callback(
+    "emails_total",
+    "Outbox email delivery attempts by outcome.",
+    ("outcome",),
+    lambda: [
+        (("sent",), email_outbox_worker.sent),
+        (("retried",), email_outbox_worker.retried),
+        (("dead",), email_outbox_worker.dead),
+    ],
+    kind="counter"
+)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics(request: Request):
+    """
+    Prometheus metrics for this worker.
+    Requires `Authorization: Bearer <METRICS_TOKEN>` when METRICS_TOKEN is set;
+    without one it is not served in production.
+    """
+    if not settings.METRICS_TOKEN and settings.ENVIRONMENT == "production":
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if settings.METRICS_TOKEN:
+        supplied = request.headers.get("authorization", "").removeprefix("Bearer ").strip()
+        if not hmac.compare_digest(supplied.encode(), settings.METRICS_TOKEN.encode()):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid metrics token",
+                headers={"WWW-Authenticate": "Bearer"}
+            )
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,28 @@
+"""
+Application cache: `cache` is built from the CACHE_* settings.
+"""
+from app.core.cache.backends import CacheBackend, MemoryBackend, NullBackend, RedisBackend, create_backend
+from app.core.cache.cache import Cache, cache_key
+from app.core.config import settings
+
+# Singleton instance
+cache = Cache(
+    backend=create_backend(
+        settings.CACHE_BACKEND,
+        max_entries=settings.CACHE_MAX_ENTRIES,
+        redis_url=settings.CACHE_REDIS_URL,
+        prefix=settings.CACHE_KEY_PREFIX
+    ),
+    default_ttl=settings.CACHE_DEFAULT_TTL_SECONDS
+)
+
+__all__ = [
+    "Cache",
+    "CacheBackend",
+    "MemoryBackend",
+    "NullBackend",
+    "RedisBackend",
+    "cache",
+    "cache_key",
+    "create_backend",
+]
@@ -0,0 +1,165 @@
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import json
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """Key/value storage behind `Cache`. Tag versions live alongside the entries."""
+
+    name = "none"
+
+    def get(self, key: str) -> Optional[Any]:
+        return None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        pass
+
+    def delete(self, key: str) -> None:
+        pass
+
+    def tag_versions(self, tags: Iterable[str]) -> List[int]:
+        return [0 for _ in tags]
+
+    def bump_tag(self, tag: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name}
+
+
+class NullBackend(CacheBackend):
+    """Stores nothing (CACHE_BACKEND=none); single-flight still applies."""
+
+
+class MemoryBackend(CacheBackend):
+    """In-process TTL cache with LRU eviction once `max_entries` is reached."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        # Never evicted: a reset version could make stale entries valid again
+        self._tags: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        # Counters
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def tag_versions(self, tags: Iterable[str]) -> List[int]:
+        with self._lock:
+            return [self._tags.get(tag, 0) for tag in tags]
+
+    def bump_tag(self, tag: str) -> None:
+        with self._lock:
+            self._tags[tag] = self._tags.get(tag, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": self.name,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class RedisBackend(CacheBackend):
+    """
+    Cache shared by every worker through a (local) Redis-compatible server.
+    Values are stored as JSON; tag versions are plain counters.
+    """
+
+    name = "redis"
+
+    def __init__(self, client, prefix: str):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self.client.set(self.prefix + key, json.dumps(value), px=max(1, int(ttl * 1000)))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def tag_versions(self, tags: Iterable[str]) -> List[int]:
+        tags = list(tags)
+        if not tags:
+            return []
+        values = self.client.mget([f"{self.prefix}tag:{tag}" for tag in tags])
+        return [int(value or 0) for value in values]
+
+    def bump_tag(self, tag: str) -> None:
+        self.client.incr(f"{self.prefix}tag:{tag}")
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {"backend": self.name}
+        try:
+            info = self.client.info("stats")
+            stats["evictions"] = info.get("evicted_keys", 0)
+            stats["expirations"] = info.get("expired_keys", 0)
+        except Exception as e:
+            stats["error"] = str(e)
+        return stats
+
+
+def create_backend(name: str, max_entries: int, redis_url: str, prefix: str) -> CacheBackend:
+    """Build the configured backend, falling back to memory if Redis is unavailable."""
+    if name == "none":
+        return NullBackend()
+    if name == "redis":
+        try:
+            import redis
+        except ImportError:
+            logger.warning("CACHE_BACKEND=redis but the redis package is not installed; using memory cache")
+            return MemoryBackend(max_entries)
+        client = redis.Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        return RedisBackend(client, prefix)
+    return MemoryBackend(max_entries)
@@ -0,0 +1,170 @@
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence
+from app.core.cache.backends import CacheBackend
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    """One in-progress load that concurrent callers for the same key wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class Cache:
+    """
+    Read-through cache with single-flight loading and tag invalidation.
+
+    `get_or_load` returns a cached value or runs the loader; concurrent
+    callers for the same key wait for one load instead of each running it.
+    Entries remember the version of each of their tags when the load began,
+    and `invalidate` bumps a tag's version, so every entry carrying it
+    (including one being loaded right now) becomes stale at once.
+
+    Values must be JSON-serializable (the Redis backend stores JSON) and are
+    shared between callers, so treat them as read-only; None is never cached.
+    Backend errors are logged and treated as misses; the cache never fails a
+    request.
+    """
+
+    def __init__(self, backend: CacheBackend, default_ttl: float):
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.coalesced = 0
+        self.load_errors = 0
+        self.backend_errors = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            entry = self.backend.get(key)
+            if entry is not None:
+                tags = entry["tags"]
+                if self.backend.tag_versions(tags) == list(tags.values()):
+                    self._count("hits")
+                    return entry["value"]
+        except Exception as e:
+            self._backend_error("get", e)
+        self._count("misses")
+        return None
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Sequence[str] = (),
+        tag_versions: Optional[Sequence[int]] = None
+    ) -> None:
+        try:
+            if tag_versions is None:
+                tag_versions = self.backend.tag_versions(tags)
+            entry = {"value": value, "tags": dict(zip(tags, tag_versions))}
+            self.backend.set(key, entry, self.default_ttl if ttl is None else ttl)
+        except Exception as e:
+            self._backend_error("set", e)
+
+    def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl: Optional[float] = None,
+        tags: Sequence[str] = ()
+    ) -> Any:
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            # Versions from before the load: an invalidation during it wins
+            try:
+                versions = self.backend.tag_versions(tags)
+            except Exception as e:
+                self._backend_error("tag_versions", e)
+                versions = None
+            self._count("loads")
+            value = flight.value = loader()
+            if versions is not None:
+                self.set(key, value, ttl, tags, versions)
+            return value
+        except BaseException as e:
+            flight.error = e
+            self._count("load_errors")
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def delete(self, key: str) -> None:
+        try:
+            self.backend.delete(key)
+        except Exception as e:
+            self._backend_error("delete", e)
+
+    def invalidate(self, *tags: str) -> None:
+        """Make every entry carrying any of `tags` stale."""
+        for tag in tags:
+            try:
+                self.backend.bump_tag(tag)
+            except Exception as e:
+                self._backend_error("invalidate", e)
+        self._count("invalidations", len(tags))
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "loads": self.loads,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._flights),
+                "load_errors": self.load_errors,
+                "backend_errors": self.backend_errors,
+                "invalidations": self.invalidations,
+            }
+        stats.update(self.backend.stats())
+        return stats
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def _backend_error(self, operation: str, error: Exception) -> None:
+        self._count("backend_errors")
+        logger.warning(f"Cache {operation} failed: {str(error)}")
+
+
+def cache_key(*parts: Any) -> str:
+    """Join key parts: cache_key("summary", start, end) -> "summary:2026-01-01:2026-01-31"."""
+    return ":".join(str(part) for part in parts)
@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import field_validator
-from typing import List, Union
+from typing import List, Optional, Union
 
 
 class Settings(BaseSettings):
@@ -10,14 +10,32 @@ class Settings(BaseSettings):
     API_V1_PREFIX: str = "/api/v1"
     ENVIRONMENT: str = "development"
     DEBUG: bool = True
+    DOCS_ENABLED: Optional[bool] = None  # /docs, /redoc and the OpenAPI schema; default: off in production
     
     # Database
     DATABASE_URL: str
+    DATABASE_READ_URL: Optional[str] = None  # read replica for admin reads; unset = everything on the primary
+    READ_YOUR_WRITES_SECONDS: float = 10.0  # users who wrote this recently read from the primary
+    REPLICA_MAX_LAG_SECONDS: float = 5.0  # read from the primary while the replica is further behind
+    REPLICA_LAG_CHECK_SECONDS: float = 5.0
+    # SQLite only (small deployments, staging)
+    SQLITE_TUNED: bool = True  # WAL, synchronous=NORMAL, mmap and page cache on every connection
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # wait this long for a lock before "database is locked"
+    SQLITE_MMAP_SIZE_MB: int = 256
+    SQLITE_CACHE_SIZE_MB: int = 64  # page cache per connection
     
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 10080  # 7 days
+    LAST_LOGIN_FLUSH_SECONDS: int = 60
+    BCRYPT_ROUNDS: int = 12  # existing hashes are upgraded on the next login
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 8  # logins beyond workers + pending get 429
+    AUTH_ROLE_CLAIMS: bool = True  # trust role claims in tokens unless revoked
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60  # 0 disables the principal cache
+    PRINCIPAL_CACHE_MAX_SIZE: int = 1024
+    REVOCATION_REFRESH_SECONDS: int = 30
     
     # CORS
     FRONTEND_URL: str
@@ -28,9 +46,67 @@ class Settings(BaseSettings):
     FROM_EMAIL: str
     FROM_NAME: str = "ATTEC"
     NOTIFICATION_EMAIL: str
+    EMAIL_TRANSPORT: str = "sendgrid"  # "sendgrid", "smtp", "console" or "memory"
+    SENDGRID_API_URL: str = "https://api.sendgrid.com"
+    SMTP_HOST: str = "localhost"
+    SMTP_PORT: int = 25
+    SMTP_USERNAME: Optional[str] = None
+    SMTP_PASSWORD: Optional[str] = None
+    SMTP_USE_TLS: bool = False
+    EMAIL_OUTBOX_ENABLED: bool = True  # False leaves delivery to scripts/email_outbox.py
+    EMAIL_MAX_CONCURRENCY: int = 4
+    EMAIL_BATCH_SIZE: int = 20
+    EMAIL_POLL_INTERVAL_SECONDS: float = 5.0
+    EMAIL_SEND_TIMEOUT_SECONDS: float = 10.0
+    EMAIL_MAX_ATTEMPTS: int = 8
+    EMAIL_RETRY_BASE_SECONDS: float = 30.0
+    EMAIL_RETRY_MAX_SECONDS: float = 3600.0
+    
+    # Contact Form Filtering
+    CONTACT_DEDUPE_WINDOW_SECONDS: int = 600
+    CONTACT_DEDUPE_MAX_ENTRIES: int = 100000
+    SPAM_SCORE_THRESHOLD: int = 4
     
     # Rate Limiting
-    RATE_LIMIT_PER_MINUTE: int = 100
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_PER_MINUTE: int = 100  # analytics events per client
+    RATE_LIMIT_BURST: int = 50
+    RATE_LIMIT_BATCH_PER_MINUTE: int = 20
+    RATE_LIMIT_BATCH_BURST: int = 10
+    RATE_LIMIT_CONTACT_PER_MINUTE: int = 5
+    RATE_LIMIT_CONTACT_BURST: int = 5
+    RATE_LIMIT_STORAGE: str = "shared"  # "shared" (all workers on the host) or "memory"
+    RATE_LIMIT_STORE_PATH: str = ""  # defaults to <tmp>/attec-ratelimit.bin
+    RATE_LIMIT_SLOTS: int = 65536
+    RATE_LIMIT_PROXY_HOPS: int = 0  # trusted proxies adding X-Forwarded-For
+    
+    # Analytics
+    ANALYTICS_BATCH_MAX_SIZE: int = 500
+    ANALYTICS_BUFFER_ENABLED: bool = True
+    ANALYTICS_BUFFER_MAX_SIZE: int = 10000
+    ANALYTICS_FLUSH_BATCH_SIZE: int = 500
+    ANALYTICS_FLUSH_INTERVAL_SECONDS: float = 2.0
+    ANALYTICS_OVERFLOW_POLICY: str = "drop"  # "drop" or "block"
+    ANALYTICS_BLOCK_TIMEOUT_SECONDS: float = 1.0
+    ANALYTICS_VERSION_BUMP_INTERVAL_SECONDS: float = 1.0  # summary ETags may lag event writes by this much
+    ROLLUP_INTERVAL_SECONDS: int = 900  # 0 disables the background rollup job
+    ROLLUP_GRACE_SECONDS: int = 300
+    HLL_PRECISION: int = 12  # run scripts/run_rollups.py --rebuild after changing (days past retention keep theirs)
+    ANALYTICS_RETENTION_MONTHS: int = 13  # 0 keeps raw events forever
+    ANALYTICS_PARTITIONS_AHEAD: int = 3
+    PARTITION_MAINTENANCE_INTERVAL_SECONDS: int = 86400  # 0 disables the in-process job
+    
+    # Caching
+    CACHE_BACKEND: str = "memory"  # "memory" (per process), "redis" or "none"
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_KEY_PREFIX: str = "attec:"
+    CACHE_MAX_ENTRIES: int = 1024
+    CACHE_DEFAULT_TTL_SECONDS: float = 60.0
+    CACHE_SUMMARY_TTL_SECONDS: float = 60.0
+    CACHE_SUBMISSION_TTL_SECONDS: float = 300.0
+    
+    # Export
+    EXPORT_BATCH_SIZE: int = 2000
     
     # Admin
     ADMIN_EMAIL: str
@@ -40,6 +116,16 @@ class Settings(BaseSettings):
     # Logging
     LOG_LEVEL: str = "INFO"
     
+    # SQL Profiling
+    SQL_PROFILER_ENABLED: bool = True
+    SERVER_TIMING_PUBLIC: bool = False  # Server-Timing on every response, not just admin ones (local debugging only)
+    SLOW_QUERY_SECONDS: float = 0.5  # 0 disables the slow-query log
+    SQL_REPEAT_WARN_THRESHOLD: int = 10  # warn when a request repeats a statement more often; 0 disables
+    
+    # Metrics
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: str = ""  # bearer token required by /metrics when set; required in production
+    
     @field_validator('ALLOWED_ORIGINS', mode='before')
     @classmethod
     def parse_cors(cls, v):
@@ -47,6 +133,41 @@ class Settings(BaseSettings):
             return [origin.strip() for origin in v.split(',')]
         return v
     
+    @field_validator('ANALYTICS_OVERFLOW_POLICY')
+    @classmethod
+    def validate_overflow_policy(cls, v):
+        if v not in ("drop", "block"):
+            raise ValueError("ANALYTICS_OVERFLOW_POLICY must be 'drop' or 'block'")
+        return v
+    
+    @field_validator('RATE_LIMIT_STORAGE')
+    @classmethod
+    def validate_rate_limit_storage(cls, v):
+        if v not in ("shared", "memory"):
+            raise ValueError("RATE_LIMIT_STORAGE must be 'shared' or 'memory'")
+        return v
+    
+    @field_validator('BCRYPT_ROUNDS')
+    @classmethod
+    def validate_bcrypt_rounds(cls, v):
+        if not 4 <= v <= 31:
+            raise ValueError("BCRYPT_ROUNDS must be between 4 and 31")
+        return v
+    
+    @field_validator('EMAIL_TRANSPORT')
+    @classmethod
+    def validate_email_transport(cls, v):
+        if v not in ("sendgrid", "smtp", "console", "memory"):
+            raise ValueError("EMAIL_TRANSPORT must be 'sendgrid', 'smtp', 'console' or 'memory'")
+        return v
+    
+    @field_validator('CACHE_BACKEND')
+    @classmethod
+    def validate_cache_backend(cls, v):
+        if v not in ("memory", "redis", "none"):
+            raise ValueError("CACHE_BACKEND must be 'memory', 'redis' or 'none'")
+        return v
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         case_sensitive=True,
@@ -55,6 +176,3 @@ class Settings(BaseSettings):
 
 
 settings = Settings()
-
-
-settings = Settings()
@@ -0,0 +1,101 @@
+from typing import Iterable, Optional
+import hashlib
+import math
+import zlib
+
+DEFAULT_PRECISION = 12
+
+
+class HyperLogLog:
+    """
+    HyperLogLog cardinality sketch.
+
+    With precision p the sketch keeps 2**p one-byte registers and estimates
+    distinct counts with a relative standard error of about 1.04 / sqrt(2**p)
+    (1.6% for the default p=12). Sketches with the same precision merge
+    losslessly, so daily sketches can answer any date range.
+    """
+
+    def __init__(self, precision: int = DEFAULT_PRECISION, registers: Optional[bytearray] = None):
+        if not 4 <= precision <= 16:
+            raise ValueError("HyperLogLog precision must be between 4 and 16")
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = registers if registers is not None else bytearray(self.m)
+        if len(self.registers) != self.m:
+            raise ValueError("Register count does not match precision")
+
+    @property
+    def relative_error(self) -> float:
+        return relative_error(self.precision)
+
+    def add(self, value: str) -> None:
+        h = int.from_bytes(
+            hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        index = h >> (64 - self.precision)
+        remaining = h & ((1 << (64 - self.precision)) - 1)
+        # Position of the leftmost 1-bit in the remaining 64 - p bits
+        rank = (64 - self.precision) - remaining.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values: Iterable[str]) -> None:
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches with different precision")
+        registers = self.registers
+        for index, rank in enumerate(other.registers):
+            if rank > registers[index]:
+                registers[index] = rank
+
+    def reduce(self, precision: int) -> "HyperLogLog":
+        """
+        The same sketch at a lower precision, as if every value had been added
+        to a sketch of that precision (precision can only go down).
+        """
+        if precision > self.precision:
+            raise ValueError("Cannot raise the precision of a sketch")
+        if precision == self.precision:
+            return HyperLogLog(precision, bytearray(self.registers))
+
+        # The dropped low index bits become the leading bits of the remainder
+        shift = self.precision - precision
+        reduced = HyperLogLog(precision)
+        for index, rank in enumerate(self.registers):
+            if rank == 0:
+                continue
+            low = index & ((1 << shift) - 1)
+            new_rank = shift - low.bit_length() + 1 if low else shift + rank
+            target = index >> shift
+            if new_rank > reduced.registers[target]:
+                reduced.registers[target] = new_rank
+        return reduced
+
+    def count(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -rank for rank in self.registers)
+
+        # Small-range correction (linear counting)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+
+        return int(round(estimate))
+
+    def to_bytes(self) -> bytes:
+        """Compact serialized form: precision byte + zlib-compressed registers."""
+        return bytes([self.precision]) + zlib.compress(bytes(self.registers), 6)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        return cls(precision=data[0], registers=bytearray(zlib.decompress(data[1:])))
+
+
+def relative_error(precision: int) -> float:
+    """Relative standard error of a sketch with the given precision."""
+    return 1.04 / math.sqrt(1 << precision)
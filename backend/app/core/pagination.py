@@ -0,0 +1,55 @@
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Optional, Tuple
+import base64
+import json
+import uuid
+
+
+def encode_cursor(sort_value: datetime, row_id: uuid.UUID) -> str:
+    """Opaque keyset cursor for a (timestamp, id) position."""
+    raw = json.dumps([sort_value.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Decode a cursor produced by encode_cursor. Raises ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(sort_value), uuid.UUID(row_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def count_rows(db: Session, statement: Select, estimate: bool = False) -> Tuple[int, bool]:
+    """
+    Count the rows `statement` would return.
+
+    With `estimate=True` on PostgreSQL the planner's row estimate is used
+    instead of scanning. Returns (count, is_estimate).
+    """
+    if estimate and db.get_bind().dialect.name == "postgresql":
+        estimated = _planner_estimate(db, statement)
+        if estimated is not None:
+            return estimated, True
+
+    total = db.execute(
+        select(func.count()).select_from(statement.order_by(None).subquery())
+    ).scalar()
+    return total or 0, False
+
+
+def _planner_estimate(db: Session, statement: Select) -> Optional[int]:
+    compiled = statement.order_by(None).compile(
+        dialect=db.get_bind().dialect,
+        compile_kwargs={"literal_binds": True}
+    )
+    plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    try:
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except (KeyError, IndexError, TypeError):
+        return None
@@ -0,0 +1,209 @@
+from fastapi import HTTPException, Request, status
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+from app.core.config import settings
+import hashlib
+import logging
+import math
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Shared file layout: header (magic, version, slot count) followed by fixed-size
+# slots of (key hash, tokens, last update time)
+_HEADER = struct.Struct("<4sIQ")
+_SLOT = struct.Struct("<Qdd")
+_MAGIC = b"ATRL"
+_VERSION = 1
+# Slots inspected per key before evicting the least recently used one
+_PROBE = 8
+
+
+def _key_hash(key: str) -> int:
+    # Never 0: that marks an empty slot
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little") | 1
+
+
+def _refill(tokens: float, updated: float, now: float, rate: float, burst: float) -> float:
+    return min(burst, tokens + max(0.0, now - updated) * rate)
+
+
+class MemoryBuckets:
+    """Per-process token buckets (fallback when shared memory is unavailable)."""
+
+    name = "memory"
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1) -> Tuple[bool, float]:
+        now = time.time()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (burst, now))
+            tokens = _refill(tokens, updated, now, rate, burst)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (cost - tokens) / rate
+
+
+class SharedBuckets:
+    """
+    Token buckets in a memory-mapped file shared by every worker on the host.
+
+    Each check hashes the key into a fixed-size open-addressed table and
+    updates the slot under an fcntl record lock (plus a thread lock, since
+    record locks are per process). The file is opened lazily per process, so
+    workers forked after import each get their own mapping.
+    """
+
+    name = "shared"
+
+    def __init__(self, path: str, slots: int):
+        self.path = path
+        self.slots = slots
+        self._size = _HEADER.size + slots * _SLOT.size
+        self._fd: Optional[int] = None
+        self._map: Optional[mmap.mmap] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1) -> Tuple[bool, float]:
+        key_hash = _key_hash(key)
+        start = key_hash % self.slots
+        now = time.time()
+
+        with self._lock:
+            buckets = self._mapping()
+            fcntl.lockf(self._fd, fcntl.LOCK_EX)
+            try:
+                offset, tokens, updated = self._find(buckets, key_hash, start)
+                if tokens is None:
+                    tokens, updated = burst, now
+                tokens = _refill(tokens, updated, now, rate, burst)
+                allowed = tokens >= cost
+                if allowed:
+                    tokens -= cost
+                _SLOT.pack_into(buckets, offset, key_hash, tokens, now)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+        return allowed, 0.0 if allowed else (cost - tokens) / rate
+
+    def _find(self, buckets: mmap.mmap, key_hash: int, start: int):
+        """Slot offset for the key plus its state, or a slot to reuse with state None."""
+        victim, victim_updated = None, math.inf
+        for probe in range(_PROBE):
+            offset = _HEADER.size + ((start + probe) % self.slots) * _SLOT.size
+            slot_key, tokens, updated = _SLOT.unpack_from(buckets, offset)
+            if slot_key == key_hash:
+                return offset, tokens, updated
+            if slot_key == 0:
+                return offset, None, None
+            if updated < victim_updated:
+                victim, victim_updated = offset, updated
+        return victim, None, None
+
+    def _mapping(self) -> mmap.mmap:
+        pid = os.getpid()
+        if self._map is not None and self._pid == pid:
+            return self._map
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.lockf(fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_size != self._size:
+                os.ftruncate(fd, self._size)
+            buckets = mmap.mmap(fd, self._size)
+            magic, version, slots = _HEADER.unpack_from(buckets, 0)
+            if (magic, version, slots) != (_MAGIC, _VERSION, self.slots):
+                # New file or a different layout: start from empty buckets
+                buckets[:] = bytes(self._size)
+                _HEADER.pack_into(buckets, 0, _MAGIC, _VERSION, self.slots)
+        finally:
+            fcntl.lockf(fd, fcntl.LOCK_UN)
+
+        self._fd, self._map, self._pid = fd, buckets, pid
+        return buckets
+
+
+class RateLimiter:
+    """Per-route, per-client token-bucket limits for FastAPI dependencies."""
+
+    def __init__(self, storage: str, path: str, slots: int, proxy_hops: int):
+        self.proxy_hops = proxy_hops
+        if storage == "shared" and fcntl is not None:
+            self.buckets = SharedBuckets(path, slots)
+        else:
+            if storage == "shared":
+                logger.warning("Shared rate limit storage needs fcntl; using per-process buckets")
+            self.buckets = MemoryBuckets(slots)
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1) -> Tuple[bool, float]:
+        try:
+            return self.buckets.take(key, rate, burst, cost)
+        except OSError as e:
+            # e.g. an unwritable store path: keep limiting, per process
+            logger.error(f"Shared rate limit storage failed, using per-process buckets: {str(e)}")
+            self.buckets = MemoryBuckets(settings.RATE_LIMIT_SLOTS)
+            return self.buckets.take(key, rate, burst, cost)
+
+    def client_id(self, request: Request) -> str:
+        """
+        Client address. With RATE_LIMIT_PROXY_HOPS trusted proxies in front,
+        the address they recorded in X-Forwarded-For is used instead.
+        """
+        if self.proxy_hops > 0:
+            forwarded = [
+                hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()
+            ]
+            if len(forwarded) >= self.proxy_hops:
+                return forwarded[-self.proxy_hops]
+        return request.client.host if request.client else "unknown"
+
+    def limit(self, name: str, per_minute: float, burst: int) -> Callable:
+        """
+        Dependency allowing `per_minute` requests per client on average, with
+        bursts of up to `burst`. Exceeding it raises 429 with Retry-After.
+        """
+        rate = per_minute / 60.0
+
+        # async so the check runs inline instead of hopping to the threadpool
+        async def dependency(request: Request) -> None:
+            if not settings.RATE_LIMIT_ENABLED or per_minute <= 0:
+                return
+            allowed, retry_after = self.take(f"{name}:{self.client_id(request)}", rate, burst)
+            if not allowed:
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many requests. Please slow down.",
+                    headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+                )
+
+        return dependency
+
+
+# Singleton instance
+rate_limiter = RateLimiter(
+    storage=settings.RATE_LIMIT_STORAGE,
+    path=settings.RATE_LIMIT_STORE_PATH or os.path.join(tempfile.gettempdir(), "attec-ratelimit.bin"),
+    slots=settings.RATE_LIMIT_SLOTS,
+    proxy_hops=settings.RATE_LIMIT_PROXY_HOPS
+)
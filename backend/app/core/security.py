@@ -1,20 +1,113 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Dict, Optional
 from jose import JWTError, jwt
+import asyncio
 import bcrypt
+import threading
 from app.core.config import settings
 
 
+class PasswordHasherBusy(Exception):
+    """Raised when the password hashing pool is saturated."""
+
+
+class PasswordHasher:
+    """
+    bcrypt hashing and verification on a small dedicated thread pool.
+
+    bcrypt releases the GIL, so threads run in parallel without starving the
+    event loop or FastAPI's shared threadpool. At most `max_workers` hashes
+    run at once and `max_pending` more may wait; further calls fail fast with
+    PasswordHasherBusy instead of queueing behind a credential-stuffing burst.
+    """
+
+    def __init__(self, rounds: int, max_workers: int, max_pending: int):
+        self.rounds = rounds
+        self.max_workers = max_workers
+        self.max_in_flight = max_workers + max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+        # Counters
+        self.completed = 0
+        self.rejected = 0
+
+    def hash(self, password: str) -> str:
+        """Hash a password with the configured work factor (blocking)."""
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        """Verify a password against a hash (blocking)."""
+        return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """True if the hash was made with a different work factor than configured."""
+        try:
+            return int(hashed_password.split("$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    async def hash_async(self, password: str) -> str:
+        return await self._submit(self.hash, password)
+
+    async def verify_async(self, password: str, hashed_password: str) -> bool:
+        return await self._submit(self.verify, password, hashed_password)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": self._in_flight,
+            "capacity": self.max_in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def _submit(self, func: Callable[..., Any], *args) -> Any:
+        with self._lock:
+            if self._in_flight >= self.max_in_flight:
+                self.rejected += 1
+                raise PasswordHasherBusy()
+            self._in_flight += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="password-hasher"
+                )
+        completed = False
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+            completed = True
+            return result
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                if completed:
+                    self.completed += 1
+
+
+# Singleton instance
+password_hasher = PasswordHasher(
+    rounds=settings.BCRYPT_ROUNDS,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash."""
-    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+    return password_hasher.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Generate a password hash."""
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-    return hashed.decode('utf-8')
+    return password_hasher.hash(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -28,7 +121,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
     encoded_jwt = jwt.encode(
         to_encode, 
         settings.SECRET_KEY, 
@@ -0,0 +1,107 @@
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+import json
+import logging
+import subprocess
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Seconds spent in each lifespan startup step, in order
+startup_timings: Dict[str, float] = {}
+
+# Run in a fresh interpreter, so nothing is imported yet
+_PROBE = """
+import time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter() - started
+
+import asyncio, json
+from app.core.startup import startup_timings
+
+async def run_lifespan():
+    async with app.main.app.router.lifespan_context(app.main.app):
+        pass
+
+asyncio.run(run_lifespan())
+print("STARTUP_PROFILE " + json.dumps({"import": imported, "lifespan": startup_timings}))
+"""
+
+
+async def timed_start(name: str, start: Callable[[], Awaitable[None]]) -> None:
+    """Run one lifespan startup step and record how long it took."""
+    started = time.perf_counter()
+    await start()
+    startup_timings[name] = time.perf_counter() - started
+
+
+def parse_importtime(output: str) -> List[Tuple[str, int, float, float]]:
+    """(module, depth, self_ms, cumulative_ms) from `python -X importtime` output."""
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append((name.strip(), depth, int(self_us) / 1000, int(cumulative_us) / 1000))
+    return modules
+
+
+def profile_startup(max_import_ms: Optional[float] = None, top: int = 15) -> int:
+    """
+    Import app.main and run its lifespan startup in a fresh interpreter with
+    `-X importtime`, then print import time per package and module and the
+    duration of each startup step. Returns 1 if importing app.main took
+    longer than `max_import_ms`.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True
+    )
+    summary = next(
+        (line for line in result.stdout.splitlines() if line.startswith("STARTUP_PROFILE ")),
+        None
+    )
+    if result.returncode != 0 or summary is None:
+        print(result.stderr[-4000:])
+        print("❌ Startup failed")
+        return 1
+    summary = json.loads(summary[len("STARTUP_PROFILE "):])
+    modules = parse_importtime(result.stderr)
+
+    # Self time per third-party package; app modules are listed individually
+    packages: Dict[str, float] = {}
+    for name, _, self_ms, _ in modules:
+        key = name if name.startswith("app.") else name.split(".")[0]
+        packages[key] = packages.get(key, 0.0) + self_ms
+
+    print(f"\n📦 Import time by package (self, top {top}):")
+    for name, ms in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"  {ms:>8.1f} ms  {name}")
+
+    print(f"\n🧩 App modules (cumulative, including what they import):")
+    app_modules = [(name, cumulative) for name, _, _, cumulative in modules if name.startswith("app.")]
+    for name, ms in sorted(app_modules, key=lambda item: item[1], reverse=True)[:top]:
+        print(f"  {ms:>8.1f} ms  {name}")
+
+    print("\n🚀 Lifespan startup:")
+    for name, seconds in summary["lifespan"].items():
+        print(f"  {seconds * 1000:>8.1f} ms  {name}")
+
+    import_ms = summary["import"] * 1000
+    startup_ms = sum(summary["lifespan"].values()) * 1000
+    print(f"\nImport app.main: {import_ms:.0f} ms, lifespan startup: {startup_ms:.0f} ms")
+    print("(-X importtime adds some overhead of its own)")
+
+    if max_import_ms is not None and import_ms > max_import_ms:
+        print(f"❌ Import time {import_ms:.0f} ms exceeds the {max_import_ms:.0f} ms budget")
+        return 1
+    if max_import_ms is not None:
+        print(f"✅ Within the {max_import_ms:.0f} ms import budget")
+    return 0
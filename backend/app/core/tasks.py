@@ -0,0 +1,76 @@
+from starlette.concurrency import run_in_threadpool
+from typing import Any, Callable, Optional
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """
+    Run a blocking job every `interval` seconds on the threadpool.
+
+    Started and stopped from the FastAPI lifespan. Failures are logged and
+    the job is retried on the next tick.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        interval: float,
+        func: Callable[[], Any],
+        run_on_start: bool = False,
+        run_on_stop: bool = False
+    ):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.run_on_start = run_on_start
+        self.run_on_stop = run_on_stop
+        self._task: Optional[asyncio.Task] = None
+        self._current: Optional[asyncio.Future] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if self.running or self.interval <= 0:
+            return
+        self._task = asyncio.create_task(self._run(), name=self.name)
+        logger.info(f"Periodic task '{self.name}' started (every {self.interval}s)")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        # Let a run in progress finish rather than abandoning it mid-transaction
+        if self._current is not None:
+            await asyncio.gather(self._current, return_exceptions=True)
+            self._current = None
+
+        if self.run_on_stop:
+            await self.run_once()
+
+    async def run_once(self) -> None:
+        try:
+            await run_in_threadpool(self.func)
+        except Exception as e:
+            logger.error(f"Periodic task '{self.name}' failed: {str(e)}")
+
+    async def _run(self) -> None:
+        first = True
+        while True:
+            if not (first and self.run_on_start):
+                await asyncio.sleep(self.interval)
+            first = False
+            self._current = asyncio.ensure_future(self.run_once())
+            await asyncio.shield(self._current)
+            self._current = None
@@ -3,3 +3,6 @@ from app.db.session import Base
 from app.models.user import User
 from app.models.contact import ContactSubmission
 from app.models.analytics import AnalyticsEvent
+from app.models.rollup import DailyEventCount, DailySubmissionCount, DailySketch, RollupState
+from app.models.email_outbox import EmailOutbox
+from app.models.change_version import ChangeVersion
@@ -0,0 +1,195 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Dict, Iterator, List, Optional
+from app.core.config import settings
+import logging
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+# Named binds (:name) but not PostgreSQL casts (::type)
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|\?|(?<![:\w]):[A-Za-z_]\w*")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def normalize_sql(statement: str) -> str:
+    """Statement shape: literals and bind parameters replaced, IN lists collapsed."""
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _PLACEHOLDER.sub("?", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _PLACEHOLDER_LIST.sub("(...)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryProfile:
+    """Statements executed while this profile was active, with their time and shapes."""
+
+    def __init__(self):
+        self.statements = 0
+        self.duration = 0.0
+        self.shapes: Dict[str, int] = {}
+        # Set by the admin dependency: the Server-Timing header is only sent to admins
+        self.expose = False
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        shape = normalize_sql(statement)
+        with self._lock:
+            self.statements += 1
+            self.duration += elapsed
+            self.shapes[shape] = self.shapes.get(shape, 0) + 1
+
+    def repeated(self, threshold: int) -> Dict[str, int]:
+        """Shapes executed more than `threshold` times (likely N+1 loops)."""
+        with self._lock:
+            return {shape: count for shape, count in self.shapes.items() if count > threshold}
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.2f};desc="{self.statements} queries"'
+
+
+class StatementBudgetExceeded(AssertionError):
+    pass
+
+
+_current_profile: ContextVar[Optional[QueryProfile]] = ContextVar("sql_profile", default=None)
+
+# Profiles of finished requests, for record_requests()
+_recorders: List[List[QueryProfile]] = []
+_recorders_lock = threading.Lock()
+
+
+def current_profile() -> Optional[QueryProfile]:
+    return _current_profile.get()
+
+
+def expose_profile() -> None:
+    """Send this request's Server-Timing header (called once the caller is known to be an admin)."""
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.expose = True
+
+
+@contextmanager
+def statement_budget(max_statements: int) -> Iterator[QueryProfile]:
+    """
+    Fail if the block issues more than `max_statements` SQL statements:
+
+        with statement_budget(2):
+            build_analytics_summary(db, start, end)
+    """
+    profile = QueryProfile()
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+    if profile.statements > max_statements:
+        shapes = "\n".join(f"  {count}x {shape}" for shape, count in profile.shapes.items())
+        raise StatementBudgetExceeded(
+            f"{profile.statements} statements issued, budget is {max_statements}:\n{shapes}"
+        )
+
+
+@contextmanager
+def record_requests() -> Iterator[List[QueryProfile]]:
+    """
+    Collect the profile of every request that finishes inside the block, so
+    tests can assert statement budgets per endpoint through a TestClient
+    (whose requests run in another thread and context):
+
+        with record_requests() as profiles:
+            client.get("/api/v1/contact/submissions", headers=admin)
+        assert profiles[-1].statements <= 3
+    """
+    profiles: List[QueryProfile] = []
+    with _recorders_lock:
+        _recorders.append(profiles)
+    try:
+        yield profiles
+    finally:
+        with _recorders_lock:
+            _recorders.remove(profiles)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.record(statement, elapsed)
+    if 0 < settings.SLOW_QUERY_SECONDS <= elapsed:
+        logger.warning(f"Slow query ({elapsed * 1000:.1f} ms): {normalize_sql(statement)[:1000]}")
+
+
+def _handle_error(exception_context):
+    # after_cursor_execute does not run for a failed statement
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every statement on `engine` (for async engines pass `sync_engine`)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class SQLProfilerMiddleware:
+    """
+    Pure ASGI middleware giving each request its own QueryProfile.
+
+    Admin responses get a `Server-Timing: db;dur=...;desc="N queries"`
+    header, and a warning is logged when a request repeats one statement
+    shape more than SQL_REPEAT_WARN_THRESHOLD times.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile()
+        token = _current_profile.set(profile)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and (profile.expose or settings.SERVER_TIMING_PUBLIC):
+                MutableHeaders(scope=message).append("Server-Timing", profile.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_profile.reset(token)
+            self._finish(scope, profile)
+
+    def _finish(self, scope: Scope, profile: QueryProfile) -> None:
+        threshold = settings.SQL_REPEAT_WARN_THRESHOLD
+        if threshold > 0:
+            for shape, count in profile.repeated(threshold).items():
+                logger.warning(
+                    f"Possible N+1: {count} executions of one statement in "
+                    f"{scope['method']} {scope['path']}: {shape[:300]}"
+                )
+        if _recorders:
+            with _recorders_lock:
+                for profiles in _recorders:
+                    profiles.append(profile)
@@ -0,0 +1,125 @@
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from typing import Dict
+from app.core.config import settings
+from app.db.session import ReadSessionLocal, SessionLocal, read_engine
+import logging
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Seconds the replica is behind; 0 once it has replayed everything it received
+# (pg_last_xact_replay_timestamp alone keeps growing while the primary is idle)
+REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaRouter:
+    """
+    Decide per request whether a read-only admin endpoint may use the replica.
+
+    Two staleness guards send reads back to the primary:
+
+    - read-your-writes: a user who wrote within `window` seconds reads from
+      the primary, so a PATCH followed by a GET sees its own change
+    - lag: while the replica reports more than `max_lag` seconds of replay
+      lag (checked at most every `check_interval` seconds), everyone does
+
+    Recent writes are tracked per process. With several workers, a GET that
+    lands on another worker than the PATCH relies on the lag guard alone.
+    """
+
+    def __init__(self, window: float, max_lag: float, check_interval: float):
+        self.window = window
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._writes: Dict[uuid.UUID, float] = {}
+        self._lag = 0.0
+        self._lag_checked_at = float("-inf")
+        self._lock = threading.Lock()
+        self._lag_lock = threading.Lock()
+
+        # Counters
+        self.replica_reads = 0
+        self.primary_reads_recent_write = 0
+        self.primary_reads_lag = 0
+
+    @property
+    def enabled(self) -> bool:
+        return ReadSessionLocal is not None
+
+    def record_write(self, user_id: uuid.UUID) -> None:
+        """Note that `user_id` just committed a write on the primary."""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._writes[user_id] = now
+            # Forget writes that no longer pin anyone to the primary
+            if len(self._writes) > 1024:
+                self._writes = {
+                    writer: at for writer, at in self._writes.items() if now - at < self.window
+                }
+
+    def session_factory(self, user_id: uuid.UUID) -> sessionmaker:
+        """Session factory for a read by `user_id`: the replica unless a guard applies."""
+        if not self.enabled:
+            return SessionLocal
+
+        with self._lock:
+            wrote_at = self._writes.get(user_id)
+        if wrote_at is not None and time.monotonic() - wrote_at < self.window:
+            with self._lock:
+                self.primary_reads_recent_write += 1
+            return SessionLocal
+
+        if self._replica_lag() > self.max_lag:
+            with self._lock:
+                self.primary_reads_lag += 1
+            return SessionLocal
+
+        with self._lock:
+            self.replica_reads += 1
+        return ReadSessionLocal
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "replica_lag_seconds": round(self._lag, 3),
+                "replica_reads": self.replica_reads,
+                "primary_reads_recent_write": self.primary_reads_recent_write,
+                "primary_reads_lag": self.primary_reads_lag,
+            }
+
+    def _replica_lag(self) -> float:
+        """Last measured lag; one caller re-measures once it is older than check_interval."""
+        if read_engine.dialect.name != "postgresql":
+            return 0.0
+        if time.monotonic() - self._lag_checked_at < self.check_interval:
+            return self._lag
+        if not self._lag_lock.acquire(blocking=False):
+            return self._lag
+        try:
+            with read_engine.connect() as conn:
+                self._lag = float(conn.execute(REPLICA_LAG_SQL).scalar() or 0.0)
+        except Exception as e:
+            # An unreachable replica counts as infinitely behind
+            logger.warning(f"Replica lag check failed, reading from the primary: {str(e)}")
+            self._lag = float("inf")
+        finally:
+            self._lag_checked_at = time.monotonic()
+            self._lag_lock.release()
+        return self._lag
+
+
+# Singleton instance
+replica_router = ReplicaRouter(
+    window=settings.READ_YOUR_WRITES_SECONDS,
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.REPLICA_LAG_CHECK_SECONDS
+)
@@ -1,26 +1,140 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.core.config import settings
+from app.core.metrics import db_pool_timeouts_total, db_pool_wait_seconds
+from app.db.profiler import instrument_engine
+from app.db.sqlite import configure_sqlite, is_sqlite_file, sqlite_pragmas
+import time
 
-# Configure engine based on database type
-if settings.DATABASE_URL.startswith('sqlite'):
-    # SQLite doesn't support pool_size/max_overflow
-    engine = create_engine(
-        settings.DATABASE_URL,
-        connect_args={"check_same_thread": False}
-    )
-else:
+
+class _TimedCheckout:
+    """Records how long each checkout waited for a connection (see /metrics)."""
+
+    def _do_get(self):
+        labels = (self.logging_name,)
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            db_pool_timeouts_total.inc(labels)
+            raise
+        finally:
+            db_pool_wait_seconds.observe(labels, time.perf_counter() - started)
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+SQLITE_PRAGMAS = sqlite_pragmas(
+    busy_timeout_ms=settings.SQLITE_BUSY_TIMEOUT_MS,
+    mmap_size_mb=settings.SQLITE_MMAP_SIZE_MB,
+    cache_size_mb=settings.SQLITE_CACHE_SIZE_MB
+)
+
+
+def build_engine(database_url: str, pool_name: str):
+    """Sync engine for `database_url`; `pool_name` labels its pool metrics."""
+    # Configure engine based on database type
+    if is_sqlite_file(database_url) and settings.SQLITE_TUNED:
+        # WAL readers run concurrently, so they get a real pool
+        sqlite_engine = create_engine(
+            database_url,
+            connect_args={"check_same_thread": False},
+            poolclass=TimedQueuePool,
+            pool_logging_name=pool_name,
+            pool_size=10,
+            max_overflow=20
+        )
+        configure_sqlite(sqlite_engine, SQLITE_PRAGMAS)
+        return sqlite_engine
+    if database_url.startswith('sqlite'):
+        # SQLite doesn't support pool_size/max_overflow
+        return create_engine(
+            database_url,
+            connect_args={"check_same_thread": False}
+        )
     # PostgreSQL/MySQL support connection pooling
-    engine = create_engine(
-        settings.DATABASE_URL,
+    return create_engine(
+        database_url,
+        poolclass=TimedQueuePool,
+        pool_logging_name=pool_name,
         pool_pre_ping=True,
         pool_size=10,
         max_overflow=20
     )
 
+
+engine = build_engine(settings.DATABASE_URL, "primary")
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Optional read replica with its own pool, for admin reads (see app.db.replica)
+read_engine = build_engine(settings.DATABASE_READ_URL, "replica") if settings.DATABASE_READ_URL else None
+ReadSessionLocal = (
+    sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+    if read_engine is not None else None
+)
+
+
+def async_database_url(database_url: str):
+    """
+    Map a sync DATABASE_URL onto its async driver.
+    Returns (url, connect_args): asyncpg for PostgreSQL, aiosqlite for SQLite.
+    """
+    url = make_url(database_url)
+    connect_args = {}
+    
+    if url.get_backend_name() == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    elif url.get_backend_name() == "postgresql":
+        # asyncpg takes `ssl` instead of libpq's `sslmode`
+        query = dict(url.query)
+        sslmode = query.pop("sslmode", None)
+        if sslmode:
+            connect_args["ssl"] = sslmode
+        url = url.set(drivername="postgresql+asyncpg", query=query)
+    
+    return url, connect_args
+
+
+# Async engine for request handlers that write on the event loop
+_async_url, _async_connect_args = async_database_url(settings.DATABASE_URL)
+if _async_url.get_backend_name() == "sqlite":
+    async_engine = create_async_engine(_async_url, connect_args=_async_connect_args)
+    if is_sqlite_file(settings.DATABASE_URL) and settings.SQLITE_TUNED:
+        configure_sqlite(async_engine.sync_engine, SQLITE_PRAGMAS)
+else:
+    async_engine = create_async_engine(
+        _async_url,
+        connect_args=_async_connect_args,
+        poolclass=TimedAsyncQueuePool,
+        pool_logging_name="primary-async",
+        pool_pre_ping=True,
+        pool_size=10,
+        max_overflow=20
+    )
+
+if settings.SQL_PROFILER_ENABLED:
+    instrument_engine(engine)
+    instrument_engine(async_engine.sync_engine)
+    if read_engine is not None:
+        instrument_engine(read_engine)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 Base = declarative_base()
 
 
@@ -31,3 +145,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Dependency to get an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,75 @@
+from contextlib import asynccontextmanager
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+import asyncio
+import weakref
+
+# Held by async write transactions on SQLite, one lock per event loop (an
+# asyncio.Lock binds to the first loop that waits on it)
+_write_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+
+def is_sqlite_file(database_url: str) -> bool:
+    """True for a SQLite database on disk (not in memory)."""
+    url = make_url(database_url)
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def sqlite_pragmas(busy_timeout_ms: int, mmap_size_mb: int, cache_size_mb: int) -> List[str]:
+    """
+    Per-connection settings for a busy SQLite database.
+
+    WAL lets readers run alongside the writer, and synchronous=NORMAL only
+    fsyncs at checkpoints (safe in WAL mode; a power loss can drop the last
+    commits but not corrupt the file).
+    """
+    return [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={busy_timeout_ms}",
+        f"PRAGMA mmap_size={mmap_size_mb * 1024 * 1024}",
+        # Negative values are KiB rather than pages
+        f"PRAGMA cache_size=-{cache_size_mb * 1024}",
+    ]
+
+
+def configure_sqlite(engine: Engine, pragmas: List[str]) -> None:
+    """Run `pragmas` on every new connection of `engine` (sync engine or async_engine.sync_engine)."""
+    @event.listens_for(engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+@asynccontextmanager
+async def serialize_writes(db: AsyncSession):
+    """
+    On SQLite, run the write transaction inside this block alone in this
+    process (no-op on other databases).
+
+    Overlapping aiosqlite transactions hold SQLite's single write lock across
+    event loop round trips, while the others retry in busy_timeout's
+    sleep-and-retry loop; waiting on an asyncio.Lock instead wakes the next
+    writer as soon as the lock is released.
+
+    Every AsyncSession write goes through this (contact submissions,
+    analytics ingest and change-version bumps, the email outbox, password
+    rehashes). Writers on sync sessions - admin PATCHes, the rollup job, the
+    last_login flush, scripts - run in threads outside the event loop, as do
+    other worker processes; those rely on busy_timeout.
+    """
+    if db.bind.dialect.name != "sqlite":
+        yield
+        return
+    loop = asyncio.get_running_loop()
+    lock = _write_locks.get(loop)
+    if lock is None:
+        lock = _write_locks[loop] = asyncio.Lock()
+    async with lock:
+        yield
@@ -1,13 +1,22 @@
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
+from fastapi.responses import JSONResponse, ORJSONResponse
+from contextlib import asynccontextmanager
 from app.core.config import settings
-from app.api.endpoints import contact, auth, analytics
+from app.core.security import password_hasher
+from app.api.endpoints import contact, auth, analytics, export, metrics
+from app.core.metrics import MetricsMiddleware
+from app.core.startup import startup_timings, timed_start
+from app.db.profiler import SQLProfilerMiddleware
+from app.db.session import async_engine
+from app.services.analytics_buffer import analytics_buffer
+from app.services.change_versions import analytics_events_version
+from app.services.email_outbox import email_outbox_worker
+from app.services.rollup_service import rollup_task
+from app.services.partition_service import partition_task
+from app.services.last_login import last_login_task
+from app.services.principals import revocation_task
 import logging
-import time
 
 # Configure logging
 logging.basicConfig(
@@ -16,22 +25,49 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background workers on startup and drain them on shutdown."""
+    if settings.ANALYTICS_BUFFER_ENABLED:
+        await timed_start("analytics_buffer", analytics_buffer.start)
+    if settings.EMAIL_OUTBOX_ENABLED:
+        await timed_start("email_outbox", email_outbox_worker.start)
+    await timed_start("rollup_task", rollup_task.start)
+    await timed_start("partition_task", partition_task.start)
+    await timed_start("last_login_task", last_login_task.start)
+    await timed_start("revocation_task", revocation_task.start)
+    logger.info(f"Startup completed in {sum(startup_timings.values()) * 1000:.1f} ms")
+    
+    yield
+    
+    await revocation_task.stop()
+    await last_login_task.stop()
+    await partition_task.stop()
+    await rollup_task.stop()
+    # Flush buffered analytics events before the process exits
+    await analytics_buffer.stop()
+    await analytics_events_version.flush()
+    await email_outbox_worker.stop()
+    await async_engine.dispose()
+    password_hasher.shutdown()
+
+
+# Interactive docs are off in production unless DOCS_ENABLED says otherwise
+docs_enabled = settings.DOCS_ENABLED
+if docs_enabled is None:
+    docs_enabled = settings.ENVIRONMENT != "production"
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    docs_url="/docs",
-    redoc_url="/redoc",
-    openapi_url=f"{settings.API_V1_PREFIX}/openapi.json"
+    docs_url="/docs" if docs_enabled else None,
+    redoc_url="/redoc" if docs_enabled else None,
+    openapi_url=f"{settings.API_V1_PREFIX}/openapi.json" if docs_enabled else None,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
-# Add rate limiting
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
 # Log CORS configuration
 logger.info(f"Environment: {settings.ENVIRONMENT}")
 logger.info(f"Configured ALLOWED_ORIGINS: {settings.ALLOWED_ORIGINS}")
@@ -63,14 +99,13 @@ app.add_middleware(
 )
 
 
-# Request timing middleware
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
+# Per-request SQL statement counts, Server-Timing and N+1 warnings
+if settings.SQL_PROFILER_ENABLED:
+    app.add_middleware(SQLProfilerMiddleware)
+
+# Request metrics and X-Process-Time header
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 
 # Global exception handler
@@ -107,7 +142,7 @@ def root():
     return {
         "message": "ATTEC API",
         "version": settings.VERSION,
-        "docs": "/docs",
+        "docs": "/docs" if docs_enabled else None,
         "health": "/health"
     }
 
@@ -131,8 +166,34 @@ app.include_router(
     tags=["Analytics"]
 )
 
+app.include_router(
+    export.router,
+    prefix=f"{settings.API_V1_PREFIX}/export",
+    tags=["Export"]
+)
+
+# Never serve /metrics unauthenticated in production
+if settings.METRICS_ENABLED and settings.ENVIRONMENT == "production" and not settings.METRICS_TOKEN:
+    logger.warning("METRICS_TOKEN is not set: /metrics is not served in production")
+elif settings.METRICS_ENABLED:
+    app.include_router(metrics.router, tags=["Metrics"])
+
 
 if __name__ == "__main__":
+    import argparse
+    import sys
+    
+    parser = argparse.ArgumentParser(description="Run the API (or profile its startup)")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Report import and startup time per module in a fresh interpreter, then exit")
+    parser.add_argument("--max-import-ms", type=float,
+                        help="With --profile-startup: exit 1 if importing app.main takes longer")
+    args = parser.parse_args()
+    
+    if args.profile_startup:
+        from app.core.startup import profile_startup
+        sys.exit(profile_startup(args.max_import_ms))
+    
     import uvicorn
     uvicorn.run(
         "app.main:app",
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, String, BigInteger, DateTime, event, insert
+from datetime import datetime
+from app.db.session import Base
+
+# Tables whose writes bump a change version (one row each)
+CONTACT_SUBMISSIONS = "contact_submissions"
+ANALYTICS_EVENTS = "analytics_events"
+ANALYTICS_ROLLUPS = "analytics_rollups"
+TRACKED_TABLES = (CONTACT_SUBMISSIONS, ANALYTICS_EVENTS, ANALYTICS_ROLLUPS)
+
+
+class ChangeVersion(Base):
+    """
+    Counter bumped on every write to a tracked table.
+    Read endpoints derive their ETags from it without touching the table itself.
+
+    contact_submissions and analytics_rollups are bumped in the same
+    transaction as the write. analytics_events is bumped separately after the
+    ingest commit, at most once per ANALYTICS_VERSION_BUMP_INTERVAL_SECONDS
+    (see CoalescedBump), so it may lag the write briefly and ETags built from
+    it can be stale for up to that interval.
+    """
+    __tablename__ = "change_versions"
+
+    name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+@event.listens_for(ChangeVersion.__table__, "after_create")
+def _seed_versions(target, connection, **kw) -> None:
+    """Rows for create_all() databases; migration 008 seeds them otherwise."""
+    connection.execute(insert(target), [
+        {"name": name, "version": 0, "updated_at": datetime.utcnow()} for name in TRACKED_TABLES
+    ])
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, DateTime, Enum
+from sqlalchemy import Column, String, Text, DateTime, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
 import uuid
@@ -16,6 +16,12 @@ class ContactStatus(str, enum.Enum):
 
 class ContactSubmission(Base):
     __tablename__ = "contact_submissions"
+    __table_args__ = (
+        # Keyset pagination: ORDER BY submitted_at DESC, id DESC
+        Index("ix_contact_submissions_submitted_at_id", "submitted_at", "id"),
+        Index("ix_contact_submissions_status_submitted_at_id", "status", "submitted_at", "id"),
+        Index("uq_contact_submissions_dedupe_key", "dedupe_key", unique=True),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
@@ -27,6 +33,8 @@ class ContactSubmission(Base):
     user_agent = Column(String, nullable=True)
     assigned_to = Column(String, nullable=True)
     notes = Column(Text, nullable=True)
+    # Payload fingerprint plus dedupe window; rejects duplicate submissions across workers
+    dedupe_key = Column(String, nullable=True)
     submitted_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -0,0 +1,44 @@
+from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+import uuid
+import enum
+from app.db.session import Base
+
+
+class EmailStatus(str, enum.Enum):
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    DEAD = "dead"
+
+
+class EmailOutbox(Base):
+    """
+    Outgoing email, written in the same transaction as the record that caused it
+    and delivered by the background outbox worker.
+    """
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # Worker claim query: status IN (pending, sending) AND next_attempt_at <= now
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = Column(String, nullable=False)
+    to_email = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    html_body = Column(Text, nullable=False)
+    submission_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("contact_submissions.id", ondelete="SET NULL"),
+        nullable=True
+    )
+    status = Column(String, default=EmailStatus.PENDING.value, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    # When the row is next due; while "sending" it doubles as the claim lease expiry
+    next_attempt_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_error = Column(Text, nullable=True)
+    sent_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -0,0 +1,51 @@
+from sqlalchemy import Column, String, Integer, Date, DateTime, LargeBinary
+from datetime import datetime
+import enum
+from app.db.session import Base
+
+
+class DailyEventCount(Base):
+    """Analytics events per day and event type."""
+    __tablename__ = "analytics_daily_events"
+
+    day = Column(Date, primary_key=True)
+    event_type = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class DailySubmissionCount(Base):
+    """Contact submissions per day (of submission) and current status."""
+    __tablename__ = "analytics_daily_submissions"
+
+    day = Column(Date, primary_key=True)
+    status = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class SketchKind(str, enum.Enum):
+    SESSIONS = "sessions"
+    VISITORS = "visitors"
+
+
+class DailySketch(Base):
+    """
+    HyperLogLog sketch of distinct values seen on a day.
+    `kind` is "sessions" (session_id) or "visitors" (ip_address).
+    """
+    __tablename__ = "analytics_daily_sketches"
+
+    day = Column(Date, primary_key=True)
+    kind = Column(String, primary_key=True)
+    sketch = Column(LargeBinary, nullable=False)
+
+
+class RollupState(Base):
+    """Bookkeeping for the incremental rollup job."""
+    __tablename__ = "analytics_rollup_state"
+
+    name = Column(String, primary_key=True)
+    # Last day (UTC) whose rollups are complete
+    covered_through = Column(Date, nullable=True)
+    # Start time of the last successful run; rows changed after it are reprocessed
+    last_run_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -26,10 +26,32 @@ class AnalyticsEventResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class AnalyticsEventBatchItemResult(BaseModel):
+    index: int
+    accepted: bool
+    error: Optional[str] = None
+
+
+class AnalyticsEventBatchResponse(BaseModel):
+    success: bool
+    accepted: int
+    rejected: int
+    results: list[AnalyticsEventBatchItemResult]
+
+
 class AnalyticsSummary(BaseModel):
     total_events: int
     total_submissions: int
     unique_sessions: int
+    unique_visitors: int = Field(0, description="Distinct client IP addresses")
+    approximate: bool = Field(
+        False,
+        description="True when unique_sessions/unique_visitors are HyperLogLog estimates"
+    )
+    unique_error: Optional[float] = Field(
+        None,
+        description="Relative standard error of the unique counts when approximate (e.g. 0.016)"
+    )
     date_range: Dict[str, date]
     top_events: list[Dict[str, Any]]
     submissions_by_status: Dict[str, int]
@@ -3,6 +3,14 @@ from typing import Optional
 from datetime import datetime
 from uuid import UUID
 from app.models.contact import ContactStatus
+import enum
+
+
+class TotalMode(str, enum.Enum):
+    """How a list endpoint computes its `total`."""
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+    NONE = "none"
 
 
 # Request schemas
@@ -38,7 +46,9 @@ class ContactSubmissionResponse(BaseModel):
 
 
 class ContactSubmissionList(BaseModel):
-    total: int
+    total: Optional[int] = None
+    total_is_estimate: bool = False
     items: list[ContactSubmissionResponse]
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
@@ -0,0 +1,178 @@
+from typing import Any, Dict, List, Optional
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.core.cache import cache
+from app.services.analytics_service import LIVE_SUMMARY_CACHE_TAG, async_record_events
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_DROP = "drop"
+OVERFLOW_BLOCK = "block"
+
+
+class AnalyticsEventBuffer:
+    """
+    Write-behind buffer for analytics events.
+
+    Request handlers enqueue rows and return immediately; a background task
+    drains the queue into bulk inserts whenever `flush_batch_size` rows are
+    waiting or `flush_interval` seconds have passed since the first one.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        flush_batch_size: int,
+        flush_interval: float,
+        overflow_policy: str = OVERFLOW_DROP,
+        block_timeout: float = 1.0
+    ):
+        self.max_size = max_size
+        self.flush_batch_size = flush_batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._pending: List[Dict[str, Any]] = []
+        self._flushing: Optional[asyncio.Task] = None
+
+        # Counters
+        self.queued = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def depth(self) -> int:
+        """Number of events waiting to be written."""
+        queued = self._queue.qsize() if self._queue is not None else 0
+        return queued + len(self._pending)
+
+    async def start(self) -> None:
+        """Start the background flusher on the running event loop."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._task = asyncio.create_task(self._run(), name="analytics-buffer-flusher")
+        logger.info(
+            f"Analytics buffer started (max_size={self.max_size}, "
+            f"batch={self.flush_batch_size}, interval={self.flush_interval}s, "
+            f"overflow={self.overflow_policy})"
+        )
+
+    async def stop(self) -> None:
+        """Stop the flusher and write everything still buffered."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        # Let an in-flight write finish before draining the rest
+        if self._flushing is not None:
+            await asyncio.gather(self._flushing, return_exceptions=True)
+
+        while not self._queue.empty():
+            self._pending.append(self._queue.get_nowait())
+        while self._pending:
+            batch = self._pending[:self.flush_batch_size]
+            del self._pending[:self.flush_batch_size]
+            await self._flush(batch)
+
+        logger.info(f"Analytics buffer stopped: {self.stats()}")
+
+    async def enqueue(self, row: Dict[str, Any]) -> bool:
+        """
+        Queue an event row for writing.
+        Returns False if the event was dropped because the buffer is full.
+        """
+        try:
+            if self.overflow_policy == OVERFLOW_BLOCK:
+                await asyncio.wait_for(self._queue.put(row), timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(row)
+        except (asyncio.QueueFull, asyncio.TimeoutError):
+            self.dropped += 1
+            return False
+
+        self.queued += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "depth": self.depth,
+            "capacity": self.max_size,
+            "overflow_policy": self.overflow_policy,
+            "queued": self.queued,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._pending.append(await self._queue.get())
+            deadline = loop.time() + self.flush_interval
+
+            # Collect until the batch is full or the interval elapses
+            while len(self._pending) < self.flush_batch_size:
+                try:
+                    self._pending.append(self._queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    self._pending.append(
+                        await asyncio.wait_for(self._queue.get(), timeout=timeout)
+                    )
+                except asyncio.TimeoutError:
+                    break
+
+            batch, self._pending = self._pending, []
+            # Shield the write so shutdown can wait for it instead of losing it
+            self._flushing = asyncio.ensure_future(self._flush(batch))
+            await asyncio.shield(self._flushing)
+            self._flushing = None
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            await _write_batch(batch)
+            self.flushed += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            logger.error(f"Analytics buffer flush failed ({len(batch)} events): {str(e)}")
+
+
+async def _write_batch(rows: List[Dict[str, Any]]) -> None:
+    """Write one batch of event rows in its own transaction."""
+    async with AsyncSessionLocal() as db:
+        await async_record_events(db, rows)
+    cache.invalidate(LIVE_SUMMARY_CACHE_TAG)
+
+
+# Singleton instance
+analytics_buffer = AnalyticsEventBuffer(
+    max_size=settings.ANALYTICS_BUFFER_MAX_SIZE,
+    flush_batch_size=settings.ANALYTICS_FLUSH_BATCH_SIZE,
+    flush_interval=settings.ANALYTICS_FLUSH_INTERVAL_SECONDS,
+    overflow_policy=settings.ANALYTICS_OVERFLOW_POLICY,
+    block_timeout=settings.ANALYTICS_BLOCK_TIMEOUT_SECONDS
+)
@@ -0,0 +1,423 @@
+from sqlalchemy import Integer, String, case, cast, func, insert, literal, select, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from app.core.config import settings
+from app.core.hll import HyperLogLog
+from starlette.concurrency import run_in_threadpool
+from app.db.session import SessionLocal
+from app.db.sqlite import serialize_writes
+from app.models.analytics import AnalyticsEvent
+from app.models.contact import ContactSubmission
+from app.models.rollup import DailyEventCount, DailySketch, DailySubmissionCount, SketchKind
+from app.schemas.analytics import AnalyticsEventCreate, AnalyticsSummary
+from app.services.change_versions import analytics_events_version
+from app.services.rollup_service import get_covered_through
+import io
+import json
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Column order used for both multi-row INSERT and COPY
+EVENT_COLUMNS = (
+    "id",
+    "event_type",
+    "event_data",
+    "session_id",
+    "ip_address",
+    "user_agent",
+    "referrer",
+    "timestamp",
+)
+
+# Cache tags for the analytics summary. New events only land on the current
+# day, so ingest invalidates just the summaries whose range reaches it.
+SUMMARY_CACHE_TAG = "analytics-summary"
+LIVE_SUMMARY_CACHE_TAG = "analytics-summary-live"
+
+
+def build_event_row(
+    event: AnalyticsEventCreate,
+    ip_address: Optional[str],
+    user_agent: Optional[str],
+    referrer: Optional[str]
+) -> Dict[str, Any]:
+    """Build an insertable analytics_events row from a validated event."""
+    return {
+        "id": uuid.uuid4(),
+        "event_type": event.event_type,
+        "event_data": event.event_data,
+        "session_id": event.session_id,
+        "ip_address": ip_address,
+        "user_agent": user_agent,
+        "referrer": referrer or event.referrer,
+        "timestamp": datetime.utcnow(),
+    }
+
+
+def bulk_insert_events(db: Session, rows: List[Dict[str, Any]]) -> int:
+    """
+    Write analytics event rows in a single statement.
+
+    Uses COPY on PostgreSQL (psycopg2) and a multi-row INSERT elsewhere.
+    The caller owns the transaction and is responsible for committing.
+    """
+    if not rows:
+        return 0
+
+    connection = db.connection()
+    if connection.dialect.driver == "psycopg2":
+        raw_cursor = connection.connection.cursor()
+        try:
+            _copy_events(raw_cursor, rows)
+        finally:
+            raw_cursor.close()
+        return len(rows)
+
+    # executemany with insertmanyvalues renders batched multi-row INSERTs
+    db.execute(insert(AnalyticsEvent), rows)
+    return len(rows)
+
+
+async def async_bulk_insert_events(db: AsyncSession, rows: List[Dict[str, Any]]) -> int:
+    """
+    Async counterpart of bulk_insert_events.
+
+    Uses asyncpg's binary COPY on PostgreSQL and a multi-row INSERT elsewhere.
+    The caller owns the transaction and is responsible for committing.
+    """
+    if not rows:
+        return 0
+
+    connection = await db.connection()
+    if connection.dialect.driver == "asyncpg":
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            AnalyticsEvent.__tablename__,
+            records=[
+                tuple(
+                    json.dumps(row[column]) if column == "event_data" and row[column] is not None
+                    else row[column]
+                    for column in EVENT_COLUMNS
+                )
+                for row in rows
+            ],
+            columns=list(EVENT_COLUMNS)
+        )
+        return len(rows)
+
+    await db.execute(insert(AnalyticsEvent), rows)
+    return len(rows)
+
+
+async def async_record_events(db: AsyncSession, rows: List[Dict[str, Any]]) -> int:
+    """
+    Insert event rows and commit, then bump the analytics change version
+    (coalesced, see CoalescedBump).
+
+    On SQLite the write bypasses `db`: it runs on a sync session in a worker
+    thread, one at a time per process.
+    """
+    if not rows:
+        return 0
+
+    if db.bind.dialect.name == "sqlite":
+        # One sync transaction in a worker thread: a single handoff instead
+        # of an aiosqlite round trip per statement
+        async with serialize_writes(db):
+            await run_in_threadpool(_commit_events, rows)
+    else:
+        await async_bulk_insert_events(db, rows)
+        await db.commit()
+
+    # Not in the insert's transaction, so ingest doesn't queue on the version row
+    await analytics_events_version.touch()
+    return len(rows)
+
+
+def _commit_events(rows: List[Dict[str, Any]]) -> None:
+    with SessionLocal() as db:
+        bulk_insert_events(db, rows)
+        db.commit()
+
+
+def _copy_events(cursor, rows: List[Dict[str, Any]]) -> None:
+    """Stream rows into analytics_events with COPY ... FROM STDIN."""
+    copy_rows(
+        cursor,
+        AnalyticsEvent.__tablename__,
+        EVENT_COLUMNS,
+        (tuple(row.get(column) for column in EVENT_COLUMNS) for row in rows)
+    )
+
+
+def copy_rows(cursor, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> None:
+    """Stream value tuples into `table` with COPY ... FROM STDIN (psycopg2 cursor)."""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_value(value) for value in row))
+        buffer.write("\n")
+    buffer.seek(0)
+
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+
+
+def _copy_value(value: Any) -> str:
+    """Encode a single value for COPY's text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, dict):
+        value = json.dumps(value)
+    elif isinstance(value, datetime):
+        value = value.isoformat()
+    else:
+        value = str(value)
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class RangeAggregates:
+    """Event, submission and unique counts for part of a summary range."""
+
+    def __init__(self):
+        self.event_counts: Dict[str, int] = {}
+        self.status_counts: Dict[str, int] = {}
+        # Exact distinct counts, or HyperLogLog sketches when approximate
+        self.unique_sessions = 0
+        self.unique_visitors = 0
+        self.sessions_sketch: Optional[HyperLogLog] = None
+        self.visitors_sketch: Optional[HyperLogLog] = None
+
+    @property
+    def approximate(self) -> bool:
+        return self.sessions_sketch is not None
+
+    def add_sketch(self, kind: str, sketch: HyperLogLog) -> None:
+        attribute = f"{kind}_sketch"
+        current = getattr(self, attribute)
+        if current is None:
+            setattr(self, attribute, sketch)
+            return
+        # Days older than the retention cutoff keep the precision they were
+        # built with (they cannot be rebuilt), so merge at the lower one
+        if current.precision > sketch.precision:
+            current = current.reduce(sketch.precision)
+            setattr(self, attribute, current)
+        elif sketch.precision > current.precision:
+            sketch = sketch.reduce(current.precision)
+        current.merge(sketch)
+
+    def merge(self, other: "RangeAggregates") -> None:
+        for event_type, count in other.event_counts.items():
+            self.event_counts[event_type] = self.event_counts.get(event_type, 0) + count
+        for status, count in other.status_counts.items():
+            self.status_counts[status] = self.status_counts.get(status, 0) + count
+        for kind in (SketchKind.SESSIONS, SketchKind.VISITORS):
+            sketch = getattr(other, f"{kind.value}_sketch")
+            if sketch is not None:
+                self.add_sketch(kind.value, sketch)
+
+
+def build_analytics_summary(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    exact: bool = False
+) -> AnalyticsSummary:
+    """
+    Build the analytics summary for [start_date, end_date].
+
+    Days already covered by the rollup job are read from the daily rollup
+    tables; only the remaining days (normally just today) scan raw rows.
+    Unique sessions/visitors are then estimated by merging the daily
+    HyperLogLog sketches. With `exact=True` the whole range is aggregated
+    from raw rows with COUNT(DISTINCT ...) instead.
+    """
+    range_start = datetime.combine(start_date, datetime.min.time())
+    range_end = datetime.combine(end_date, datetime.max.time())
+
+    covered_through = None if exact else get_covered_through(db)
+    if covered_through is None or covered_through < start_date:
+        totals = _raw_aggregates(db, range_start, range_end, exact_uniques=True)
+    else:
+        rollup_end = min(end_date, covered_through)
+        try:
+            totals = _rollup_aggregates(db, start_date, rollup_end)
+            if rollup_end < end_date:
+                totals.merge(_raw_aggregates(
+                    db,
+                    datetime.combine(rollup_end + timedelta(days=1), datetime.min.time()),
+                    range_end,
+                    exact_uniques=False
+                ))
+        except ValueError as e:
+            # Sketches built with a different HLL_PRECISION - answer exactly until rebuilt
+            logger.warning(f"Falling back to exact analytics summary: {str(e)}")
+            totals = _raw_aggregates(db, range_start, range_end, exact_uniques=True)
+
+    if totals.approximate:
+        unique_sessions = totals.sessions_sketch.count()
+        unique_visitors = totals.visitors_sketch.count() if totals.visitors_sketch else 0
+        unique_error = totals.sessions_sketch.relative_error
+    else:
+        unique_sessions = totals.unique_sessions
+        unique_visitors = totals.unique_visitors
+        unique_error = None
+
+    top_events = sorted(totals.event_counts.items(), key=lambda item: item[1], reverse=True)[:10]
+
+    return AnalyticsSummary(
+        total_events=sum(totals.event_counts.values()),
+        total_submissions=sum(totals.status_counts.values()),
+        unique_sessions=unique_sessions,
+        unique_visitors=unique_visitors,
+        approximate=totals.approximate,
+        unique_error=unique_error,
+        date_range={"start": start_date, "end": end_date},
+        top_events=[
+            {"event_type": event_type, "count": count}
+            for event_type, count in top_events
+        ],
+        submissions_by_status=totals.status_counts
+    )
+
+
+def summary_cache_tags(end_date: date) -> List[str]:
+    """Tags for a cached summary ending on `end_date`."""
+    tags = [SUMMARY_CACHE_TAG]
+    # Event timestamps are UTC; allow for buffered events written after midnight
+    if end_date >= (datetime.utcnow() - timedelta(hours=1)).date():
+        tags.append(LIVE_SUMMARY_CACHE_TAG)
+    return tags
+
+
+def _rollup_aggregates(db: Session, start: date, end: date) -> RangeAggregates:
+    """Aggregate the daily rollup rows and merge the daily sketches for [start, end]."""
+    events = select(
+        literal("event").label("kind"),
+        DailyEventCount.event_type.label("key"),
+        func.sum(DailyEventCount.count).label("count"),
+        literal(None, Integer).label("extra")
+    ).where(
+        DailyEventCount.day >= start,
+        DailyEventCount.day <= end
+    ).group_by(DailyEventCount.event_type)
+
+    statuses = select(
+        literal("status"),
+        DailySubmissionCount.status,
+        func.sum(DailySubmissionCount.count),
+        literal(None, Integer)
+    ).where(
+        DailySubmissionCount.day >= start,
+        DailySubmissionCount.day <= end
+    ).group_by(DailySubmissionCount.status)
+
+    aggregates = _collect(db.execute(union_all(events, statuses)))
+
+    # Sessions/visitors from days without events have no sketch - start empty
+    precision = settings.HLL_PRECISION
+    aggregates.sessions_sketch = HyperLogLog(precision)
+    aggregates.visitors_sketch = HyperLogLog(precision)
+    for kind, data in db.query(DailySketch.kind, DailySketch.sketch).filter(
+        DailySketch.day >= start,
+        DailySketch.day <= end
+    ):
+        aggregates.add_sketch(kind, HyperLogLog.from_bytes(data))
+
+    return aggregates
+
+
+def _raw_aggregates(
+    db: Session,
+    start: datetime,
+    end: datetime,
+    exact_uniques: bool
+) -> RangeAggregates:
+    """
+    Aggregate raw events and submissions for [start, end] in a single statement.
+
+    Per-type counts come from one pass over analytics_events and per-status
+    counts from one pass over contact_submissions; totals are summed in Python.
+    With `exact_uniques` the same pass also counts distinct sessions and
+    visitors (GROUPING SETS on PostgreSQL). Otherwise the distinct values are
+    returned and folded into sketches so they can merge with the rollups.
+    """
+    in_range = (AnalyticsEvent.timestamp >= start, AnalyticsEvent.timestamp <= end)
+    sessions = func.count(func.distinct(AnalyticsEvent.session_id))
+    visitors = func.count(func.distinct(AnalyticsEvent.ip_address))
+
+    if exact_uniques and db.get_bind().dialect.name == "postgresql":
+        # The empty grouping set yields the range-wide distinct counts
+        is_total = func.grouping(AnalyticsEvent.event_type) == 1
+        event_parts = [
+            select(
+                case((is_total, "uniques"), else_="event").label("kind"),
+                AnalyticsEvent.event_type.label("key"),
+                case((is_total, sessions), else_=func.count(AnalyticsEvent.id)).label("count"),
+                case((is_total, visitors), else_=None).label("extra")
+            ).where(*in_range).group_by(
+                func.grouping_sets(tuple_(AnalyticsEvent.event_type), tuple_())
+            )
+        ]
+    else:
+        event_parts = [
+            select(
+                literal("event").label("kind"),
+                AnalyticsEvent.event_type.label("key"),
+                func.count(AnalyticsEvent.id).label("count"),
+                literal(None, Integer).label("extra")
+            ).where(*in_range).group_by(AnalyticsEvent.event_type)
+        ]
+        if exact_uniques:
+            event_parts.append(
+                select(literal("uniques"), literal(None, String), sessions, visitors).where(*in_range)
+            )
+        else:
+            for kind, column in (
+                (SketchKind.SESSIONS, AnalyticsEvent.session_id),
+                (SketchKind.VISITORS, AnalyticsEvent.ip_address),
+            ):
+                event_parts.append(
+                    select(
+                        literal(kind.value), column, literal(None, Integer), literal(None, Integer)
+                    ).where(*in_range, column.isnot(None)).distinct()
+                )
+
+    statuses = select(
+        literal("status"),
+        cast(ContactSubmission.status, String),
+        func.count(ContactSubmission.id),
+        literal(None, Integer)
+    ).where(
+        ContactSubmission.submitted_at >= start,
+        ContactSubmission.submitted_at <= end
+    ).group_by(ContactSubmission.status)
+
+    return _collect(db.execute(union_all(*event_parts, statuses)))
+
+
+def _collect(rows) -> RangeAggregates:
+    """Fold (kind, key, count, extra) rows into a RangeAggregates."""
+    aggregates = RangeAggregates()
+    for kind, key, count, extra in rows:
+        if kind == "event":
+            aggregates.event_counts[key] = int(count)
+        elif kind == "status":
+            aggregates.status_counts[key] = int(count)
+        elif kind == "uniques":
+            aggregates.unique_sessions = int(count or 0)
+            aggregates.unique_visitors = int(extra or 0)
+        else:
+            # Distinct session_id / ip_address value for the sketches
+            if getattr(aggregates, f"{kind}_sketch") is None:
+                aggregates.add_sketch(kind, HyperLogLog(settings.HLL_PRECISION))
+            getattr(aggregates, f"{kind}_sketch").add(key)
+    return aggregates
@@ -0,0 +1,99 @@
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import List, Optional
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.db.sqlite import serialize_writes
+from app.models.change_version import ANALYTICS_EVENTS, ChangeVersion
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def _bump(names):
+    return update(ChangeVersion).where(ChangeVersion.name.in_(names)).values(
+        version=ChangeVersion.version + 1,
+        updated_at=datetime.utcnow()
+    )
+
+
+def bump_versions(db: Session, *names: str) -> None:
+    """Bump change versions in the caller's transaction (commit with the write)."""
+    db.execute(_bump(names))
+
+
+async def async_bump_versions(db: AsyncSession, *names: str) -> None:
+    await db.execute(_bump(names))
+
+
+def get_versions(db: Session, *names: str) -> List[int]:
+    """Current versions, in the order of `names` (0 for an unknown name)."""
+    rows = dict(db.execute(
+        select(ChangeVersion.name, ChangeVersion.version).where(ChangeVersion.name.in_(names))
+    ).all())
+    return [rows.get(name, 0) for name in names]
+
+
+class CoalescedBump:
+    """
+    Bumps one change version in its own transaction, at most once per
+    `interval` seconds per process.
+
+    For tables written on every public request: bumping the version row in
+    each write transaction makes every writer wait for the row lock held by
+    the previous one. Writers call touch() after committing instead. A touch
+    within `interval` of the last bump schedules a single trailing bump, so
+    the version still moves after the last write (readers may see the old
+    version for up to `interval`).
+    """
+
+    def __init__(self, name: str, interval: float):
+        self.name = name
+        self.interval = interval
+        self._last = float("-inf")
+        self._trailing: Optional[asyncio.Task] = None
+        self.bumps = 0
+
+    async def touch(self) -> None:
+        """Record a committed write."""
+        if self._trailing is not None and not self._trailing.done():
+            # Already scheduled, unless its event loop has gone away (tests)
+            if self._trailing.get_loop() is asyncio.get_running_loop():
+                return
+        wait = self._last + self.interval - time.monotonic()
+        if wait > 0:
+            self._trailing = asyncio.create_task(self._bump_after(wait))
+            return
+        await self._bump()
+
+    async def flush(self) -> None:
+        """Run a scheduled trailing bump now (on shutdown)."""
+        if self._trailing is None or self._trailing.done():
+            return
+        self._trailing.cancel()
+        self._trailing = None
+        await self._bump()
+
+    async def _bump_after(self, wait: float) -> None:
+        await asyncio.sleep(wait)
+        await self._bump()
+
+    async def _bump(self) -> None:
+        # Claimed before the first await, so concurrent touches don't all bump
+        self._last = time.monotonic()
+        try:
+            async with AsyncSessionLocal() as db:
+                async with serialize_writes(db):
+                    await async_bump_versions(db, self.name)
+                    await db.commit()
+            self.bumps += 1
+        except Exception as e:
+            logger.error(f"Change version bump failed ({self.name}): {str(e)}")
+
+
+# Singleton instance
+analytics_events_version = CoalescedBump(ANALYTICS_EVENTS, settings.ANALYTICS_VERSION_BUMP_INTERVAL_SECONDS)
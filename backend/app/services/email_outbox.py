@@ -0,0 +1,297 @@
+from sqlalchemy import func, select, update
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.db.sqlite import serialize_writes
+from app.models.email_outbox import EmailOutbox, EmailStatus
+from app.services.email_transports import (
+    EmailDeliveryError,
+    EmailTransport,
+    OutgoingEmail,
+    create_transport
+)
+import asyncio
+import logging
+import random
+
+logger = logging.getLogger(__name__)
+
+# How long a claimed email may stay "sending" before another worker retries it
+CLAIM_LEASE_SECONDS = 300
+
+
+def retry_delay(attempts: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter: uniform(0, min(cap, base * 2^(attempts-1)))."""
+    return random.uniform(0, min(cap, base * 2 ** (attempts - 1)))
+
+
+class EmailOutboxWorker:
+    """
+    Deliver queued emails from the outbox table in the background.
+
+    Due rows are claimed in batches (SKIP LOCKED on PostgreSQL, so several
+    workers can share the table), sent concurrently through the transport
+    with at most `max_concurrency` in flight, and marked sent, rescheduled
+    with backoff, or moved to the dead state once `max_attempts` is reached.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        batch_size: int,
+        poll_interval: float,
+        max_attempts: int,
+        retry_base: float,
+        retry_max: float,
+        transport: Optional[EmailTransport] = None
+    ):
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.transport = transport
+        self._owns_transport = False
+
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._draining: Optional[asyncio.Future] = None
+
+        # Counters
+        self.sent = 0
+        self.retried = 0
+        self.dead = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start the delivery loop on the running event loop."""
+        if self.running:
+            return
+        # The transport is created by the first drain, off the startup path
+        self._wakeup = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._task = asyncio.create_task(self._run(), name="email-outbox-worker")
+        transport = self.transport.name if self.transport else settings.EMAIL_TRANSPORT
+        logger.info(
+            f"Email outbox worker started (transport={transport}, "
+            f"concurrency={self.max_concurrency}, poll={self.poll_interval}s)"
+        )
+
+    async def stop(self) -> None:
+        """Stop the loop, let in-flight deliveries finish and close the transport."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        if self._draining is not None:
+            await asyncio.gather(self._draining, return_exceptions=True)
+            self._draining = None
+
+        logger.info(f"Email outbox worker stopped: {self.stats()}")
+        await self.close_transport()
+
+    async def close_transport(self) -> None:
+        """Close the transport if the worker created it from settings."""
+        if self._owns_transport and self.transport is not None:
+            await self.transport.aclose()
+            self.transport = None
+            self._owns_transport = False
+
+    def notify(self) -> None:
+        """Wake the worker now instead of at the next poll (after queueing emails)."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "transport": self.transport.name if self.transport else None,
+            "sent": self.sent,
+            "retried": self.retried,
+            "dead": self.dead,
+        }
+
+    async def drain(self) -> int:
+        """Deliver every email that is currently due. Returns the number processed."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._ensure_transport()
+
+        processed = 0
+        while True:
+            claimed = await self._claim()
+            if not claimed:
+                return processed
+            delivered = await asyncio.gather(*(self._deliver(row) for row in claimed))
+            # One write for the whole batch rather than one per email
+            await self._mark_sent([row["id"] for row, sent in zip(claimed, delivered) if sent])
+            processed += len(claimed)
+
+    def _ensure_transport(self) -> None:
+        if self.transport is None:
+            self.transport = create_transport()
+            self._owns_transport = True
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                self._draining = asyncio.ensure_future(self.drain())
+                # Shield so shutdown waits for deliveries instead of abandoning them
+                await asyncio.shield(self._draining)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Email outbox worker error: {str(e)}")
+            self._draining = None
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _claim(self) -> List[Dict[str, Any]]:
+        """Mark a batch of due emails as sending and return their contents."""
+        now = datetime.utcnow()
+        due = select(EmailOutbox.id).where(
+            EmailOutbox.status.in_([EmailStatus.PENDING.value, EmailStatus.SENDING.value]),
+            EmailOutbox.next_attempt_at <= now
+        ).order_by(
+            EmailOutbox.next_attempt_at
+        ).limit(self.batch_size).with_for_update(skip_locked=True)
+
+        # A single UPDATE ... RETURNING, so the transaction starts as a write:
+        # on SQLite a read upgraded to a write fails at once ("database is
+        # locked") if another connection committed in between
+        async with AsyncSessionLocal() as db:
+            async with serialize_writes(db):
+                async with db.begin():
+                    rows = (await db.execute(
+                        update(EmailOutbox).where(
+                            EmailOutbox.id.in_(due)
+                        ).values(
+                            status=EmailStatus.SENDING.value,
+                            next_attempt_at=now + timedelta(seconds=CLAIM_LEASE_SECONDS),
+                            updated_at=now
+                        ).returning(
+                            EmailOutbox.id,
+                            EmailOutbox.kind,
+                            EmailOutbox.to_email,
+                            EmailOutbox.subject,
+                            EmailOutbox.html_body,
+                            EmailOutbox.attempts
+                        ).execution_options(synchronize_session=False)
+                    )).mappings().all()
+        return [dict(row) for row in rows]
+
+    async def _deliver(self, row: Dict[str, Any]) -> bool:
+        """Send one claimed email. Returns True if sent; failures are recorded here."""
+        email = OutgoingEmail(row["kind"], row["to_email"], row["subject"], row["html_body"])
+        attempts = row["attempts"] + 1
+
+        async with self._semaphore:
+            try:
+                await self.transport.send(email)
+            except Exception as e:
+                permanent = isinstance(e, EmailDeliveryError) and e.permanent
+                await self._record_failure(row["id"], attempts, str(e), permanent)
+                return False
+        return True
+
+    async def _mark_sent(self, email_ids: List[Any]) -> None:
+        if not email_ids:
+            return
+        now = datetime.utcnow()
+        async with AsyncSessionLocal() as db:
+            async with serialize_writes(db):
+                async with db.begin():
+                    await db.execute(
+                        update(EmailOutbox).where(EmailOutbox.id.in_(email_ids)).values(
+                            status=EmailStatus.SENT.value,
+                            attempts=EmailOutbox.attempts + 1,
+                            sent_at=now,
+                            last_error=None,
+                            updated_at=now
+                        )
+                    )
+        self.sent += len(email_ids)
+
+    async def _record_failure(self, email_id, attempts: int, error: str, permanent: bool) -> None:
+        if permanent or attempts >= self.max_attempts:
+            await self._update(email_id, status=EmailStatus.DEAD.value, attempts=attempts, last_error=error)
+            self.dead += 1
+            logger.error(f"Email {email_id} moved to dead after {attempts} attempt(s): {error}")
+            return
+
+        delay = retry_delay(attempts, self.retry_base, self.retry_max)
+        await self._update(
+            email_id,
+            status=EmailStatus.PENDING.value,
+            attempts=attempts,
+            last_error=error,
+            next_attempt_at=datetime.utcnow() + timedelta(seconds=delay)
+        )
+        self.retried += 1
+        logger.warning(f"Email {email_id} attempt {attempts} failed, retrying in {delay:.0f}s: {error}")
+
+    async def _update(self, email_id, **values) -> None:
+        async with AsyncSessionLocal() as db:
+            async with serialize_writes(db):
+                async with db.begin():
+                    await db.execute(
+                        update(EmailOutbox).where(EmailOutbox.id == email_id).values(
+                            updated_at=datetime.utcnow(), **values
+                        )
+                    )
+
+
+async def outbox_counts() -> Dict[str, int]:
+    """Number of outbox rows per status."""
+    async with AsyncSessionLocal() as db:
+        rows = await db.execute(
+            select(EmailOutbox.status, func.count(EmailOutbox.id)).group_by(EmailOutbox.status)
+        )
+        counts = {status.value: 0 for status in EmailStatus}
+        counts.update({status: count for status, count in rows})
+        return counts
+
+
+async def requeue_dead_emails() -> int:
+    """Give every dead email a fresh set of attempts. Returns the number requeued."""
+    async with AsyncSessionLocal() as db:
+        async with serialize_writes(db):
+            async with db.begin():
+                result = await db.execute(
+                    update(EmailOutbox).where(
+                        EmailOutbox.status == EmailStatus.DEAD.value
+                    ).values(
+                        status=EmailStatus.PENDING.value,
+                        attempts=0,
+                        next_attempt_at=datetime.utcnow(),
+                        updated_at=datetime.utcnow()
+                    )
+                )
+        return result.rowcount
+
+
+# Singleton instance
+email_outbox_worker = EmailOutboxWorker(
+    max_concurrency=settings.EMAIL_MAX_CONCURRENCY,
+    batch_size=settings.EMAIL_BATCH_SIZE,
+    poll_interval=settings.EMAIL_POLL_INTERVAL_SECONDS,
+    max_attempts=settings.EMAIL_MAX_ATTEMPTS,
+    retry_base=settings.EMAIL_RETRY_BASE_SECONDS,
+    retry_max=settings.EMAIL_RETRY_MAX_SECONDS
+)
@@ -1,98 +1,117 @@
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail, Email, To, Content
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from sqlalchemy.ext.asyncio import AsyncSession
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List
 from app.core.config import settings
+from app.models.contact import ContactSubmission
+from app.models.email_outbox import EmailOutbox
+from app.services.email_transports import OutgoingEmail
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Setup Jinja2 for email templates
 template_dir = Path(__file__).parent.parent / "templates"
-jinja_env = Environment(
-    loader=FileSystemLoader(template_dir),
-    autoescape=select_autoescape(['html', 'xml'])
-)
+
+LEAD_NOTIFICATION = "lead_notification"
+AUTO_REPLY = "auto_reply"
 
 
 class EmailService:
+    """
+    Renders transactional emails and queues them in the outbox.
+    Delivery happens in the background (see email_outbox.py).
+    """
+    
     def __init__(self):
-        self.client = SendGridAPIClient(settings.SENDGRID_API_KEY)
-        # For testing without domain verification, use a verified sender email
-        # Go to SendGrid > Settings > Sender Authentication > Single Sender Verification
-        # Verify any email you have access to (like your personal Gmail)
-        self.from_email = Email(settings.FROM_EMAIL, settings.FROM_NAME)
+        self._jinja_env = None
+    
+    @property
+    def jinja_env(self):
+        """Jinja2 environment, built on the first render rather than at import."""
+        if self._jinja_env is None:
+            from jinja2 import Environment, FileSystemLoader, select_autoescape
+            self._jinja_env = Environment(
+                loader=FileSystemLoader(template_dir),
+                autoescape=select_autoescape(['html', 'xml'])
+            )
+        return self._jinja_env
     
     def _render_template(self, template_name: str, context: Dict[str, Any]) -> str:
         """Render email template with context."""
-        template = jinja_env.get_template(template_name)
+        template = self.jinja_env.get_template(template_name)
         return template.render(**context)
     
-    async def send_lead_notification(
+    def build_lead_notification(
         self,
         contact_name: str,
         contact_email: str,
         contact_company: str,
         contact_message: str,
         submission_id: str
-    ) -> bool:
-        """Send new lead notification to ATTEC team."""
-        try:
-            html_content = self._render_template(
-                "lead_notification.html",
-                {
-                    "contact_name": contact_name,
-                    "contact_email": contact_email,
-                    "contact_company": contact_company or "Not provided",
-                    "contact_message": contact_message,
-                    "submission_id": submission_id,
-                }
-            )
-            
-            message = Mail(
-                from_email=self.from_email,
-                to_emails=To(settings.NOTIFICATION_EMAIL),
-                subject=f"New Lead: {contact_name} from {contact_company or 'Website'}",
-                html_content=Content("text/html", html_content)
-            )
-            
-            response = self.client.send(message)
-            logger.info(f"Lead notification sent: {response.status_code}")
-            return response.status_code in [200, 201, 202]
-            
-        except Exception as e:
-            logger.error(f"Failed to send lead notification: {str(e)}")
-            return False
+    ) -> OutgoingEmail:
+        """New lead notification to the ATTEC team."""
+        html_content = self._render_template(
+            "lead_notification.html",
+            {
+                "contact_name": contact_name,
+                "contact_email": contact_email,
+                "contact_company": contact_company or "Not provided",
+                "contact_message": contact_message,
+                "submission_id": submission_id,
+            }
+        )
+        return OutgoingEmail(
+            kind=LEAD_NOTIFICATION,
+            to_email=settings.NOTIFICATION_EMAIL,
+            subject=f"New Lead: {contact_name} from {contact_company or 'Website'}",
+            html_body=html_content
+        )
     
-    async def send_auto_reply(
-        self,
-        contact_name: str,
-        contact_email: str
-    ) -> bool:
-        """Send auto-reply confirmation to contact."""
-        try:
-            html_content = self._render_template(
-                "auto_reply.html",
-                {
-                    "contact_name": contact_name,
-                }
-            )
-            
-            message = Mail(
-                from_email=self.from_email,
-                to_emails=To(contact_email),
-                subject="Thank you for contacting ATTEC",
-                html_content=Content("text/html", html_content)
+    def build_auto_reply(self, contact_name: str, contact_email: str) -> OutgoingEmail:
+        """Auto-reply confirmation to the contact."""
+        html_content = self._render_template(
+            "auto_reply.html",
+            {
+                "contact_name": contact_name,
+            }
+        )
+        return OutgoingEmail(
+            kind=AUTO_REPLY,
+            to_email=contact_email,
+            subject="Thank you for contacting ATTEC",
+            html_body=html_content
+        )
+    
+    def queue_contact_emails(self, db: AsyncSession, submission: ContactSubmission) -> List[EmailOutbox]:
+        """
+        Add the lead notification and auto-reply for a submission to the outbox.
+        The rows are committed together with the submission by the caller.
+        """
+        emails = [
+            self.build_lead_notification(
+                contact_name=submission.name,
+                contact_email=submission.email,
+                contact_company=submission.company or "Not provided",
+                contact_message=submission.message,
+                submission_id=str(submission.id)
+            ),
+            self.build_auto_reply(
+                contact_name=submission.name,
+                contact_email=submission.email
+            ),
+        ]
+        
+        rows = [
+            EmailOutbox(
+                kind=email.kind,
+                to_email=email.to_email,
+                subject=email.subject,
+                html_body=email.html_body,
+                submission_id=submission.id
             )
-            
-            response = self.client.send(message)
-            logger.info(f"Auto-reply sent to {contact_email}: {response.status_code}")
-            return response.status_code in [200, 201, 202]
-            
-        except Exception as e:
-            logger.error(f"Failed to send auto-reply to {contact_email}: {str(e)}")
-            return False
+            for email in emails
+        ]
+        db.add_all(rows)
+        return rows
 
 
 # Singleton instance
@@ -0,0 +1,192 @@
+from email.message import EmailMessage
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional
+from app.core.config import settings
+import logging
+import smtplib
+
+logger = logging.getLogger(__name__)
+
+
+class OutgoingEmail:
+    """A rendered email ready to hand to a transport."""
+
+    def __init__(self, kind: str, to_email: str, subject: str, html_body: str):
+        self.kind = kind
+        self.to_email = to_email
+        self.subject = subject
+        self.html_body = html_body
+
+
+class EmailDeliveryError(Exception):
+    """
+    Delivery failed. Permanent failures (e.g. a rejected address) go straight
+    to the dead state instead of being retried.
+    """
+
+    def __init__(self, message: str, permanent: bool = False):
+        super().__init__(message)
+        self.permanent = permanent
+
+
+class EmailTransport:
+    """Base class for delivery backends used by the outbox worker."""
+
+    name = "base"
+
+    async def send(self, email: OutgoingEmail) -> None:
+        raise NotImplementedError
+
+    async def aclose(self) -> None:
+        pass
+
+
+class SendGridTransport(EmailTransport):
+    """
+    SendGrid v3 mail/send over a pooled async HTTP client.
+    SENDGRID_API_URL can point at a local HTTP sink for testing.
+    httpx is imported here rather than at module level, since only this
+    transport needs it and it is a large share of import time.
+    """
+
+    name = "sendgrid"
+
+    def __init__(self, api_key: str, base_url: str, from_email: str, from_name: str, max_connections: int, timeout: float):
+        import httpx
+
+        self._http_error = httpx.HTTPError
+        self.from_email = from_email
+        self.from_name = from_name
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            )
+        )
+
+    async def send(self, email: OutgoingEmail) -> None:
+        payload = {
+            "personalizations": [{"to": [{"email": email.to_email}]}],
+            "from": {"email": self.from_email, "name": self.from_name},
+            "subject": email.subject,
+            "content": [{"type": "text/html", "value": email.html_body}],
+        }
+        try:
+            response = await self.client.post("/v3/mail/send", json=payload)
+        except self._http_error as e:
+            raise EmailDeliveryError(f"SendGrid request failed: {str(e)}")
+
+        if response.status_code in (200, 201, 202):
+            return
+        # 429 and 5xx are worth retrying; any other 4xx will fail the same way again
+        permanent = 400 <= response.status_code < 500 and response.status_code != 429
+        raise EmailDeliveryError(
+            f"SendGrid returned {response.status_code}: {response.text[:200]}",
+            permanent=permanent
+        )
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+class SMTPTransport(EmailTransport):
+    """Plain SMTP, run on the threadpool. Useful with a local fake SMTP server."""
+
+    name = "smtp"
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        from_email: str,
+        from_name: str,
+        timeout: float,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = False
+    ):
+        self.host = host
+        self.port = port
+        self.from_email = from_email
+        self.from_name = from_name
+        self.timeout = timeout
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+
+    async def send(self, email: OutgoingEmail) -> None:
+        await run_in_threadpool(self._send, email)
+
+    def _send(self, email: OutgoingEmail) -> None:
+        message = EmailMessage()
+        message["From"] = f"{self.from_name} <{self.from_email}>"
+        message["To"] = email.to_email
+        message["Subject"] = email.subject
+        message.set_content(email.html_body, subtype="html")
+
+        try:
+            with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+                if self.use_tls:
+                    smtp.starttls()
+                if self.username:
+                    smtp.login(self.username, self.password or "")
+                smtp.send_message(message)
+        except smtplib.SMTPRecipientsRefused as e:
+            raise EmailDeliveryError(f"SMTP recipient refused: {str(e)}", permanent=True)
+        except (smtplib.SMTPException, OSError) as e:
+            raise EmailDeliveryError(f"SMTP delivery failed: {str(e)}")
+
+
+class ConsoleTransport(EmailTransport):
+    """Log emails instead of sending them (local development)."""
+
+    name = "console"
+
+    async def send(self, email: OutgoingEmail) -> None:
+        logger.info(f"[email:{email.kind}] to={email.to_email} subject={email.subject!r}")
+
+
+class MemoryTransport(EmailTransport):
+    """Keep sent emails in memory so tests can assert on them."""
+
+    name = "memory"
+
+    def __init__(self):
+        self.sent: List[OutgoingEmail] = []
+
+    async def send(self, email: OutgoingEmail) -> None:
+        self.sent.append(email)
+
+
+def create_transport(name: Optional[str] = None) -> EmailTransport:
+    """Build the transport selected by EMAIL_TRANSPORT."""
+    name = name or settings.EMAIL_TRANSPORT
+
+    if name == "sendgrid":
+        return SendGridTransport(
+            api_key=settings.SENDGRID_API_KEY,
+            base_url=settings.SENDGRID_API_URL,
+            from_email=settings.FROM_EMAIL,
+            from_name=settings.FROM_NAME,
+            max_connections=settings.EMAIL_MAX_CONCURRENCY,
+            timeout=settings.EMAIL_SEND_TIMEOUT_SECONDS
+        )
+    if name == "smtp":
+        return SMTPTransport(
+            host=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            from_email=settings.FROM_EMAIL,
+            from_name=settings.FROM_NAME,
+            timeout=settings.EMAIL_SEND_TIMEOUT_SECONDS,
+            username=settings.SMTP_USERNAME,
+            password=settings.SMTP_PASSWORD,
+            use_tls=settings.SMTP_USE_TLS
+        )
+    if name == "console":
+        return ConsoleTransport()
+    if name == "memory":
+        return MemoryTransport()
+    raise ValueError(f"Unknown email transport: {name}")
@@ -0,0 +1,97 @@
+from sqlalchemy import case, update
+from datetime import datetime
+from typing import Dict, Optional
+from app.core.config import settings
+from app.core.tasks import PeriodicTask
+from app.db.session import engine
+from app.models.user import User
+import logging
+import threading
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class LastLoginTracker:
+    """
+    Coalesce last_login updates in memory.
+
+    Authenticated requests only record the latest timestamp per user; the
+    pending values are written in a single UPDATE by a periodic flush and on
+    shutdown, so request handling never writes to `users`.
+    """
+
+    def __init__(self):
+        self._pending: Dict[uuid.UUID, datetime] = {}
+        # get_current_user runs on the threadpool
+        self._lock = threading.Lock()
+
+        # Counters
+        self.recorded = 0
+        self.flushed = 0
+
+    def record(self, user_id: uuid.UUID, when: Optional[datetime] = None) -> None:
+        when = when or datetime.utcnow()
+        with self._lock:
+            current = self._pending.get(user_id)
+            if current is None or when > current:
+                self._pending[user_id] = when
+            self.recorded += 1
+
+    def pending(self, user_id: uuid.UUID) -> Optional[datetime]:
+        """Timestamp recorded for a user but not written yet."""
+        with self._lock:
+            return self._pending.get(user_id)
+
+    def flush(self) -> int:
+        """Write all pending timestamps in one UPDATE. Returns the number of users updated."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        latest = case(pending, value=User.id)
+        try:
+            with engine.begin() as conn:
+                conn.execute(
+                    update(User).where(User.id.in_(list(pending))).values(
+                        # Never move last_login backwards (another worker may hold a newer value)
+                        last_login=case(
+                            (User.last_login > latest, User.last_login),
+                            else_=latest
+                        ),
+                        # Activity tracking is not a profile change
+                        updated_at=User.updated_at
+                    )
+                )
+        except Exception:
+            # Put the timestamps back unless newer ones arrived meanwhile
+            with self._lock:
+                for user_id, when in pending.items():
+                    current = self._pending.get(user_id)
+                    if current is None or when > current:
+                        self._pending[user_id] = when
+            raise
+
+        self.flushed += len(pending)
+        return len(pending)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "recorded": self.recorded,
+                "flushed": self.flushed,
+            }
+
+
+# Singleton instance
+last_login_tracker = LastLoginTracker()
+
+# Background flush, started from the FastAPI lifespan; also flushes on shutdown
+last_login_task = PeriodicTask(
+    name="last-login-flush",
+    interval=settings.LAST_LOGIN_FLUSH_SECONDS,
+    func=last_login_tracker.flush,
+    run_on_stop=True
+)
@@ -0,0 +1,180 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+from app.core.config import settings
+from app.core.tasks import PeriodicTask
+from app.db.session import engine
+from app.services.rollup_service import ROLLUP_NAME, add_months, month_start, retention_cutoff
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "analytics_events"
+DEFAULT_PARTITION = "analytics_events_default"
+PARTITION_NAME = re.compile(r"^analytics_events_p(\d{4})(\d{2})$")
+
+# Arbitrary key for the PostgreSQL advisory lock serializing maintenance runs
+PARTITION_LOCK_KEY = 7_200_302
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_p{month:%Y%m}"
+
+
+def is_partitioned(conn: Connection) -> bool:
+    """True if analytics_events is a range-partitioned table (PostgreSQL only)."""
+    if conn.dialect.name != "postgresql":
+        return False
+    return bool(conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = :name AND c.relnamespace = to_regnamespace(current_schema())"
+    ), {"name": PARENT_TABLE}).scalar())
+
+
+def list_partitions(conn: Connection) -> Dict[date, str]:
+    """Monthly partitions currently attached, keyed by the first day of the month."""
+    rows = conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :name AND p.relnamespace = to_regnamespace(current_schema())"
+    ), {"name": PARENT_TABLE}).scalars()
+
+    partitions = {}
+    for name in rows:
+        match = PARTITION_NAME.match(name)
+        if match:
+            partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+
+def ensure_partition(conn: Connection, month: date) -> bool:
+    """
+    Create the partition for `month` if missing. Returns True if it was created.
+
+    Rows that already landed in the default partition for that month are
+    moved into the new partition before it is attached.
+    """
+    name = partition_name(month)
+    lower, upper = month, add_months(month, 1)
+    bounds = {"lower": lower, "upper": upper}
+
+    if month in list_partitions(conn):
+        return False
+
+    stray_rows = conn.execute(text(
+        f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+        f"WHERE timestamp >= :lower AND timestamp < :upper)"
+    ), bounds).scalar()
+
+    if not stray_rows:
+        conn.execute(text(
+            f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} "
+            f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+        ))
+        return True
+
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    conn.execute(text(
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+        f"WHERE timestamp >= :lower AND timestamp < :upper RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved"
+    ), bounds)
+    conn.execute(text(
+        f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+    ))
+    logger.warning(f"Moved rows from {DEFAULT_PARTITION} into new partition {name}")
+    return True
+
+
+def drop_expired_partitions(conn: Connection, retention_months: int, today: date) -> List[str]:
+    """
+    Detach and drop whole monthly partitions older than the retention window.
+
+    A partition is only dropped once the rollup job has covered all of its
+    days, so summaries keep their history after the raw rows are gone (the
+    rollup job never rebuilds event rollups before the same cutoff).
+    """
+    cutoff = retention_cutoff(today, retention_months)
+    if cutoff is None:
+        return []
+
+    covered_through: Optional[date] = conn.execute(text(
+        "SELECT covered_through FROM analytics_rollup_state WHERE name = :name"
+    ), {"name": ROLLUP_NAME}).scalar()
+
+    dropped = []
+    for month, name in sorted(list_partitions(conn).items()):
+        upper = add_months(month, 1)
+        if upper > cutoff:
+            break
+        if covered_through is None or covered_through < upper:
+            logger.warning(f"Keeping expired partition {name}: rollups do not cover it yet")
+            break
+        conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        conn.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+
+    # Expired stragglers in the default partition
+    if covered_through is not None:
+        conn.execute(text(
+            f"DELETE FROM {DEFAULT_PARTITION} WHERE timestamp < :cutoff"
+        ), {"cutoff": min(cutoff, covered_through + timedelta(days=1))})
+
+    return dropped
+
+
+def maintain_partitions(
+    conn: Connection,
+    months_ahead: int,
+    retention_months: int,
+    today: Optional[date] = None
+) -> Dict[str, List[str]]:
+    """Pre-create upcoming partitions and enforce retention. Caller commits."""
+    today = today or datetime.utcnow().date()
+    if not is_partitioned(conn):
+        return {"created": [], "dropped": []}
+
+    if not conn.execute(
+        text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": PARTITION_LOCK_KEY}
+    ).scalar():
+        logger.info("Partition maintenance already running in another worker, skipping")
+        return {"created": [], "dropped": []}
+
+    created = []
+    current = month_start(today)
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if ensure_partition(conn, month):
+            created.append(partition_name(month))
+
+    dropped = drop_expired_partitions(conn, retention_months, today)
+
+    if created or dropped:
+        logger.info(f"Partition maintenance: created={created} dropped={dropped}")
+    return {"created": created, "dropped": dropped}
+
+
+def run_partition_maintenance() -> None:
+    """Run partition maintenance in its own transaction (scheduler and scripts)."""
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as conn:
+        maintain_partitions(
+            conn,
+            months_ahead=settings.ANALYTICS_PARTITIONS_AHEAD,
+            retention_months=settings.ANALYTICS_RETENTION_MONTHS
+        )
+
+
+# Background scheduler, started from the FastAPI lifespan
+partition_task = PeriodicTask(
+    name="analytics-partitions",
+    interval=settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS,
+    func=run_partition_maintenance,
+    run_on_start=True
+)
@@ -0,0 +1,204 @@
+from sqlalchemy import event, select
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from app.core.config import settings
+from app.core.tasks import PeriodicTask
+from app.db.session import engine
+from app.models.user import User, UserRole
+import logging
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class Principal:
+    """The authenticated identity of a request: just what authorization needs."""
+
+    def __init__(self, id: uuid.UUID, role: UserRole, active: bool = True):
+        self.id = id
+        self.role = role
+        self.active = active
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(user.id, user.role, user.active)
+
+
+class PrincipalCache:
+    """
+    Bounded TTL cache of principals keyed by user id (LRU eviction).
+    Entries are invalidated when the user's row changes.
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[uuid.UUID, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: uuid.UUID) -> Optional[Principal]:
+        if self.ttl <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[1] < time.monotonic():
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, principal: Principal) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[principal.id] = (principal, time.monotonic() + self.ttl)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class RevocationList:
+    """
+    Users whose row changed (deactivation, role change, ...) and when.
+
+    A token whose role claim was issued before that moment can no longer be
+    trusted on its own, so the request falls back to loading the user.
+    Entries are kept for one token lifetime.
+
+    A deleted user leaves no row to notice, so each process also remembers
+    the users it authenticated within a token lifetime and revokes those
+    that are gone from `users` on refresh.
+    """
+
+    # User ids per existence query (well below SQLite's bound-parameter limit)
+    CHECK_CHUNK = 500
+
+    def __init__(self, lifetime: timedelta, max_staleness: timedelta):
+        self.lifetime = lifetime
+        self.max_staleness = max_staleness
+        self._revoked: Dict[uuid.UUID, datetime] = {}
+        self._seen: Dict[uuid.UUID, datetime] = {}
+        self._lock = threading.Lock()
+        # Rows changed at or after this moment are picked up by the next refresh
+        self._checked_through: Optional[datetime] = None
+
+    @property
+    def fresh(self) -> bool:
+        """True if the list was refreshed recently enough to trust token claims."""
+        checked = self._checked_through
+        return checked is not None and datetime.utcnow() - checked <= self.max_staleness
+
+    def revoke(self, user_id: uuid.UUID, when: Optional[datetime] = None) -> None:
+        when = when or datetime.utcnow()
+        with self._lock:
+            current = self._revoked.get(user_id)
+            if current is None or when > current:
+                self._revoked[user_id] = when
+
+    def track(self, user_id: uuid.UUID) -> None:
+        """Note a user authenticated by this process (see refresh)."""
+        with self._lock:
+            self._seen[user_id] = datetime.utcnow()
+
+    def is_revoked(self, user_id: uuid.UUID, issued_at: datetime) -> bool:
+        with self._lock:
+            revoked_at = self._revoked.get(user_id)
+        # `iat` has one-second resolution, so a tie counts as revoked
+        return revoked_at is not None and issued_at <= revoked_at
+
+    def refresh(self) -> int:
+        """
+        Load users changed since the last refresh, and check that the users
+        this process authenticated still exist. Returns how many were revoked.
+        """
+        now = datetime.utcnow()
+        since = self._checked_through or now - self.lifetime
+        with self._lock:
+            seen = list(self._seen)
+
+        existing = set()
+        with engine.connect() as conn:
+            rows = conn.execute(
+                select(User.id, User.updated_at).where(User.updated_at >= since)
+            ).all()
+            for start in range(0, len(seen), self.CHECK_CHUNK):
+                existing.update(conn.execute(
+                    select(User.id).where(User.id.in_(seen[start:start + self.CHECK_CHUNK]))
+                ).scalars())
+        deleted = [user_id for user_id in seen if user_id not in existing]
+
+        for user_id, updated_at in rows:
+            self.revoke(user_id, updated_at)
+            principal_cache.invalidate(user_id)
+        for user_id in deleted:
+            self.revoke(user_id, now)
+            principal_cache.invalidate(user_id)
+
+        with self._lock:
+            # Re-read a small overlap so rows committed late are not missed
+            self._checked_through = now - timedelta(seconds=5)
+            cutoff = now - self.lifetime
+            self._revoked = {
+                user_id: when for user_id, when in self._revoked.items() if when >= cutoff
+            }
+            for user_id in deleted:
+                self._seen.pop(user_id, None)
+            self._seen = {
+                user_id: when for user_id, when in self._seen.items() if when >= cutoff
+            }
+        if deleted:
+            logger.info(f"Revoked {len(deleted)} deleted user(s)")
+        return len(rows) + len(deleted)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._revoked)
+
+
+# Singleton instances
+principal_cache = PrincipalCache(
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE
+)
+revocations = RevocationList(
+    lifetime=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+    # Claims stop being trusted if refreshes stall for a few intervals
+    max_staleness=timedelta(seconds=3 * settings.REVOCATION_REFRESH_SECONDS + 5)
+)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target: User) -> None:
+    """Invalidate immediately in this process; other workers catch up on refresh."""
+    principal_cache.invalidate(target.id)
+    revocations.revoke(target.id)
+
+
+# Background refresh of the revocation list, started from the FastAPI lifespan
+revocation_task = PeriodicTask(
+    name="auth-revocations",
+    interval=settings.REVOCATION_REFRESH_SECONDS,
+    func=revocations.refresh,
+    run_on_start=True
+)
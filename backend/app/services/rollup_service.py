@@ -0,0 +1,253 @@
+from sqlalchemy import Date, delete, func, insert, or_, select, text
+from sqlalchemy.orm import Session
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, List, Optional, Set, Tuple
+from app.core.config import settings
+from app.core.hll import HyperLogLog
+from app.core.tasks import PeriodicTask
+from app.db.session import SessionLocal
+from app.models.analytics import AnalyticsEvent
+from app.models.change_version import ANALYTICS_ROLLUPS
+from app.models.contact import ContactSubmission
+from app.models.rollup import (
+    DailyEventCount,
+    DailySketch,
+    DailySubmissionCount,
+    RollupState,
+    SketchKind
+)
+from app.services.change_versions import bump_versions
+import logging
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_NAME = "daily"
+
+# Arbitrary key for the PostgreSQL advisory lock that keeps workers from
+# running the job concurrently
+ROLLUP_LOCK_KEY = 7_200_301
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(day: date, months: int) -> date:
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def retention_cutoff(today: date, retention_months: Optional[int] = None) -> Optional[date]:
+    """
+    First day whose raw events are still kept (None keeps them forever).
+
+    Raw events before it may have been dropped by retention, so the event
+    counts and sketches of earlier days are final and never rebuilt.
+    """
+    if retention_months is None:
+        retention_months = settings.ANALYTICS_RETENTION_MONTHS
+    if retention_months <= 0:
+        return None
+    return add_months(month_start(today), -retention_months)
+
+
+def event_day(column):
+    """Calendar day of a timestamp column, portable across PostgreSQL and SQLite."""
+    return func.date(column, type_=Date)
+
+
+def get_covered_through(db: Session) -> Optional[date]:
+    """Last day whose rollups are complete, or None if the job never ran."""
+    return db.query(RollupState.covered_through).filter(
+        RollupState.name == ROLLUP_NAME
+    ).scalar()
+
+
+def run_daily_rollup(db: Session, now: Optional[datetime] = None) -> List[date]:
+    """
+    Recompute daily rollups for every complete day that changed since the last run.
+    Returns the days that were reprocessed.
+    """
+    now = now or datetime.utcnow()
+    today = now.date()
+
+    if not _try_lock(db):
+        logger.info("Rollup already running in another worker, skipping")
+        return []
+
+    state = db.get(RollupState, ROLLUP_NAME)
+    if state is None:
+        state = RollupState(name=ROLLUP_NAME)
+        db.add(state)
+
+    days = sorted(_changed_days(db, state, today))
+    cutoff = retention_cutoff(today)
+    for start, end in _contiguous_ranges(days):
+        _rebuild_range(db, start, end, cutoff)
+
+    covered_through = today - timedelta(days=1)
+    if days or state.covered_through != covered_through:
+        # Summaries read rollups up to covered_through
+        bump_versions(db, ANALYTICS_ROLLUPS)
+    state.covered_through = covered_through
+    state.last_run_at = now
+    db.commit()
+
+    if days:
+        logger.info(f"Rolled up {len(days)} day(s): {days[0]} .. {days[-1]}")
+    return days
+
+
+def _try_lock(db: Session) -> bool:
+    if db.get_bind().dialect.name != "postgresql":
+        return True
+    return bool(db.execute(
+        text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": ROLLUP_LOCK_KEY}
+    ).scalar())
+
+
+def _changed_days(db: Session, state: RollupState, today: date) -> Set[date]:
+    """Complete days whose raw rows changed since the last run."""
+    if state.last_run_at is None:
+        # First run - backfill everything before today
+        first_event = db.query(func.min(AnalyticsEvent.timestamp)).scalar()
+        first_submission = db.query(func.min(ContactSubmission.submitted_at)).scalar()
+        starts = [ts.date() for ts in (first_event, first_submission) if ts is not None]
+        if not starts:
+            return set()
+        return set(_days_between(min(starts), today - timedelta(days=1)))
+
+    # Buffered events can be written a little after their timestamp
+    since = state.last_run_at - timedelta(seconds=settings.ROLLUP_GRACE_SECONDS)
+
+    days = set()
+    days.update(
+        day for (day,) in db.query(event_day(AnalyticsEvent.timestamp)).filter(
+            AnalyticsEvent.timestamp >= since
+        ).distinct()
+    )
+    days.update(
+        day for (day,) in db.query(event_day(ContactSubmission.submitted_at)).filter(
+            or_(
+                ContactSubmission.submitted_at >= since,
+                ContactSubmission.updated_at >= since
+            )
+        ).distinct()
+    )
+
+    # Days that have completed since the last run
+    if state.covered_through is not None:
+        days.update(_days_between(state.covered_through + timedelta(days=1), today - timedelta(days=1)))
+
+    return {day for day in days if day < today}
+
+
+def _rebuild_range(db: Session, start: date, end: date, cutoff: Optional[date] = None) -> None:
+    """
+    Replace the rollup rows for every day in [start, end].
+    Days before `cutoff` (see retention_cutoff) only get their submission
+    counts recomputed; their event rollups are kept as they are.
+    """
+    start_dt = datetime.combine(start, time.min)
+    end_dt = datetime.combine(end + timedelta(days=1), time.min)
+
+    db.execute(delete(DailySubmissionCount).where(
+        DailySubmissionCount.day >= start, DailySubmissionCount.day <= end
+    ))
+
+    event_start = max(start, cutoff) if cutoff is not None else start
+    if event_start <= end:
+        _rebuild_events(db, event_start, end)
+
+    submission_day = event_day(ContactSubmission.submitted_at)
+    db.execute(insert(DailySubmissionCount).from_select(
+        ["day", "status", "count"],
+        select(submission_day, ContactSubmission.status, func.count(ContactSubmission.id)).where(
+            ContactSubmission.submitted_at >= start_dt,
+            ContactSubmission.submitted_at < end_dt
+        ).group_by(submission_day, ContactSubmission.status)
+    ))
+
+
+def _rebuild_events(db: Session, start: date, end: date) -> None:
+    """Replace the event counts and sketches for [start, end] from raw events."""
+    start_dt = datetime.combine(start, time.min)
+    end_dt = datetime.combine(end + timedelta(days=1), time.min)
+
+    for model in (DailyEventCount, DailySketch):
+        db.execute(delete(model).where(model.day >= start, model.day <= end))
+
+    day = event_day(AnalyticsEvent.timestamp)
+    db.execute(insert(DailyEventCount).from_select(
+        ["day", "event_type", "count"],
+        select(day, AnalyticsEvent.event_type, func.count(AnalyticsEvent.id)).where(
+            AnalyticsEvent.timestamp >= start_dt,
+            AnalyticsEvent.timestamp < end_dt
+        ).group_by(day, AnalyticsEvent.event_type)
+    ))
+
+    _build_sketches(db, start_dt, end_dt, SketchKind.SESSIONS, AnalyticsEvent.session_id)
+    _build_sketches(db, start_dt, end_dt, SketchKind.VISITORS, AnalyticsEvent.ip_address)
+
+
+def _build_sketches(db: Session, start_dt: datetime, end_dt: datetime, kind: SketchKind, column) -> None:
+    """Build one HyperLogLog sketch per day from the distinct values of `column`."""
+    day = event_day(AnalyticsEvent.timestamp)
+    sketches = {}
+
+    rows = db.execute(
+        select(day, column).where(
+            AnalyticsEvent.timestamp >= start_dt,
+            AnalyticsEvent.timestamp < end_dt,
+            column.isnot(None)
+        ).distinct().execution_options(yield_per=10000)
+    )
+    for row_day, value in rows:
+        sketch = sketches.get(row_day)
+        if sketch is None:
+            sketch = sketches[row_day] = HyperLogLog(settings.HLL_PRECISION)
+        sketch.add(value)
+
+    if sketches:
+        db.execute(insert(DailySketch), [
+            {"day": row_day, "kind": kind.value, "sketch": sketch.to_bytes()}
+            for row_day, sketch in sketches.items()
+        ])
+
+
+def _days_between(start: date, end: date) -> Iterable[date]:
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+
+def _contiguous_ranges(days: List[date]) -> List[Tuple[date, date]]:
+    """Collapse sorted days into inclusive (start, end) runs."""
+    ranges = []
+    for day in days:
+        if ranges and ranges[-1][1] + timedelta(days=1) == day:
+            ranges[-1] = (ranges[-1][0], day)
+        else:
+            ranges.append((day, day))
+    return ranges
+
+
+def run_rollup_job() -> None:
+    """Run the rollup in its own session (used by the scheduler and scripts)."""
+    db = SessionLocal()
+    try:
+        run_daily_rollup(db)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+# Background scheduler, started from the FastAPI lifespan
+rollup_task = PeriodicTask(
+    name="analytics-rollup",
+    interval=settings.ROLLUP_INTERVAL_SECONDS,
+    func=run_rollup_job
+)
@@ -0,0 +1,153 @@
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from app.core.config import settings
+from app.schemas.contact import ContactSubmissionCreate
+import hashlib
+import re
+import threading
+import time
+import uuid
+
+URL_PATTERN = re.compile(r"(https?://|www\.)\S+", re.IGNORECASE)
+MARKUP_PATTERN = re.compile(r"\[url=|\[/url\]|<a\s+href", re.IGNORECASE)
+REPEATED_CHARS = re.compile(r"(.)\1{9,}")
+SPAM_TERMS = (
+    "casino", "viagra", "cialis", "crypto investment", "forex signals", "payday loan",
+    "seo services", "rank your website", "backlinks", "guest post", "buy followers",
+    "web traffic", "lead generation list", "earn money online",
+)
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+def normalize_message(message: str) -> str:
+    return " ".join(message.split()).casefold()
+
+
+class SubmissionFilter:
+    """
+    Pre-insert filter for contact submissions: duplicate detection and
+    heuristic spam scoring, run before any database work.
+
+    Duplicates are tracked in a time-windowed exact set of fingerprints
+    (hash of the normalized email and message) rather than a Bloom filter:
+    contact volume is small enough that the set stays tiny, and a Bloom false
+    positive would silently drop a real lead. The set is per process; the
+    `dedupe_key` unique column catches duplicates that land on other workers,
+    and the previous bucket's key is checked before insert. Two workers
+    inserting the same payload at the same moment on either side of a bucket
+    boundary can still both succeed.
+    """
+
+    def __init__(self, window: float, max_entries: int, spam_threshold: int):
+        self.window = window
+        self.max_entries = max_entries
+        self.spam_threshold = spam_threshold
+        # fingerprint -> (expires_at, submission_id); insertion order is expiry order
+        self._recent: "OrderedDict[str, Tuple[float, uuid.UUID]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters
+        self.checked = 0
+        self.duplicates = 0
+        self.duplicates_db = 0
+        self.spam = 0
+
+    @staticmethod
+    def fingerprint(email: str, message: str) -> str:
+        data = f"{normalize_email(email)}\n{normalize_message(message)}".encode("utf-8")
+        return hashlib.sha256(data).hexdigest()
+
+    def dedupe_key(self, fingerprint: str, now: Optional[float] = None) -> str:
+        """Fingerprint plus window bucket, stored in the unique `dedupe_key` column."""
+        now = now or time.time()
+        return f"{fingerprint[:32]}:{int(now // self.window)}"
+
+    def previous_dedupe_key(self, fingerprint: str, now: Optional[float] = None) -> str:
+        """
+        Key of the previous window bucket. The unique column only catches
+        duplicates within one bucket, so a resubmission just after a bucket
+        boundary is looked up under this key as well.
+        """
+        now = now or time.time()
+        return self.dedupe_key(fingerprint, now - self.window)
+
+    def recent(self, fingerprint: str) -> Optional[uuid.UUID]:
+        """Submission id if the same payload was accepted within the window."""
+        now = time.monotonic()
+        with self._lock:
+            self.checked += 1
+            self._expire(now)
+            entry = self._recent.get(fingerprint)
+            if entry is None:
+                return None
+            self.duplicates += 1
+            return entry[1]
+
+    def remember(self, fingerprint: str, submission_id: uuid.UUID) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._recent.pop(fingerprint, None)
+            self._recent[fingerprint] = (now + self.window, submission_id)
+            while len(self._recent) > self.max_entries:
+                self._recent.popitem(last=False)
+
+    def record_db_duplicate(self) -> None:
+        with self._lock:
+            self.duplicates_db += 1
+
+    def spam_score(self, contact: ContactSubmissionCreate) -> int:
+        """Cheap heuristic score; submissions at or above SPAM_SCORE_THRESHOLD are rejected."""
+        score = 0
+        message = contact.message
+        lowered = message.casefold()
+
+        # One link is normal ("see our site"), each extra one is suspicious
+        score += max(0, len(URL_PATTERN.findall(message)) - 1)
+        if MARKUP_PATTERN.search(message):
+            score += 3
+        if URL_PATTERN.search(contact.name) or (contact.company and URL_PATTERN.search(contact.company)):
+            score += 3
+        score += 2 * sum(term in lowered for term in SPAM_TERMS)
+        if REPEATED_CHARS.search(message):
+            score += 1
+        letters = [c for c in message if c.isalpha()]
+        if len(letters) >= 20 and sum(c.isupper() for c in letters) / len(letters) > 0.7:
+            score += 1
+        return score
+
+    def is_spam(self, contact: ContactSubmissionCreate) -> bool:
+        spam = self.spam_score(contact) >= self.spam_threshold
+        if spam:
+            with self._lock:
+                self.spam += 1
+        return spam
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            rejected = self.duplicates + self.spam
+            return {
+                "tracked": len(self._recent),
+                "checked": self.checked,
+                "duplicates": self.duplicates,
+                "duplicates_db": self.duplicates_db,
+                "spam": self.spam,
+                "hit_rate": round(rejected / self.checked, 4) if self.checked else 0.0,
+            }
+
+    def _expire(self, now: float) -> None:
+        while self._recent:
+            expires_at, _ = next(iter(self._recent.values()))
+            if expires_at > now:
+                break
+            self._recent.popitem(last=False)
+
+
+# Singleton instance
+submission_filter = SubmissionFilter(
+    window=settings.CONTACT_DEDUPE_WINDOW_SECONDS,
+    max_entries=settings.CONTACT_DEDUPE_MAX_ENTRIES,
+    spam_threshold=settings.SPAM_SCORE_THRESHOLD
+)
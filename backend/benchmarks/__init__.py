@@ -0,0 +1,4 @@
+"""
+Load benchmarks for the ATTEC backend.
+Run a module with `python -m benchmarks.<name>` from the backend directory.
+"""
@@ -0,0 +1,235 @@
+"""
+Benchmark the public write paths with many concurrent clients.
+
+Compares the legacy handlers (a sync Session committed inside `async def`,
+which blocks the event loop for every query) with the AsyncSession handlers
+now serving /contact/ and /analytics/event. Requests go through the ASGI app
+in-process, so the numbers isolate the application from network overhead.
+
+The lifespan is not run, so the analytics buffer and email outbox worker
+stay idle and every request performs its database write inline (contact
+emails are only queued in the outbox). Rate limiting is switched off, since
+every request comes from the same client.
+
+At high concurrency the legacy handlers exhaust the connection pool: the
+checkout then waits for pool_timeout on the event loop thread, so nothing
+else (including the requests that would return a connection) can run. The
+legacy engine uses a short --pool-timeout so that stall shows up as errors
+instead of a run that takes pool_timeout seconds per request, and each run
+stops issuing requests after --max-seconds.
+
+Usage (from the backend directory, against a disposable database):
+    python -m benchmarks.async_writes --concurrency 100 --requests 2000
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from fastapi import Depends, FastAPI, Request
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from typing import Callable, Dict, List
+from app.core.config import settings
+from app.db import base  # noqa: F401 - registers every model on Base.metadata
+from app.db.session import Base, engine
+from app.main import app
+from app.models.contact import ContactSubmission
+from app.schemas.analytics import AnalyticsEventCreate
+from app.schemas.contact import ContactSubmissionCreate
+from app.services.analytics_service import build_event_row, bulk_insert_events
+import argparse
+import asyncio
+import httpx
+import time
+
+LEGACY_PREFIX = "/legacy"
+
+
+def build_legacy_app(pool_timeout: float) -> FastAPI:
+    """The write handlers as they were before the async port."""
+    legacy = FastAPI()
+
+    # Same pool settings as app.db.session, apart from the checkout timeout
+    if engine.dialect.name == "sqlite":
+        legacy_engine = create_engine(
+            engine.url,
+            connect_args={"check_same_thread": False},
+            pool_timeout=pool_timeout
+        )
+    else:
+        legacy_engine = create_engine(
+            engine.url,
+            pool_pre_ping=True,
+            pool_size=10,
+            max_overflow=20,
+            pool_timeout=pool_timeout
+        )
+    LegacySession = sessionmaker(autocommit=False, autoflush=False, bind=legacy_engine)
+
+    def get_db():
+        db = LegacySession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @legacy.post(f"{LEGACY_PREFIX}/contact/", status_code=201)
+    async def create_contact_submission(
+        contact: ContactSubmissionCreate,
+        request: Request,
+        db: Session = Depends(get_db)
+    ):
+        submission = ContactSubmission(
+            name=contact.name,
+            email=contact.email,
+            company=contact.company,
+            message=contact.message,
+            ip_address=request.client.host if request.client else None,
+            user_agent=request.headers.get("user-agent")
+        )
+        db.add(submission)
+        db.commit()
+        db.refresh(submission)
+        return {"success": True, "submission_id": str(submission.id)}
+
+    @legacy.post(f"{LEGACY_PREFIX}/analytics/event", status_code=201)
+    async def track_event(
+        event: AnalyticsEventCreate,
+        request: Request,
+        db: Session = Depends(get_db)
+    ):
+        row = build_event_row(
+            event,
+            request.client.host if request.client else None,
+            request.headers.get("user-agent"),
+            request.headers.get("referer")
+        )
+        bulk_insert_events(db, [row])
+        db.commit()
+        return {"success": True}
+
+    return legacy
+
+
+def contact_payload(i: int) -> dict:
+    return {
+        "name": f"Benchmark {i}",
+        "email": f"bench{i}@example.com",
+        "company": "Benchmark Ltd",
+        "message": "Load test submission from benchmarks.async_writes"
+    }
+
+
+def event_payload(i: int) -> dict:
+    return {
+        "event_type": "page_view",
+        "event_data": {"page": f"/bench/{i % 20}"},
+        "session_id": f"bench-{i % 500}"
+    }
+
+
+async def _loop_lag(stop: asyncio.Event, samples: List[float], interval: float = 0.005) -> None:
+    """Record how late the event loop wakes up - a direct measure of blocking."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - expected))
+
+
+async def run_scenario(
+    asgi_app: FastAPI,
+    path: str,
+    payload: Callable[[int], dict],
+    total: int,
+    concurrency: int,
+    max_seconds: float
+) -> Dict[str, float]:
+    transport = httpx.ASGITransport(
+        app=asgi_app,
+        raise_app_exceptions=False,
+        client=("127.0.0.1", 50000)
+    )
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(total))
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            nonlocal errors
+            for i in counter:
+                if time.perf_counter() > deadline:
+                    break
+                started = time.perf_counter()
+                response = await client.post(path, json=payload(i))
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 201:
+                    errors += 1
+
+        lag: List[float] = []
+        stop = asyncio.Event()
+        monitor = asyncio.create_task(_loop_lag(stop, lag))
+
+        started = time.perf_counter()
+        deadline = started + max_seconds
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+        stop.set()
+        await monitor
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": elapsed,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p95_ms": _percentile(latencies, 0.95) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "max_loop_lag_ms": max(lag, default=0.0) * 1000,
+    }
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _print_row(name: str, result: Dict[str, float]) -> None:
+    print(
+        f"  {name:<8} {result['rps']:>9.1f} req/s  "
+        f"p50 {result['p50_ms']:>8.1f} ms  p95 {result['p95_ms']:>8.1f} ms  "
+        f"p99 {result['p99_ms']:>8.1f} ms  loop lag {result['max_loop_lag_ms']:>7.1f} ms  "
+        f"errors {int(result['errors'])}/{int(result['requests'])}"
+    )
+
+
+async def main(total: int, concurrency: int, max_seconds: float, pool_timeout: float) -> None:
+    Base.metadata.create_all(bind=engine)
+    settings.RATE_LIMIT_ENABLED = False
+
+    legacy = build_legacy_app(pool_timeout)
+    scenarios = [
+        ("contact", f"{LEGACY_PREFIX}/contact/", "/api/v1/contact/", contact_payload),
+        ("event", f"{LEGACY_PREFIX}/analytics/event", "/api/v1/analytics/event", event_payload),
+    ]
+
+    print(f"🚀 {total} requests per run, {concurrency} concurrent clients ({engine.dialect.name})")
+    for name, legacy_path, async_path, payload in scenarios:
+        print(f"\n📊 POST {async_path}")
+        _print_row("sync", await run_scenario(legacy, legacy_path, payload, total, concurrency, max_seconds))
+        _print_row("async", await run_scenario(app, async_path, payload, total, concurrency, max_seconds))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per run")
+    parser.add_argument("--concurrency", type=int, default=100, help="Concurrent clients")
+    parser.add_argument("--max-seconds", type=float, default=60, help="Stop issuing requests after this long")
+    parser.add_argument("--pool-timeout", type=float, default=2, help="Pool checkout timeout for the legacy engine")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.max_seconds, args.pool_timeout))
@@ -0,0 +1,133 @@
+"""
+Benchmark the per-request cost of admin authentication.
+
+Calls an admin endpoint (GET /analytics/ingest/stats, which does no other
+database work) with a valid token in three modes:
+
+    db      - role claims off, principal cache off: one user lookup per request
+    cache   - role claims off, principal cache on
+    claims  - role claims trusted (checked against the revocation list)
+
+and reports latency percentiles plus SQL statements per request.
+
+Usage (from the backend directory, against a disposable database):
+    python -m benchmarks.auth --requests 2000
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import event
+from typing import Dict, List
+from app.core.config import settings
+from app.core.security import create_access_token, get_password_hash
+from app.db import base  # noqa: F401 - registers every model on Base.metadata
+from app.db.session import Base, SessionLocal, engine
+from app.main import app
+from app.models.user import User, UserRole
+from app.services.principals import principal_cache, revocations
+import argparse
+import asyncio
+import httpx
+import time
+
+BENCH_EMAIL = "bench-admin@example.com"
+PATH = "/api/v1/analytics/ingest/stats"
+
+
+def ensure_admin() -> User:
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == BENCH_EMAIL).first()
+        if user is None:
+            user = User(
+                email=BENCH_EMAIL,
+                password=get_password_hash("benchmark"),
+                name="Benchmark Admin",
+                role=UserRole.ADMIN
+            )
+            db.add(user)
+            db.commit()
+            db.refresh(user)
+        return user
+    finally:
+        db.close()
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run_mode(token: str, total: int, statements: List[int]) -> Dict[str, float]:
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": f"Bearer {token}"}
+    latencies = []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Warm up (and fill the cache in cache mode)
+        for _ in range(20):
+            await client.get(PATH, headers=headers)
+
+        statements[0] = 0
+        for _ in range(total):
+            started = time.perf_counter()
+            response = await client.get(PATH, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                raise RuntimeError(f"Unexpected status {response.status_code}: {response.text}")
+
+    latencies.sort()
+    return {
+        "mean_ms": sum(latencies) / len(latencies) * 1000,
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p95_ms": _percentile(latencies, 0.95) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "queries_per_request": statements[0] / total,
+    }
+
+
+async def main(total: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    user = ensure_admin()
+    token = create_access_token(data={"sub": str(user.id), "role": user.role.value})
+    revocations.refresh()
+
+    statements = [0]
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count(*args):
+        statements[0] += 1
+
+    cache_ttl = principal_cache.ttl
+    modes = [
+        ("db", False, 0),
+        ("cache", False, cache_ttl or 60),
+        ("claims", True, cache_ttl or 60),
+    ]
+
+    print(f"🚀 {total} sequential requests per mode ({engine.dialect.name})")
+    results = {}
+    for name, claims, ttl in modes:
+        settings.AUTH_ROLE_CLAIMS = claims
+        principal_cache.ttl = ttl
+        principal_cache.clear()
+        results[name] = result = await run_mode(token, total, statements)
+        print(
+            f"  {name:<7} mean {result['mean_ms']:>6.3f} ms  p50 {result['p50_ms']:>6.3f} ms  "
+            f"p95 {result['p95_ms']:>6.3f} ms  p99 {result['p99_ms']:>6.3f} ms  "
+            f"queries/request {result['queries_per_request']:.2f}"
+        )
+
+    saved = results["db"]["mean_ms"] - results["claims"]["mean_ms"]
+    print(f"\n📊 Saved per request vs db lookup: {saved:.3f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per mode")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
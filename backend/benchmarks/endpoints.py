@@ -0,0 +1,407 @@
+"""
+Load-test every API route and compare the results with a stored baseline.
+
+Boots `app.main:app` (lifespan included, so the analytics buffer and email
+outbox worker run as in production) against DATABASE_URL - a seeded SQLite
+file or a local PostgreSQL - and drives each route with --concurrency
+clients. Email delivery is swapped for the in-memory transport, so the
+contact path can be measured without sending anything, and rate limiting is
+switched off since every request comes from the same client.
+
+Requests go through the ASGI app in-process by default. --socket serves the
+app with uvicorn on a local port instead (adding HTTP parsing and the
+network stack), and --url points the run at a server that is already
+running; the email stub only applies to the in-process modes.
+
+Reports throughput and p50/p95/p99 latency per route, optionally as JSON
+(--output). With --baseline, a route whose p95 or throughput is more than
+--tolerance worse than the baseline, or which starts failing requests, makes
+the run exit with status 1. --max-p95-ms checks an absolute target (the
+requirements ask for responses under 200 ms).
+
+Usage (from the backend directory, against a disposable database):
+    python -m benchmarks.endpoints --concurrency 20 --requests 500
+    python -m benchmarks.endpoints --output results.json --save-baseline benchmarks/baseline.json
+    python -m benchmarks.endpoints --baseline benchmarks/baseline.json --only contact.create,analytics.summary
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set
+from app.core.config import settings
+from app.core.security import create_access_token, get_password_hash
+from app.db import base  # noqa: F401 - registers every model on Base.metadata
+from app.db.session import Base, SessionLocal, engine
+from app.main import app
+from app.models.analytics import AnalyticsEvent
+from app.models.contact import ContactStatus, ContactSubmission
+from app.models.user import User, UserRole
+from app.schemas.analytics import AnalyticsEventCreate
+from app.services.analytics_service import build_event_row, bulk_insert_events
+from app.services.email_outbox import email_outbox_worker
+from app.services.email_transports import MemoryTransport
+import argparse
+import asyncio
+import httpx
+import json
+import platform
+import socket
+import time
+import uvicorn
+
+BENCH_EMAIL = "bench-admin@example.com"
+BENCH_PASSWORD = "benchmark"
+API = settings.API_V1_PREFIX
+STATUSES = [status.value for status in ContactStatus]
+
+
+class Scenario:
+    """One route: how to build a request and which status codes count as success."""
+
+    def __init__(
+        self,
+        name: str,
+        method: str,
+        path: str,
+        expected: Set[int],
+        admin: bool = False,
+        body: Optional[Callable[[int], Any]] = None,
+        max_requests: Optional[int] = None
+    ):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.expected = expected
+        self.admin = admin
+        self.body = body
+        # Cap for routes that are slow by design (bcrypt), so a run stays short
+        self.max_requests = max_requests
+
+
+def contact_body(i: int) -> dict:
+    # Unique messages, so the duplicate filter doesn't short-circuit the insert
+    return {
+        "name": f"Benchmark {i}",
+        "email": f"bench{i}@example.com",
+        "company": "Benchmark Ltd",
+        "message": f"Load test submission {i} {time.time_ns()} from benchmarks.endpoints"
+    }
+
+
+def event_body(i: int) -> dict:
+    return {
+        "event_type": "page_view",
+        "event_data": {"page": f"/bench/{i % 20}"},
+        "session_id": f"bench-{i % 500}"
+    }
+
+
+def build_scenarios(submission_id: str) -> List[Scenario]:
+    submission = f"{API}/contact/submissions/{submission_id}"
+    return [
+        Scenario("health", "GET", "/health", {200}),
+        Scenario("root", "GET", "/", {200}),
+        Scenario("metrics", "GET", "/metrics", {200, 404}),
+        Scenario(
+            "auth.login", "POST", f"{API}/auth/login", {200},
+            body=lambda i: {"email": BENCH_EMAIL, "password": BENCH_PASSWORD},
+            max_requests=100
+        ),
+        Scenario("auth.logout", "POST", f"{API}/auth/logout", {200}),
+        Scenario("contact.create", "POST", f"{API}/contact/", {201}, body=contact_body),
+        Scenario("contact.list", "GET", f"{API}/contact/submissions?limit=50", {200}, admin=True),
+        Scenario("contact.detail", "GET", submission, {200}, admin=True),
+        Scenario(
+            "contact.update", "PATCH", submission, {200}, admin=True,
+            body=lambda i: {"status": STATUSES[i % len(STATUSES)]}
+        ),
+        Scenario("contact.outbox_stats", "GET", f"{API}/contact/email-outbox", {200}, admin=True),
+        Scenario("contact.filter_stats", "GET", f"{API}/contact/filter-stats", {200}, admin=True),
+        Scenario("analytics.event", "POST", f"{API}/analytics/event", {201}, body=event_body),
+        Scenario(
+            "analytics.batch", "POST", f"{API}/analytics/events/batch", {201},
+            body=lambda i: [event_body(i * 10 + n) for n in range(10)]
+        ),
+        Scenario("analytics.summary", "GET", f"{API}/analytics/summary", {200}, admin=True),
+        Scenario("analytics.ingest_stats", "GET", f"{API}/analytics/ingest/stats", {200}, admin=True),
+        Scenario("analytics.cache_stats", "GET", f"{API}/analytics/cache/stats", {200}, admin=True),
+        Scenario("export.submissions", "GET", f"{API}/export/submissions?format=ndjson", {200}, admin=True),
+        Scenario("export.events", "GET", f"{API}/export/events?format=csv", {200}, admin=True),
+    ]
+
+
+def seed(rows: int) -> Dict[str, str]:
+    """Make sure the benchmark admin and at least `rows` submissions and events exist."""
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == BENCH_EMAIL).first()
+        if user is None:
+            user = User(
+                email=BENCH_EMAIL,
+                password=get_password_hash(BENCH_PASSWORD),
+                name="Benchmark Admin",
+                role=UserRole.ADMIN
+            )
+            db.add(user)
+            db.commit()
+            db.refresh(user)
+
+        missing = rows - db.query(ContactSubmission).count()
+        if missing > 0:
+            db.add_all(
+                ContactSubmission(
+                    name=f"Seed {i}",
+                    email=f"seed{i}@example.com",
+                    company="Seed Ltd",
+                    message=f"Seeded submission {i} for benchmarks.endpoints"
+                )
+                for i in range(missing)
+            )
+            db.commit()
+
+        missing = rows - db.query(AnalyticsEvent).count()
+        if missing > 0:
+            bulk_insert_events(db, [
+                build_event_row(AnalyticsEventCreate(**event_body(i)), "127.0.0.1", "benchmarks", None)
+                for i in range(missing)
+            ])
+            db.commit()
+
+        submission_id = db.query(ContactSubmission.id).order_by(ContactSubmission.submitted_at.desc()).first()[0]
+        token = create_access_token(data={"sub": str(user.id), "role": user.role.value})
+        return {"token": token, "submission_id": str(submission_id)}
+    finally:
+        db.close()
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    token: str,
+    total: int,
+    concurrency: int,
+    max_seconds: float
+) -> Dict[str, Any]:
+    if scenario.max_requests:
+        total = min(total, scenario.max_requests)
+    headers = {"Authorization": f"Bearer {token}"} if scenario.admin else {}
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            if time.perf_counter() > deadline:
+                break
+            kwargs = {"headers": headers}
+            if scenario.body is not None:
+                kwargs["json"] = scenario.body(i)
+            started = time.perf_counter()
+            try:
+                response = await client.request(scenario.method, scenario.path, **kwargs)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = 0
+            latencies.append(time.perf_counter() - started)
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+            if status not in scenario.expected:
+                errors += 1
+
+    started = time.perf_counter()
+    deadline = started + max_seconds
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "method": scenario.method,
+        "path": scenario.path,
+        "requests": len(latencies),
+        "errors": errors,
+        "statuses": statuses,
+        "seconds": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+        "max_ms": round(max(latencies, default=0.0) * 1000, 3),
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@asynccontextmanager
+async def serve(mode: str, url: Optional[str], concurrency: int):
+    """Yield an httpx client for the selected mode, with the app running behind it."""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    timeout = httpx.Timeout(60.0)
+
+    if mode == "url":
+        async with httpx.AsyncClient(base_url=url, limits=limits, timeout=timeout) as client:
+            yield client
+        return
+
+    if mode == "socket":
+        port = _free_port()
+        server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+        task = asyncio.create_task(server.serve())
+        while not server.started:
+            if task.done():
+                task.result()
+            await asyncio.sleep(0.05)
+        try:
+            async with httpx.AsyncClient(
+                base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=timeout
+            ) as client:
+                yield client
+        finally:
+            server.should_exit = True
+            await task
+        return
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False, client=("127.0.0.1", 50000))
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=timeout) as client:
+            yield client
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float,
+    min_delta_ms: float
+) -> List[str]:
+    """Regressions against the baseline, one message per failing check."""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        p95, old_p95 = result["p95_ms"], previous["p95_ms"]
+        # Sub-millisecond routes jitter by more than any sensible tolerance
+        if p95 > old_p95 * (1 + tolerance) and p95 - old_p95 > min_delta_ms:
+            regressions.append(f"{name}: p95 {old_p95:.1f} -> {p95:.1f} ms")
+        if result["rps"] < previous["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {previous['rps']:.1f} -> {result['rps']:.1f} req/s")
+        if result["errors"] and not previous["errors"]:
+            regressions.append(f"{name}: {result['errors']} failed requests (statuses {result['statuses']})")
+    return regressions
+
+
+def _print_row(name: str, result: Dict[str, Any]) -> None:
+    print(
+        f"  {name:<24} {result['rps']:>8.1f} req/s  p50 {result['p50_ms']:>7.1f} ms  "
+        f"p95 {result['p95_ms']:>7.1f} ms  p99 {result['p99_ms']:>7.1f} ms  "
+        f"errors {result['errors']}/{result['requests']}"
+    )
+
+
+async def main(args) -> int:
+    settings.RATE_LIMIT_ENABLED = False
+    if args.mode != "url":
+        Base.metadata.create_all(bind=engine)
+        # Contact emails are queued and "delivered" without leaving the process
+        email_outbox_worker.transport = MemoryTransport()
+    fixtures = seed(args.seed_rows)
+
+    scenarios = build_scenarios(fixtures["submission_id"])
+    if args.only:
+        wanted = set(args.only.split(","))
+        unknown = wanted - {scenario.name for scenario in scenarios}
+        if unknown:
+            raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+        scenarios = [scenario for scenario in scenarios if scenario.name in wanted]
+
+    print(
+        f"🚀 {args.requests} requests per route, {args.concurrency} concurrent clients "
+        f"({args.mode}, {engine.dialect.name})"
+    )
+    results = {}
+    async with serve(args.mode, args.url, args.concurrency) as client:
+        for scenario in scenarios:
+            # Warm up caches, pools and lazy imports before measuring
+            await run_scenario(client, scenario, fixtures["token"], 10, 1, args.max_seconds)
+            results[scenario.name] = result = await run_scenario(
+                client, scenario, fixtures["token"], args.requests, args.concurrency, args.max_seconds
+            )
+            _print_row(scenario.name, result)
+
+    if isinstance(email_outbox_worker.transport, MemoryTransport):
+        print(f"\n📧 Emails captured by the stub transport: {len(email_outbox_worker.transport.sent)}")
+
+    report = {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "mode": args.mode,
+            "database": engine.dialect.name,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+        },
+        "endpoints": results,
+    }
+    for path in filter(None, (args.output, args.save_baseline)):
+        Path(path).write_text(json.dumps(report, indent=2) + "\n")
+        print(f"💾 Results written to {path}")
+
+    failures = []
+    if args.max_p95_ms:
+        failures += [
+            f"{name}: p95 {result['p95_ms']:.1f} ms exceeds {args.max_p95_ms:.0f} ms"
+            for name, result in results.items()
+            if result["p95_ms"] > args.max_p95_ms
+        ]
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        if baseline["meta"].get("mode") != args.mode or baseline["meta"].get("database") != engine.dialect.name:
+            print(f"⚠️  Baseline was recorded with {baseline['meta'].get('mode')}/{baseline['meta'].get('database')}")
+        failures += compare(results, baseline["endpoints"], args.tolerance, args.min_delta_ms)
+
+    if failures:
+        print("\n❌ Regressions:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    if args.baseline or args.max_p95_ms:
+        print("\n✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500, help="Requests per route")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent clients")
+    parser.add_argument("--max-seconds", type=float, default=30, help="Stop issuing requests to a route after this long")
+    parser.add_argument("--seed-rows", type=int, default=1000, help="Minimum submissions and events in the database")
+    parser.add_argument("--only", help="Comma-separated scenario names (e.g. contact.create,analytics.summary)")
+    parser.add_argument("--socket", dest="mode", action="store_const", const="socket", default="asgi",
+                        help="Serve the app with uvicorn on a local port")
+    parser.add_argument("--url", help="Benchmark a server that is already running (e.g. http://127.0.0.1:8000)")
+    parser.add_argument("--output", help="Write the results as JSON")
+    parser.add_argument("--baseline", help="Fail when results regress against this JSON report")
+    parser.add_argument("--save-baseline", help="Write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="Ignore p95 regressions smaller than this")
+    parser.add_argument("--max-p95-ms", type=float, help="Fail any route whose p95 exceeds this (e.g. 200)")
+    args = parser.parse_args()
+    if args.url:
+        args.mode = "url"
+    sys.exit(asyncio.run(main(args)))
@@ -0,0 +1,139 @@
+"""
+Benchmark login throughput under a burst of concurrent attempts.
+
+Compares the legacy handler (sync endpoint verifying bcrypt inline on
+FastAPI's shared threadpool) with POST /auth/login, which verifies on the
+bounded password-hashing pool and answers 429 once it is saturated.
+While each burst runs, a probe polls GET /health (a sync endpoint on the
+shared threadpool) to show how much the logins slow everything else down.
+
+Usage (from the backend directory, against a disposable database):
+    python -m benchmarks.login --concurrency 50 --requests 500
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from fastapi import Depends, FastAPI, HTTPException
+from sqlalchemy.orm import Session
+from typing import Dict, List
+from app.core.config import settings
+from app.core.security import get_password_hash, password_hasher, verify_password
+from app.db import base  # noqa: F401 - registers every model on Base.metadata
+from app.db.session import Base, SessionLocal, engine, get_db
+from app.main import app
+from app.models.user import User, UserRole
+from app.schemas.user import UserLogin
+import argparse
+import asyncio
+import httpx
+import time
+
+BENCH_EMAIL = "bench-login@example.com"
+BENCH_PASSWORD = "benchmark-password"
+LEGACY_PATH = "/legacy/auth/login"
+
+
+def ensure_user() -> None:
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == BENCH_EMAIL).first()
+        if user is None:
+            db.add(User(
+                email=BENCH_EMAIL,
+                password=get_password_hash(BENCH_PASSWORD),
+                name="Benchmark Login",
+                role=UserRole.ADMIN
+            ))
+        else:
+            user.password = get_password_hash(BENCH_PASSWORD)
+        db.commit()
+    finally:
+        db.close()
+
+
+def mount_legacy_login() -> None:
+    """The login handler as it was: bcrypt inline on the shared threadpool."""
+    @app.post(LEGACY_PATH)
+    def legacy_login(credentials: UserLogin, db: Session = Depends(get_db)):
+        user = db.query(User).filter(User.email == credentials.email).first()
+        if not user or not verify_password(credentials.password, user.password):
+            raise HTTPException(status_code=401, detail="Incorrect email or password")
+        return {"success": True}
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run_burst(path: str, total: int, concurrency: int) -> Dict[str, float]:
+    transport = httpx.ASGITransport(app=app)
+    latencies: List[float] = []
+    probes: List[float] = []
+    statuses: Dict[int, int] = {}
+    counter = iter(range(total))
+    done = asyncio.Event()
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def worker():
+            for _ in counter:
+                started = time.perf_counter()
+                response = await client.post(path, json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD})
+                latencies.append(time.perf_counter() - started)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        async def probe():
+            while not done.is_set():
+                started = time.perf_counter()
+                await client.get("/health")
+                probes.append(time.perf_counter() - started)
+                await asyncio.sleep(0.05)
+
+        probe_task = asyncio.create_task(probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe_task
+
+    latencies.sort()
+    probes.sort()
+    return {
+        "ok_per_second": statuses.get(200, 0) / elapsed,
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p95_ms": _percentile(latencies, 0.95) * 1000,
+        "rejected": statuses.get(429, 0),
+        "probe_p95_ms": _percentile(probes, 0.95) * 1000,
+        "statuses": statuses,
+    }
+
+
+async def main(total: int, concurrency: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    ensure_user()
+    mount_legacy_login()
+
+    print(
+        f"🚀 {total} logins, {concurrency} concurrent, bcrypt rounds {settings.BCRYPT_ROUNDS}, "
+        f"pool {password_hasher.max_workers} workers / {password_hasher.max_in_flight} in flight"
+    )
+    for name, path in (("legacy", LEGACY_PATH), ("pooled", "/api/v1/auth/login")):
+        result = await run_burst(path, total, concurrency)
+        print(
+            f"  {name:<7} {result['ok_per_second']:>7.1f} ok/s  p50 {result['p50_ms']:>8.1f} ms  "
+            f"p95 {result['p95_ms']:>8.1f} ms  429s {result['rejected']:>4}  "
+            f"/health p95 {result['probe_p95_ms']:>7.1f} ms  {result['statuses']}"
+        )
+    password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500, help="Login attempts per run")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent clients")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,151 @@
+"""
+Benchmark JSON serialization of contact submission lists.
+
+Serializes the same submissions (default: 1,000 with 2,000-character
+messages) the ways the API has done it and reports the cost per 1,000:
+
+    pydantic+json    ORM objects -> ContactSubmissionList -> FastAPI's response
+                     validation -> JSONResponse (the previous list path)
+    pydantic+orjson  the same, rendered with ORJSONResponse (the default
+                     response class alone)
+    rows+orjson      Core rows -> dicts -> ORJSONResponse (the list endpoint now)
+
+plus the NDJSON export encoder with json.dumps versus orjson. No database is
+needed; the rows are built in memory.
+
+Usage (from the backend directory):
+    python -m benchmarks.serialization --rows 1000
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Any, Callable, List
+from app.models.contact import ContactStatus, ContactSubmission
+from app.schemas.contact import ContactSubmissionList, ContactSubmissionResponse
+import argparse
+import asyncio
+import json
+import orjson
+import random
+import time
+import uuid
+
+COLUMNS = list(ContactSubmissionResponse.model_fields)
+
+
+def build_submissions(count: int, message_length: int) -> List[ContactSubmission]:
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    words = ["integration", "pipeline", "automation", "model", "data", "team", "quote", "timeline"]
+    submissions = []
+    for i in range(count):
+        message = " ".join(rng.choice(words) for _ in range(message_length // 6))[:message_length]
+        submitted = now - timedelta(minutes=i)
+        submissions.append(ContactSubmission(
+            id=uuid.UUID(int=rng.getrandbits(128)),
+            name=f"Visitor {i}",
+            email=f"visitor{i}@example.com",
+            company="Example Ltd" if i % 2 else None,
+            message=message,
+            status=rng.choice(list(ContactStatus)),
+            ip_address="203.0.113.7",
+            assigned_to=None,
+            notes=None,
+            submitted_at=submitted,
+            created_at=submitted,
+            updated_at=submitted
+        ))
+    return submissions
+
+
+def _json_default(value: Any) -> Any:
+    # The export encoder's former fallback for json.dumps
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(type(value).__name__)
+
+
+async def measure(func: Callable, repeat: int) -> float:
+    """Best of `repeat` runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        if asyncio.iscoroutine(result):
+            await result
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+async def main(count: int, message_length: int, repeat: int) -> None:
+    submissions = build_submissions(count, message_length)
+    rows = [tuple(getattr(s, column) for column in COLUMNS) for s in submissions]
+    field = create_model_field("Response_list", ContactSubmissionList, mode="serialization")
+
+    async def pydantic_path(response_class):
+        model = ContactSubmissionList(total=count, items=submissions, skip=0, limit=count)
+        content = await serialize_response(field=field, response_content=model)
+        return response_class(content).body
+
+    def rows_path():
+        items = [dict(zip(COLUMNS, row)) for row in rows]
+        return ORJSONResponse({
+            "total": count, "total_is_estimate": False, "items": items,
+            "skip": 0, "limit": count, "next_cursor": None
+        }).body
+
+    def ndjson_json():
+        return "".join(
+            json.dumps(dict(zip(COLUMNS, row)), default=_json_default, ensure_ascii=False) + "\n"
+            for row in rows
+        ).encode("utf-8")
+
+    def ndjson_orjson():
+        return b"".join(
+            orjson.dumps(dict(zip(COLUMNS, row)), option=orjson.OPT_APPEND_NEWLINE) for row in rows
+        )
+
+    # Both list paths must produce the same document
+    legacy = json.loads(await pydantic_path(JSONResponse))
+    assert legacy == json.loads(rows_path()), "rows+orjson output differs from the pydantic path"
+
+    per_thousand = 1000 / count
+    cases = [
+        ("pydantic+json", lambda: pydantic_path(JSONResponse)),
+        ("pydantic+orjson", lambda: pydantic_path(ORJSONResponse)),
+        ("rows+orjson", rows_path),
+        ("ndjson json", ndjson_json),
+        ("ndjson orjson", ndjson_orjson),
+    ]
+
+    print(f"🚀 {count} submissions, {message_length}-char messages, best of {repeat}")
+    results = {}
+    for name, func in cases:
+        results[name] = await measure(func, repeat) * per_thousand * 1000
+        print(f"  {name:<16} {results[name]:>8.2f} ms per 1,000")
+
+    print(
+        f"\n📊 List: {results['pydantic+json'] / results['rows+orjson']:.1f}x faster, "
+        f"NDJSON: {results['ndjson json'] / results['ndjson orjson']:.1f}x faster"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000, help="Submissions per run")
+    parser.add_argument("--message-length", type=int, default=2000, help="Characters per message")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per case (best is reported)")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.message_length, args.repeat))
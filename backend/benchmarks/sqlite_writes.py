@@ -0,0 +1,167 @@
+"""
+Benchmark sustained SQLite insert throughput with concurrent readers.
+
+Writer threads insert analytics events (the same INSERT as /analytics/event)
+as fast as they can while reader threads run a
+summary-style GROUP BY over the table. Every writer thread commits on its
+own connection. Each configuration gets a fresh database file, since
+journal_mode=WAL persists in the file:
+
+- default: SQLite's defaults (rollback journal, synchronous=FULL)
+- tuned: the PRAGMAs from app.db.sqlite (SQLITE_* settings)
+
+"locked" counts writes that failed with "database is locked" after waiting
+busy_timeout.
+
+Usage (from the backend directory):
+    python -m benchmarks.sqlite_writes --writers 8 --readers 4 --seconds 10
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine, exc, func, select
+from sqlalchemy.orm import sessionmaker
+from datetime import datetime, timedelta
+from typing import Dict, List
+from app.db.session import Base, SQLITE_PRAGMAS
+from app.db.sqlite import configure_sqlite
+from app.models.analytics import AnalyticsEvent
+from app.models.change_version import ChangeVersion
+from app.schemas.analytics import AnalyticsEventCreate
+from app.services.analytics_service import build_event_row, bulk_insert_events
+import argparse
+import tempfile
+import threading
+import time
+
+MODES = ("default", "tuned")
+
+
+def build_session_factory(path: Path, tuned: bool) -> sessionmaker:
+    """Engine and session factory shaped like app.db.session's for a SQLite file."""
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        pool_size=32,
+        max_overflow=0
+    )
+    if tuned:
+        configure_sqlite(engine, SQLITE_PRAGMAS)
+    Base.metadata.create_all(bind=engine, tables=[AnalyticsEvent.__table__, ChangeVersion.__table__])
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def event_rows(count: int) -> List[dict]:
+    event = AnalyticsEventCreate(event_type="page_view", session_id="bench", event_data={"path": "/"})
+    return [build_event_row(event, "127.0.0.1", "benchmark", None) for _ in range(count)]
+
+
+def run_mode(
+    mode: str,
+    directory: Path,
+    writers: int,
+    readers: int,
+    rows_per_write: int,
+    seconds: float
+) -> Dict[str, float]:
+    Session = build_session_factory(directory / f"{mode}.db", tuned=mode != "default")
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    totals = {"rows": 0, "writes": 0, "locked": 0, "errors": 0}
+    read_latencies: List[float] = []
+
+    def write_loop():
+        while not stop.is_set():
+            rows = event_rows(rows_per_write)
+            try:
+                with Session() as db:
+                    bulk_insert_events(db, rows)
+                    db.commit()
+            except exc.OperationalError as e:
+                with lock:
+                    totals["locked" if "locked" in str(e) else "errors"] += 1
+                continue
+            with lock:
+                totals["rows"] += rows_per_write
+                totals["writes"] += 1
+
+    def read_loop():
+        since = datetime.utcnow() - timedelta(days=1)
+        statement = select(AnalyticsEvent.event_type, func.count()).where(
+            AnalyticsEvent.timestamp >= since
+        ).group_by(AnalyticsEvent.event_type)
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                with Session() as db:
+                    db.execute(statement).all()
+            except exc.OperationalError:
+                with lock:
+                    totals["errors"] += 1
+                continue
+            with lock:
+                read_latencies.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=write_loop) for _ in range(writers)]
+    threads += [threading.Thread(target=read_loop) for _ in range(readers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    Session.kw["bind"].dispose()
+
+    read_latencies.sort()
+    return {
+        "rows_per_sec": totals["rows"] / elapsed,
+        "writes_per_sec": totals["writes"] / elapsed,
+        "locked": totals["locked"],
+        "errors": totals["errors"],
+        "reads_per_sec": len(read_latencies) / elapsed,
+        "read_p50_ms": _percentile(read_latencies, 0.50) * 1000,
+        "read_p95_ms": _percentile(read_latencies, 0.95) * 1000,
+    }
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _print_row(name: str, result: Dict[str, float]) -> None:
+    print(
+        f"  {name:<8} {result['rows_per_sec']:>9.0f} rows/s  {result['writes_per_sec']:>8.0f} writes/s  "
+        f"locked {int(result['locked'])}  "
+        f"reads {result['reads_per_sec']:>7.0f}/s  p50 {result['read_p50_ms']:>6.1f} ms  "
+        f"p95 {result['read_p95_ms']:>6.1f} ms  errors {int(result['errors'])}"
+    )
+
+
+def main(writers: int, readers: int, rows_per_write: int, seconds: float, modes: List[str]) -> None:
+    print(
+        f"🚀 {writers} writer and {readers} reader threads, {rows_per_write} row(s) per write, "
+        f"{seconds:.0f}s per configuration"
+    )
+    with tempfile.TemporaryDirectory(prefix="sqlite-bench-") as directory:
+        for mode in modes:
+            _print_row(mode, run_mode(mode, Path(directory), writers, readers, rows_per_write, seconds))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=8, help="Concurrent writer threads")
+    parser.add_argument("--readers", type=int, default=4, help="Concurrent reader threads")
+    parser.add_argument("--rows-per-write", type=int, default=1, help="Events per write (1 = /analytics/event)")
+    parser.add_argument("--seconds", type=float, default=10, help="Duration of each configuration")
+    parser.add_argument("--mode", choices=MODES, action="append", help="Configuration to run (repeatable; default all)")
+    args = parser.parse_args()
+    main(args.writers, args.readers, args.rows_per_write, args.seconds, args.mode or list(MODES))
@@ -0,0 +1,46 @@
+"""
+Script to deliver queued emails from the outbox.
+Schedule it (e.g. a Render cron job) when EMAIL_OUTBOX_ENABLED is False.
+Use --retry-dead to requeue emails that exhausted their attempts, --stats to
+only print the counts per status.
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.db.session import async_engine
+from app.services.email_outbox import email_outbox_worker, outbox_counts, requeue_dead_emails
+import argparse
+import asyncio
+
+
+async def run_outbox(retry_dead: bool = False, stats_only: bool = False):
+    try:
+        if stats_only:
+            print(f"📊 Outbox: {await outbox_counts()}")
+            return
+        
+        if retry_dead:
+            requeued = await requeue_dead_emails()
+            print(f"🔁 Requeued {requeued} dead email(s)")
+        
+        processed = await email_outbox_worker.drain()
+        await email_outbox_worker.close_transport()
+        
+        print(f"✅ Processed {processed} email(s): {email_outbox_worker.stats()}")
+        print(f"📊 Outbox: {await outbox_counts()}")
+        
+    except Exception as e:
+        print(f"❌ Error processing email outbox: {str(e)}")
+    finally:
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--retry-dead", action="store_true", help="Requeue dead emails before delivering")
+    parser.add_argument("--stats", action="store_true", help="Only print outbox counts")
+    args = parser.parse_args()
+    asyncio.run(run_outbox(retry_dead=args.retry_dead, stats_only=args.stats))
@@ -0,0 +1,51 @@
+"""
+Script to maintain the monthly analytics_events partitions (PostgreSQL only).
+Pre-creates upcoming partitions and detaches/drops partitions older than
+ANALYTICS_RETENTION_MONTHS (only once the rollup job has covered them).
+Run it daily (e.g. a Render cron job) when the in-process task is disabled.
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.db.session import engine
+from app.core.config import settings
+from app.services.partition_service import is_partitioned, list_partitions, maintain_partitions
+import argparse
+
+
+def manage_partitions(months_ahead: int, retention_months: int, dry_run: bool = False):
+    if engine.dialect.name != "postgresql":
+        print("ℹ️  Partitioning is only supported on PostgreSQL - nothing to do")
+        return
+    
+    try:
+        with engine.begin() as conn:
+            if not is_partitioned(conn):
+                print("❌ analytics_events is not partitioned - run `alembic upgrade head` first")
+                return
+            
+            if dry_run:
+                for month, name in sorted(list_partitions(conn).items()):
+                    print(f"{name}  {month:%Y-%m}")
+                return
+            
+            result = maintain_partitions(conn, months_ahead, retention_months)
+        
+        print(f"✅ Created: {', '.join(result['created']) or 'none'}")
+        print(f"✅ Dropped: {', '.join(result['dropped']) or 'none'}")
+        
+    except Exception as e:
+        print(f"❌ Error maintaining partitions: {str(e)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--months-ahead", type=int, default=settings.ANALYTICS_PARTITIONS_AHEAD)
+    parser.add_argument("--retention-months", type=int, default=settings.ANALYTICS_RETENTION_MONTHS,
+                        help="0 keeps every partition")
+    parser.add_argument("--list", action="store_true", dest="dry_run", help="Only list current partitions")
+    args = parser.parse_args()
+    manage_partitions(args.months_ahead, args.retention_months, args.dry_run)
@@ -0,0 +1,51 @@
+"""
+Script to run the daily analytics rollup job.
+Schedule it (e.g. a Render cron job) when the in-process scheduler is disabled.
+Use --rebuild to discard the rollup state and backfill every day again.
+Event counts and sketches are only rebuilt from the retention cutoff
+(ANALYTICS_RETENTION_MONTHS) onwards, since older raw events may be gone;
+earlier days only get their submission counts recomputed.
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.db.session import SessionLocal
+from app.models.rollup import RollupState
+from app.services.rollup_service import ROLLUP_NAME, retention_cutoff, run_daily_rollup
+from datetime import datetime
+import argparse
+
+
+def run_rollups(rebuild: bool = False):
+    db = SessionLocal()
+    
+    try:
+        if rebuild:
+            db.query(RollupState).filter(RollupState.name == ROLLUP_NAME).delete()
+            db.commit()
+            cutoff = retention_cutoff(datetime.utcnow().date())
+            if cutoff is not None:
+                print(f"ℹ️  Keeping event rollups before {cutoff} (raw events past retention)")
+        
+        days = run_daily_rollup(db)
+        
+        if days:
+            print(f"✅ Rolled up {len(days)} day(s): {days[0]} .. {days[-1]}")
+        else:
+            print("✅ Rollups already up to date")
+        
+    except Exception as e:
+        print(f"❌ Error running rollups: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rebuild", action="store_true", help="Recompute every day from scratch")
+    args = parser.parse_args()
+    run_rollups(rebuild=args.rebuild)
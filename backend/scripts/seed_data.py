@@ -0,0 +1,451 @@
+"""
+Script to fill a development or staging database with realistic synthetic data.
+
+Generates analytics events, contact submissions and users with the shapes
+production sees: visitors with a few sessions each, short sessions with a
+long tail, page views dominating the event mix, weekday/office-hour traffic
+peaks and a status mix that moves on as submissions age. Events and
+submissions are loaded in batches through COPY on PostgreSQL and a plain
+DBAPI executemany on SQLite, while --workers processes generate the next
+chunks.
+
+The same --seed and --end-date always produce the same rows (ids included).
+
+Usage (from the backend directory, against a disposable database):
+    python scripts/seed_data.py --events 1000000 --submissions 20000 --users 25
+    python scripts/seed_data.py --reset --seed 7 --end-date 2025-06-30
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.orm import Session
+from bisect import bisect
+from datetime import date, datetime, timedelta
+from collections import deque
+from itertools import accumulate
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from app.core.security import get_password_hash
+from app.db.session import SessionLocal, engine
+from app.models.analytics import AnalyticsEvent
+from app.models.change_version import ANALYTICS_EVENTS, CONTACT_SUBMISSIONS
+from app.models.contact import ContactStatus, ContactSubmission
+from app.models.user import User, UserRole
+from app.services.analytics_service import EVENT_COLUMNS, copy_rows
+from app.services.change_versions import bump_versions
+from app.services.partition_service import add_months, ensure_partition, is_partitioned, month_start
+import argparse
+import multiprocessing
+import multiprocessing.pool
+import orjson
+import os
+import random
+import time
+import uuid
+
+SUBMISSION_COLUMNS = (
+    "id", "name", "email", "company", "message", "status", "ip_address", "user_agent",
+    "assigned_to", "notes", "dedupe_key", "submitted_at", "created_at", "updated_at",
+)
+
+SEED_USER_DOMAIN = "seed.attec.example"
+SEED_USER_PASSWORD = "seed-password"
+
+# Share of traffic per UTC hour (most visitors are in East Africa, UTC+3)
+HOUR_WEIGHTS = [
+    2, 1, 1, 1, 2, 4, 7, 10, 12, 12, 11, 10,
+    10, 11, 10, 8, 6, 5, 5, 4, 4, 3, 3, 2,
+]
+# Monday .. Sunday
+WEEKDAY_WEIGHTS = [1.0, 1.05, 1.05, 1.0, 0.9, 0.5, 0.4]
+
+# Event type mix: page views dominate, conversions are rare
+EVENT_TYPES = [
+    ("page_view", 70),
+    ("button_click", 15),
+    ("service_interest", 8),
+    ("scroll_depth", 4),
+    ("contact_form_open", 2),
+    ("contact_form_submit", 1),
+]
+PAGES = [("home", 40), ("services", 20), ("about", 12), ("process", 10), ("story", 8), ("contact", 10)]
+BUTTONS = [
+    ("Start AI Journey", "hero"), ("Book a Call", "navigation"), ("Learn More", "services"),
+    ("Get Started", "process"), ("Send Message", "contact"),
+]
+SERVICES = ["AI Foundations", "AI Integration", "Custom AI Development"]
+REFERRERS = [
+    (None, 50), ("https://www.google.com/", 30), ("https://www.linkedin.com/", 10),
+    ("https://twitter.com/", 5), ("https://www.bing.com/", 3), ("https://news.ycombinator.com/", 2),
+]
+USER_AGENTS = [
+    ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36", 40),
+    ("Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Mobile Safari/537.36", 30),
+    ("Mozilla/5.0 (iPhone; CPU iPhone OS 17_5 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.5 Mobile/15E148 Safari/604.1", 15),
+    ("Mozilla/5.0 (Macintosh; Intel Mac OS X 14_5) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.5 Safari/605.1.15", 10),
+    ("Mozilla/5.0 (X11; Linux x86_64; rv:127.0) Gecko/20100101 Firefox/127.0", 5),
+]
+
+FIRST_NAMES = [
+    "Amina", "Brian", "Catherine", "David", "Esther", "Felix", "Grace", "Hassan", "Irene", "James",
+    "Kevin", "Lucy", "Mary", "Njeri", "Otieno", "Peter", "Ruth", "Samuel", "Wanjiru", "Zawadi",
+]
+LAST_NAMES = [
+    "Achieng", "Kamau", "Mutua", "Odhiambo", "Wambui", "Kiprop", "Njoroge", "Omondi", "Chebet", "Mwangi",
+    "Smith", "Patel", "Okafor", "Mensah", "Nkosi",
+]
+COMPANIES = [
+    None, "Savannah Logistics", "Nairobi Fintech", "Rift Valley Agritech", "Coastline Retail",
+    "Kilimanjaro Health", "Lakeside Energy", "Safari Telecom", "Uhuru Insurance", "Mara Analytics",
+]
+EMAIL_DOMAINS = ["gmail.com", "yahoo.com", "outlook.com", "company.co.ke", "example.org"]
+MESSAGE_OPENERS = [
+    "We are exploring {service} for our team.",
+    "I'd like to discuss {service} and what a first project could look like.",
+    "Our operations team is interested in {service}.",
+    "Could you share pricing for {service}?",
+]
+MESSAGE_DETAILS = [
+    "We currently process most of our customer requests by hand.",
+    "We have about five years of sales data in spreadsheets.",
+    "Our support volume doubled this year and we need help triaging it.",
+    "We tried an off-the-shelf chatbot but it did not fit our workflow.",
+    "Timeline is flexible, ideally something running this quarter.",
+    "Budget has been approved for a pilot.",
+]
+NOTES = ["Called, follow up next week", "Sent proposal", "Waiting on budget approval", "Not a fit right now"]
+
+
+def _picker(rng: random.Random, pairs) -> Callable[[], Any]:
+    """Weighted choice from (value, weight) pairs; cheaper per call than random.choices."""
+    values = [value for value, _ in pairs]
+    cumulative = list(accumulate(weight for _, weight in pairs))
+    total = cumulative[-1]
+    return lambda: values[bisect(cumulative, rng.random() * total)]
+
+
+class TrafficModel:
+    """Draws timestamps following the weekday, hour-of-day and growth pattern."""
+
+    def __init__(self, rng: random.Random, end_date: date, days: int):
+        self.start = datetime.combine(end_date - timedelta(days=days - 1), datetime.min.time())
+        # Traffic grows over the period, ending at roughly twice the starting level
+        self.day = _picker(rng, [
+            (n, WEEKDAY_WEIGHTS[(self.start + timedelta(days=n)).weekday()] * (1 + n / max(1, days - 1)))
+            for n in range(days)
+        ])
+        self.hour = _picker(rng, list(enumerate(HOUR_WEIGHTS)))
+        self.rng = rng
+
+    def moment(self) -> datetime:
+        return self.start + timedelta(days=self.day(), hours=self.hour(), seconds=self.rng.random() * 3600)
+
+
+# Rows are generated pre-encoded (hex UUIDs, JSON text, timestamp strings), a
+# form both COPY and sqlite3 accept as is, so loading skips per-value type
+# processing. SQLAlchemy reads these values back as usual.
+
+def _uuid(rng: random.Random) -> str:
+    # Random UUID with the version 4 / RFC 4122 variant bits set
+    bits = rng.getrandbits(128) & ~(0xF000 << 64) & ~(0xC000 << 48) | (0x4000 << 64) | (0x8000 << 48)
+    return f"{bits:032x}"
+
+
+def _timestamp(moment: datetime) -> str:
+    return moment.isoformat(" ", "microseconds")
+
+
+def _visitor_ip(visitor: int) -> str:
+    return f"41.{(visitor >> 16) % 256}.{(visitor >> 8) % 256}.{visitor % 256}"
+
+
+def generate_events(rng: random.Random, traffic: TrafficModel, total: int, visitors: int) -> Iterator[Tuple]:
+    """Yield `total` analytics_events rows (EVENT_COLUMNS order), grouped into sessions."""
+    event_type = _picker(rng, EVENT_TYPES)
+    page = _picker(rng, PAGES)
+    referrer_for = _picker(rng, REFERRERS)
+    user_agent_for = _picker(rng, USER_AGENTS)
+    agents = [agent for agent, _ in USER_AGENTS]
+    gap = 1 / 40
+
+    emitted = 0
+    while emitted < total:
+        # Lognormal session length: median 3 events, occasional long browsing sessions
+        length = min(total - emitted, max(1, min(60, int(rng.lognormvariate(1.1, 0.8)))))
+        # Skewed towards a core of returning visitors
+        visitor = int(visitors * rng.random() ** 2)
+        session_id = f"sess_{rng.getrandbits(64):016x}"
+        ip_address = _visitor_ip(visitor)
+        # Returning visitors mostly keep their device
+        user_agent = agents[visitor % len(agents)] if visitor % 3 else user_agent_for()
+        referrer = referrer_for()
+        moment = traffic.moment()
+
+        for n in range(length):
+            kind = "page_view" if n == 0 else event_type()
+            if kind == "button_click":
+                button, location = rng.choice(BUTTONS)
+                event_data = {"button": button, "location": location}
+            elif kind == "service_interest":
+                event_data = {"service": rng.choice(SERVICES)}
+            elif kind == "scroll_depth":
+                event_data = {"page": page(), "depth": rng.choice((25, 50, 75, 100))}
+            else:
+                event_data = {"page": page()}
+
+            yield (
+                _uuid(rng),
+                kind,
+                orjson.dumps(event_data).decode(),
+                session_id,
+                ip_address,
+                user_agent,
+                referrer if n == 0 else None,
+                _timestamp(moment),
+            )
+            # Seconds between events in a session
+            moment += timedelta(seconds=rng.expovariate(gap))
+        emitted += length
+
+
+def _submission_status(rng: random.Random, age_days: float) -> ContactStatus:
+    """New submissions are mostly untouched; older ones have been worked through."""
+    if age_days < 2:
+        weights = (85, 15, 0, 0, 0)
+    elif age_days < 14:
+        weights = (30, 40, 20, 5, 5)
+    else:
+        weights = (5, 25, 20, 15, 35)
+    return rng.choices(list(ContactStatus), weights=weights)[0]
+
+
+def generate_submissions(
+    rng: random.Random,
+    traffic: TrafficModel,
+    first: int,
+    total: int,
+    end_date: date,
+    assignees: List[str]
+) -> Iterator[Tuple]:
+    """Yield `total` contact_submissions rows (SUBMISSION_COLUMNS order), numbered from `first`."""
+    user_agent = _picker(rng, USER_AGENTS)
+    end = datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+
+    for i in range(first, first + total):
+        first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        service = rng.choice(SERVICES)
+        message = " ".join(
+            [rng.choice(MESSAGE_OPENERS).format(service=service)]
+            + rng.sample(MESSAGE_DETAILS, rng.randint(1, 3))
+        )
+        submitted_at = traffic.moment()
+        status = _submission_status(rng, (end - submitted_at).total_seconds() / 86400)
+        touched = status != ContactStatus.NEW
+        updated_at = min(end, submitted_at + timedelta(hours=rng.expovariate(1 / 30))) if touched else submitted_at
+
+        yield (
+            _uuid(rng),
+            f"{first_name} {last_name}",
+            f"{first_name}.{last_name}{i}@{rng.choice(EMAIL_DOMAINS)}".lower(),
+            rng.choice(COMPANIES),
+            message,
+            status.value,
+            _visitor_ip(rng.getrandbits(24)),
+            user_agent(),
+            rng.choice(assignees) if touched and assignees else None,
+            rng.choice(NOTES) if touched and rng.random() < 0.4 else None,
+            None,
+            _timestamp(submitted_at),
+            _timestamp(submitted_at),
+            _timestamp(updated_at),
+        )
+
+
+def load_rows(db: Session, table: str, columns: Sequence[str], rows: List[Tuple]) -> None:
+    """COPY on PostgreSQL (psycopg2), a plain DBAPI executemany elsewhere."""
+    connection = db.connection()
+    cursor = connection.connection.cursor()
+    try:
+        if connection.dialect.driver == "psycopg2":
+            copy_rows(cursor, table, columns, rows)
+            return
+        marker = "?" if connection.dialect.paramstyle == "qmark" else "%s"
+        cursor.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join([marker] * len(columns))})",
+            rows
+        )
+    finally:
+        cursor.close()
+
+
+def generate_users(rng: random.Random, total: int, password_hash: str, end_date: date) -> List[Dict[str, Any]]:
+    roles = rng.choices([UserRole.ADMIN, UserRole.EDITOR, UserRole.VIEWER], weights=(10, 30, 60), k=total)
+    end = datetime.combine(end_date, datetime.min.time())
+    users = []
+    for i, role in enumerate(roles):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        created_at = end - timedelta(days=rng.uniform(30, 720))
+        users.append({
+            "id": uuid.UUID(_uuid(rng)),
+            "email": f"seed-user{i}@{SEED_USER_DOMAIN}",
+            "password": password_hash,
+            "name": f"{first} {last}",
+            "role": role,
+            "active": rng.random() > 0.1,
+            "last_login": end - timedelta(days=rng.expovariate(1 / 5)) if rng.random() > 0.2 else None,
+            "created_at": created_at,
+            "updated_at": created_at,
+        })
+    return users
+
+
+# Rows are generated in fixed-size chunks, each from its own seeded stream, so
+# the output depends on --seed, --end-date and the volumes but not on --workers.
+CHUNK_ROWS = 20_000
+
+
+def _chunk_sizes(total: int) -> List[int]:
+    return [min(CHUNK_ROWS, total - start) for start in range(0, total, CHUNK_ROWS)]
+
+
+def _event_chunk(job) -> List[Tuple]:
+    seed, chunk, count, visitors, end_date, days = job
+    rng = random.Random(f"{seed}:events:{chunk}")
+    return list(generate_events(rng, TrafficModel(rng, end_date, days), count, visitors))
+
+
+def _submission_chunk(job) -> List[Tuple]:
+    seed, chunk, count, end_date, days, assignees = job
+    rng = random.Random(f"{seed}:submissions:{chunk}")
+    return list(generate_submissions(
+        rng, TrafficModel(rng, end_date, days), chunk * CHUNK_ROWS, count, end_date, assignees
+    ))
+
+
+def _generate(pool: Optional[multiprocessing.pool.Pool], workers: int, func, jobs: List[tuple]) -> Iterator[List[Tuple]]:
+    """Chunks in job order, generated by the pool while earlier ones are being loaded."""
+    if pool is None:
+        yield from map(func, jobs)
+        return
+    # Bounded read-ahead keeps memory flat when loading is the slower side
+    window = workers * 2
+    pending = deque()
+    for job in jobs:
+        pending.append(pool.apply_async(func, (job,)))
+        if len(pending) >= window:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
+
+
+def _ensure_partitions(end_date: date, days: int) -> None:
+    """Create monthly partitions for the seeded range so rows don't land in the default one."""
+    with engine.begin() as conn:
+        if not is_partitioned(conn):
+            return
+        month = month_start(end_date - timedelta(days=days - 1))
+        while month <= end_date:
+            if ensure_partition(conn, month):
+                print(f"📅 Created partition for {month:%Y-%m}")
+            month = add_months(month, 1)
+
+
+def seed_data(
+    events: int,
+    submissions: int,
+    users: int,
+    days: int,
+    end_date: date,
+    seed: int,
+    workers: int,
+    reset: bool = False
+):
+    db = SessionLocal()
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+
+    try:
+        if reset:
+            db.execute(delete(AnalyticsEvent))
+            db.execute(delete(ContactSubmission))
+            db.execute(delete(User).where(User.email.like(f"%@{SEED_USER_DOMAIN}")))
+            db.commit()
+            print("🗑️  Deleted existing events, submissions and seed users")
+
+        _ensure_partitions(end_date, days)
+
+        user_rows = generate_users(random.Random(f"{seed}:users"), users, get_password_hash(SEED_USER_PASSWORD), end_date)
+        existing = set(db.scalars(select(User.email).where(User.email.like(f"%@{SEED_USER_DOMAIN}"))))
+        new_users = [row for row in user_rows if row["email"] not in existing]
+        if new_users:
+            db.execute(insert(User), new_users)
+            db.commit()
+        print(f"✅ Users: {len(new_users)} created ({len(user_rows) - len(new_users)} already present)")
+
+        assignees = [row["name"] for row in user_rows if row["role"] != UserRole.VIEWER]
+        # Visitor pool for the whole run: about three sessions per visitor on average
+        visitors = max(1, events // 10)
+        tables = [
+            ("Submissions", ContactSubmission.__tablename__, SUBMISSION_COLUMNS, _submission_chunk, [
+                (seed, chunk, count, end_date, days, assignees)
+                for chunk, count in enumerate(_chunk_sizes(submissions))
+            ]),
+            ("Events", AnalyticsEvent.__tablename__, EVENT_COLUMNS, _event_chunk, [
+                (seed, chunk, count, visitors, end_date, days)
+                for chunk, count in enumerate(_chunk_sizes(events))
+            ]),
+        ]
+
+        if engine.dialect.name == "sqlite":
+            # Skip the fsync per commit while bulk loading; a crash can only lose seeded rows
+            db.execute(text("PRAGMA synchronous=OFF"))
+
+        for label, table, columns, func, jobs in tables:
+            started = time.perf_counter()
+            loaded = 0
+            for rows in _generate(pool, workers, func, jobs):
+                load_rows(db, table, columns, rows)
+                db.commit()
+                loaded += len(rows)
+            elapsed = time.perf_counter() - started
+            rate = loaded / elapsed if elapsed else 0
+            print(f"✅ {label}: {loaded:,} rows in {elapsed:.1f}s ({rate:,.0f} rows/s)")
+
+        # Invalidate cached summaries and ETags, and refresh planner statistics
+        bump_versions(db, CONTACT_SUBMISSIONS, ANALYTICS_EVENTS)
+        db.commit()
+        if engine.dialect.name == "postgresql":
+            db.execute(text("ANALYZE analytics_events"))
+            db.execute(text("ANALYZE contact_submissions"))
+            db.execute(text("ANALYZE users"))
+            db.commit()
+
+        print(f"\nSeed users log in with password: {SEED_USER_PASSWORD}")
+        print("⚠️  Historical days changed - run `python scripts/run_rollups.py --rebuild` to refresh rollups")
+
+    except Exception as e:
+        print(f"❌ Error seeding data: {str(e)}")
+        db.rollback()
+    finally:
+        if pool is not None:
+            pool.terminate()
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=100_000, help="Analytics events to generate")
+    parser.add_argument("--submissions", type=int, default=5_000, help="Contact submissions to generate")
+    parser.add_argument("--users", type=int, default=10, help="Users to generate")
+    parser.add_argument("--days", type=int, default=90, help="Spread rows over this many days")
+    parser.add_argument("--end-date", type=date.fromisoformat, default=date.today(),
+                        help="Last day of generated data (YYYY-MM-DD, default today)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes generating rows (the output is the same for any value)")
+    parser.add_argument("--reset", action="store_true",
+                        help="Delete ALL events and submissions (and previous seed users) first")
+    args = parser.parse_args()
+    seed_data(args.events, args.submissions, args.users, args.days, args.end_date, args.seed, args.workers, args.reset)
@@ -0,0 +1,96 @@
+"""
+Shared test fixtures.
+
+Tests run against a throwaway SQLite file. Settings are read when `app` is
+first imported, so the environment is set up here before anything else.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+TEST_DIR = tempfile.mkdtemp(prefix="attec-tests-")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{TEST_DIR}/test.db",
+    "ENVIRONMENT": "test",
+    "SECRET_KEY": "test-secret-key",
+    "FRONTEND_URL": "http://localhost:5173",
+    "SENDGRID_API_KEY": "test",
+    "FROM_EMAIL": "noreply@example.com",
+    "NOTIFICATION_EMAIL": "team@example.com",
+    "ADMIN_EMAIL": "admin@example.com",
+    "ADMIN_PASSWORD": "test-password",
+    "EMAIL_TRANSPORT": "console",
+    "BCRYPT_ROUNDS": "4",
+    "RATE_LIMIT_ENABLED": "False",
+})
+
+import pytest
+import shutil
+from datetime import datetime, timedelta
+from app.core.cache import cache
+from app.db import base  # noqa: F401 - registers every model on Base.metadata
+from app.db.session import Base, SessionLocal, engine
+from app.models.change_version import ChangeVersion
+from app.services.principals import principal_cache
+from app.services.submission_filter import submission_filter
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    Base.metadata.create_all(bind=engine)
+    yield
+    engine.dispose()
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def db():
+    """A session on the test database; every table is emptied afterwards."""
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+        with engine.begin() as conn:
+            for table in reversed(Base.metadata.sorted_tables):
+                # Keep the seeded version rows; their values are irrelevant
+                if table is not ChangeVersion.__table__:
+                    conn.execute(table.delete())
+        cache.clear()
+        submission_filter._recent.clear()
+        principal_cache.clear()
+
+
+@pytest.fixture
+def client(db):
+    """Requests through the ASGI app in-process; the lifespan is not run."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    return TestClient(app)
+
+
+@pytest.fixture
+def admin_headers(db):
+    """
+    Bearer token for an admin whose role claim is trusted, as on a running
+    server (the lifespan refreshes the revocation list), so authentication
+    itself issues no statements.
+    """
+    from app.core.security import create_access_token
+    from app.models.user import User, UserRole
+    from app.services.principals import revocations
+    created = datetime.utcnow() - timedelta(minutes=5)
+    admin = User(
+        email="admin@example.com", password="not-a-hash", name="Admin", role=UserRole.ADMIN,
+        created_at=created, updated_at=created
+    )
+    db.add(admin)
+    db.commit()
+    revocations.refresh()
+    token = create_access_token({"sub": str(admin.id), "role": admin.role.value})
+    return {"Authorization": f"Bearer {token}"}
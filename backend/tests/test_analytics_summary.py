@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+from app.db.profiler import statement_budget
+from app.models.analytics import AnalyticsEvent
+from app.models.contact import ContactSubmission
+from app.services.analytics_service import build_analytics_summary
+from app.services.rollup_service import run_daily_rollup
+
+
+def _seed(db, days: int = 5):
+    """A few events and one submission per day up to and including today."""
+    today = datetime.utcnow().replace(hour=9, minute=0, second=0, microsecond=0)
+    for offset in range(days):
+        at = today - timedelta(days=offset)
+        db.add_all([
+            AnalyticsEvent(event_type=event_type, session_id=f"s{offset}-{i}", ip_address=f"10.0.0.{i}", timestamp=at)
+            for i, event_type in enumerate(("page_view", "page_view", "click"))
+        ])
+        db.add(ContactSubmission(
+            name="Ada", email=f"ada{offset}@example.com", message="Hello",
+            submitted_at=at, created_at=at, updated_at=at
+        ))
+    db.commit()
+    return today.date()
+
+
+def test_summary_from_raw_rows_uses_two_statements(db):
+    # Rollup state lookup + one UNION ALL over events and submissions
+    today = _seed(db)
+    with statement_budget(2) as profile:
+        summary = build_analytics_summary(db, today - timedelta(days=10), today)
+    assert profile.statements == 2
+    assert summary.total_events == 15
+    assert summary.total_submissions == 5
+
+
+def test_summary_from_rollups_uses_four_statements(db):
+    # Rollup state, rollup UNION ALL, daily sketches, raw UNION ALL for today
+    today = _seed(db)
+    run_daily_rollup(db)
+    with statement_budget(4) as profile:
+        summary = build_analytics_summary(db, today - timedelta(days=10), today)
+    assert profile.statements == 4
+    assert summary.total_events == 15
+    assert summary.total_submissions == 5
+    assert summary.approximate
+
+
+def test_exact_summary_uses_one_statement(db):
+    today = _seed(db)
+    with statement_budget(1) as profile:
+        summary = build_analytics_summary(db, today - timedelta(days=10), today, exact=True)
+    assert profile.statements == 1
+    assert summary.unique_sessions == 15
+    assert summary.top_events[0]["event_type"] == "page_view"
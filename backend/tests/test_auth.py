@@ -0,0 +1,39 @@
+from sqlalchemy import delete
+from app.models.user import User
+from app.services.principals import revocations
+
+API = "/api/v1"
+
+
+def test_user_deleted_elsewhere_is_revoked_on_refresh(client, db, admin_headers):
+    assert client.get(f"{API}/contact/submissions", headers=admin_headers).status_code == 200
+
+    # Deleted by another worker: no ORM event fires in this process
+    db.execute(delete(User))
+    db.commit()
+    assert revocations.refresh() >= 1
+
+    response = client.get(f"{API}/contact/submissions", headers=admin_headers)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "User not found"
+
+
+def test_refresh_keeps_existing_users(client, admin_headers):
+    assert client.get(f"{API}/contact/submissions", headers=admin_headers).status_code == 200
+    revocations.refresh()
+    assert client.get(f"{API}/contact/submissions", headers=admin_headers).status_code == 200
+
+
+def test_login_rehashes_with_current_rounds(client, db):
+    import bcrypt
+    from app.core.security import password_hasher
+    old_hash = bcrypt.hashpw(b"pw-123456", bcrypt.gensalt(rounds=password_hasher.rounds + 1)).decode()
+    db.add(User(email="editor@example.com", password=old_hash, name="Editor"))
+    db.commit()
+
+    response = client.post(f"{API}/auth/login", json={"email": "editor@example.com", "password": "pw-123456"})
+    assert response.status_code == 200, response.text
+    db.expire_all()
+    new_hash = db.query(User.password).filter(User.email == "editor@example.com").scalar()
+    assert not password_hasher.needs_rehash(new_hash)
+    assert password_hasher.verify("pw-123456", new_hash)
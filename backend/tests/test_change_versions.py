@@ -0,0 +1,48 @@
+import asyncio
+from app.models.change_version import ANALYTICS_EVENTS
+from app.services.change_versions import CoalescedBump, get_versions
+
+API = "/api/v1"
+
+
+def _version(db):
+    db.expire_all()
+    return get_versions(db, ANALYTICS_EVENTS)[0]
+
+
+def test_bumps_coalesce_with_a_trailing_bump(db):
+    before = _version(db)
+    bump = CoalescedBump(ANALYTICS_EVENTS, interval=0.2)
+
+    async def burst():
+        # The first touch bumps at once, the rest share one trailing bump
+        for _ in range(5):
+            await bump.touch()
+        assert bump.bumps == 1
+        await asyncio.sleep(0.3)
+
+    asyncio.run(burst())
+    assert bump.bumps == 2
+    assert _version(db) == before + 2
+
+
+def test_flush_runs_the_trailing_bump(db):
+    before = _version(db)
+    bump = CoalescedBump(ANALYTICS_EVENTS, interval=60)
+
+    async def touch_then_shut_down():
+        await bump.touch()
+        await bump.touch()
+        await bump.flush()
+
+    asyncio.run(touch_then_shut_down())
+    assert _version(db) == before + 2
+
+
+def test_event_ingest_moves_the_version(client, db, monkeypatch):
+    from app.services.change_versions import analytics_events_version
+    monkeypatch.setattr(analytics_events_version, "interval", 0)
+    before = _version(db)
+    client.post(f"{API}/analytics/event", json={"event_type": "click"})
+    client.post(f"{API}/analytics/events/batch", json=[{"event_type": "click"}] * 3)
+    assert _version(db) == before + 2
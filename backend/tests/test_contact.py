@@ -0,0 +1,39 @@
+from app.api.endpoints import contact as contact_endpoints
+from app.core.config import settings
+from app.services.submission_filter import submission_filter
+from types import SimpleNamespace
+import json
+import time
+
+CONTACT = {"name": "Ada Lovelace", "email": "ada@example.com", "message": "Please call me back about a quote."}
+
+
+def _submit(client):
+    response = client.post(f"{settings.API_V1_PREFIX}/contact/", json=CONTACT)
+    assert response.status_code == 201
+    return response.json()["submission_id"]
+
+
+def test_duplicate_across_bucket_boundary(client, monkeypatch):
+    window = submission_filter.window
+    # Just before the end of a bucket, then just after it
+    bucket_end = (int(time.time() // window) + 1) * window
+    clock = iter([bucket_end - 1, bucket_end + 1])
+    monkeypatch.setattr(contact_endpoints, "time", SimpleNamespace(time=lambda: next(clock)))
+
+    first = _submit(client)
+    # The second request lands on another worker, without the in-memory entry
+    submission_filter._recent.clear()
+    assert _submit(client) == first
+
+
+def test_submission_export_omits_dedupe_key(client, admin_headers):
+    _submit(client)
+    response = client.get(
+        f"{settings.API_V1_PREFIX}/export/submissions", params={"format": "ndjson"}, headers=admin_headers
+    )
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 1
+    assert "dedupe_key" not in rows[0]
+    assert rows[0]["email"] == CONTACT["email"]
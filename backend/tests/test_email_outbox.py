@@ -0,0 +1,30 @@
+import asyncio
+from app.core.config import settings
+from app.models.email_outbox import EmailOutbox, EmailStatus
+from app.services.email_outbox import EmailOutboxWorker
+from app.services.email_transports import MemoryTransport
+
+
+def _worker(transport):
+    return EmailOutboxWorker(
+        max_concurrency=4, batch_size=3, poll_interval=1,
+        max_attempts=3, retry_base=1, retry_max=1, transport=transport
+    )
+
+
+def test_drain_claims_and_marks_every_due_email(client, db):
+    for i in range(3):
+        response = client.post(f"{settings.API_V1_PREFIX}/contact/", json={
+            "name": "Ada", "email": f"ada{i}@example.com", "message": f"Hello number {i}"
+        })
+        assert response.status_code == 201, response.text
+
+    transport = MemoryTransport()
+    # Two emails per submission, claimed three at a time
+    assert asyncio.run(_worker(transport).drain()) == 6
+    assert len(transport.sent) == 6
+    rows = db.query(EmailOutbox.status, EmailOutbox.attempts).all()
+    assert rows == [(EmailStatus.SENT.value, 1)] * 6
+
+    # Nothing is due any more
+    assert asyncio.run(_worker(transport).drain()) == 0
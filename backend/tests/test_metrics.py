@@ -0,0 +1,29 @@
+from app.core.config import settings
+
+
+def test_metrics_served_outside_production(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert "analytics_buffer_depth" in response.text
+
+
+def test_metrics_require_token_when_set(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-token")
+    assert client.get("/metrics").status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-token"})
+    assert response.status_code == 200
+
+
+def test_metrics_non_ascii_token_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-token")
+    response = client.get("/metrics", headers={"Authorization": "Bearer tökén".encode("latin-1")})
+    assert response.status_code == 401
+
+
+def test_metrics_not_served_in_production_without_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "ENVIRONMENT", "production")
+    assert client.get("/metrics").status_code == 404
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-token")
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-token"})
+    assert response.status_code == 200
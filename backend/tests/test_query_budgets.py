@@ -0,0 +1,90 @@
+import pytest
+from datetime import datetime
+from app.core.config import settings
+from app.db.profiler import record_requests
+from app.models.analytics import AnalyticsEvent
+from app.models.contact import ContactSubmission
+
+API = settings.API_V1_PREFIX
+
+
+@pytest.fixture
+def submissions(db):
+    rows = [
+        ContactSubmission(name=f"Lead {i}", email=f"lead{i}@example.com", message="Hello", submitted_at=datetime.utcnow())
+        for i in range(30)
+    ]
+    db.add_all(rows)
+    db.add_all([AnalyticsEvent(event_type="page_view", session_id=f"s{i}") for i in range(30)])
+    db.commit()
+    return rows
+
+
+def _statements(client, method, path, **kwargs):
+    with record_requests() as profiles:
+        response = client.request(method, path, **kwargs)
+    assert response.status_code < 300, response.text
+    assert len(profiles) == 1
+    return profiles[0].statements, response
+
+
+@pytest.mark.parametrize("query, budget", [
+    # Versions for the ETag, COUNT(*) total, the page
+    ("", 4),
+    ("?total=none", 2),
+])
+def test_submission_list(client, admin_headers, submissions, query, budget):
+    statements, response = _statements(client, "GET", f"{API}/contact/submissions{query}", headers=admin_headers)
+    assert statements <= budget
+    assert len(response.json()["items"]) == 30
+
+
+def test_submission_detail(client, admin_headers, submissions):
+    statements, _ = _statements(client, "GET", f"{API}/contact/submissions/{submissions[0].id}", headers=admin_headers)
+    assert statements <= 2
+
+
+def test_submission_update(client, admin_headers, submissions):
+    statements, _ = _statements(
+        client, "PATCH", f"{API}/contact/submissions/{submissions[0].id}",
+        headers=admin_headers, json={"notes": "Called back"}
+    )
+    assert statements <= 4
+
+
+def test_analytics_summary(client, admin_headers, submissions):
+    statements, _ = _statements(client, "GET", f"{API}/analytics/summary", headers=admin_headers)
+    assert statements <= 3
+
+
+def test_contact_create(client):
+    statements, _ = _statements(
+        client, "POST", f"{API}/contact/",
+        json={"name": "Ada", "email": "ada@example.com", "message": "Please call me back."}
+    )
+    assert statements <= 4
+
+
+def test_event_ingest(client, monkeypatch):
+    # The INSERT, then the change-version bump in its own transaction (due
+    # on every write with no coalescing interval)
+    from app.services.change_versions import analytics_events_version
+    monkeypatch.setattr(analytics_events_version, "interval", 0)
+    statements, _ = _statements(client, "POST", f"{API}/analytics/event", json={"event_type": "click"})
+    assert statements <= 2
+    statements, response = _statements(
+        client, "POST", f"{API}/analytics/events/batch", json=[{"event_type": "click"}] * 20
+    )
+    assert statements <= 2
+    assert response.json()["accepted"] == 20
+
+
+def test_server_timing_only_for_admins(client, admin_headers, submissions):
+    assert "server-timing" not in client.get(f"{API}/contact/submissions").headers
+    assert "server-timing" not in client.post(f"{API}/analytics/event", json={"event_type": "click"}).headers
+    assert "queries" in client.get(f"{API}/contact/submissions", headers=admin_headers).headers["server-timing"]
+
+
+def test_server_timing_public_opt_in(client, monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_TIMING_PUBLIC", True)
+    assert "server-timing" in client.post(f"{API}/analytics/event", json={"event_type": "click"}).headers
@@ -0,0 +1,118 @@
+from datetime import date, datetime, timedelta
+from app.core.config import settings
+from app.core.hll import HyperLogLog
+from app.models.analytics import AnalyticsEvent
+from app.models.contact import ContactStatus, ContactSubmission
+from app.models.rollup import DailyEventCount, DailySketch, DailySubmissionCount, RollupState
+from app.services.analytics_service import build_analytics_summary
+from app.services.rollup_service import ROLLUP_NAME, retention_cutoff, run_daily_rollup
+
+NOW = datetime(2026, 6, 15, 12, 0)
+# Two years back: well past the default 13 months of retention
+OLD_DAY = date(2024, 6, 3)
+
+
+def _event_counts(db, day):
+    return db.query(DailyEventCount.event_type, DailyEventCount.count).filter(
+        DailyEventCount.day == day
+    ).all()
+
+
+def _seed_old_day(db):
+    """Five events and one submission on OLD_DAY, rolled up, then raw events purged."""
+    at = datetime.combine(OLD_DAY, datetime.min.time()) + timedelta(hours=10)
+    db.add_all([
+        AnalyticsEvent(event_type="page_view", session_id=f"s{i}", ip_address="10.0.0.1", timestamp=at)
+        for i in range(5)
+    ])
+    submission = ContactSubmission(
+        name="Ada", email="ada@example.com", message="Hello",
+        submitted_at=at, created_at=at, updated_at=at
+    )
+    db.add(submission)
+    db.commit()
+
+    # Rolled up while the day was recent, then retention catches up with it
+    run_daily_rollup(db, now=at + timedelta(days=2))
+    assert _event_counts(db, OLD_DAY) == [("page_view", 5)]
+    run_daily_rollup(db, now=NOW)
+
+    # What retention does to the raw rows (dropping the month's partition)
+    db.query(AnalyticsEvent).delete()
+    db.commit()
+    return submission
+
+
+def test_retention_cutoff():
+    assert retention_cutoff(date(2026, 6, 15), 13) == date(2025, 5, 1)
+    assert retention_cutoff(date(2026, 1, 31), 1) == date(2025, 12, 1)
+    assert retention_cutoff(date(2026, 6, 15), 0) is None
+
+
+def test_change_past_retention_keeps_event_rollups(db):
+    submission = _seed_old_day(db)
+    sketches = db.query(DailySketch.kind, DailySketch.sketch).filter(DailySketch.day == OLD_DAY).all()
+
+    # Patching an old submission puts its day back into the next run
+    later = NOW + timedelta(hours=1)
+    submission.status = ContactStatus.CONTACTED
+    submission.updated_at = later
+    db.commit()
+    assert OLD_DAY in run_daily_rollup(db, now=later + timedelta(minutes=30))
+
+    assert _event_counts(db, OLD_DAY) == [("page_view", 5)]
+    assert db.query(DailySketch.kind, DailySketch.sketch).filter(DailySketch.day == OLD_DAY).all() == sketches
+    assert db.query(DailySubmissionCount.status, DailySubmissionCount.count).filter(
+        DailySubmissionCount.day == OLD_DAY
+    ).all() == [("contacted", 1)]
+
+
+def test_rebuild_past_retention_keeps_event_rollups(db):
+    _seed_old_day(db)
+
+    # scripts/run_rollups.py --rebuild
+    db.query(RollupState).filter(RollupState.name == ROLLUP_NAME).delete()
+    db.commit()
+    run_daily_rollup(db, now=NOW + timedelta(days=1))
+
+    assert _event_counts(db, OLD_DAY) == [("page_view", 5)]
+    assert db.query(DailySketch).filter(DailySketch.day == OLD_DAY).count() == 2
+
+
+def test_days_within_retention_are_rebuilt(db):
+    day = NOW.date() - timedelta(days=3)
+    at = datetime.combine(day, datetime.min.time())
+    db.add_all([AnalyticsEvent(event_type="click", session_id=f"s{i}", timestamp=at) for i in range(3)])
+    submission = ContactSubmission(
+        name="Ada", email="ada@example.com", message="Hello",
+        submitted_at=at, created_at=at, updated_at=at
+    )
+    db.add(submission)
+    db.commit()
+    run_daily_rollup(db, now=NOW)
+    assert _event_counts(db, day) == [("click", 3)]
+
+    db.query(AnalyticsEvent).filter(AnalyticsEvent.session_id == "s0").delete()
+    submission.updated_at = NOW + timedelta(minutes=10)
+    db.commit()
+    run_daily_rollup(db, now=NOW + timedelta(hours=1))
+
+    # Raw events are still retained, so the day is recounted from them
+    assert _event_counts(db, day) == [("click", 2)]
+
+
+def test_summary_merges_sketches_of_different_precision(db, monkeypatch):
+    # A day past retention keeps the precision its sketch was built with
+    _seed_old_day(db)
+    monkeypatch.setattr(settings, "HLL_PRECISION", settings.HLL_PRECISION - 2)
+
+    summary = build_analytics_summary(db, OLD_DAY, OLD_DAY + timedelta(days=1))
+    assert summary.unique_sessions == 5
+
+
+def test_hll_reduce_matches_lower_precision():
+    values = [f"visitor-{i}" for i in range(20000)]
+    high, low = HyperLogLog(14), HyperLogLog(10)
+    high.update(values)
+    low.update(values)
+    assert high.reduce(10).registers == low.registers
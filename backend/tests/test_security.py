@@ -0,0 +1,16 @@
+import asyncio
+from app.core.security import PasswordHasher
+
+
+def test_hasher_counts_every_completed_hash():
+    hasher = PasswordHasher(rounds=4, max_workers=4, max_pending=100)
+
+    async def burst():
+        return await asyncio.gather(*(hasher.hash_async(f"pw-{i}") for i in range(50)))
+
+    try:
+        hashes = asyncio.run(burst())
+    finally:
+        hasher.shutdown()
+    assert len(set(hashes)) == 50
+    assert hasher.stats() == {"in_flight": 0, "capacity": 104, "completed": 50, "rejected": 0}
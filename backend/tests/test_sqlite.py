@@ -0,0 +1,24 @@
+import asyncio
+from app.db.session import AsyncSessionLocal
+from app.db.sqlite import serialize_writes
+
+
+async def _contend():
+    """Two overlapping writers, so the second has to wait on the lock."""
+    order = []
+
+    async def write(name):
+        async with AsyncSessionLocal() as db:
+            async with serialize_writes(db):
+                order.append(f"{name} start")
+                await asyncio.sleep(0.01)
+                order.append(f"{name} end")
+
+    await asyncio.gather(write("a"), write("b"))
+    return order
+
+
+def test_serialize_writes_works_across_event_loops():
+    # Each asyncio.run() is a new loop, as in tests and benchmark runners
+    for _ in range(2):
+        assert asyncio.run(_contend()) == ["a start", "a end", "b start", "b end"]
@@ -0,0 +1,43 @@
+import json
+import os
+import subprocess
+import sys
+from app.core.startup import BACKEND_DIR
+
+# Generous for slow CI machines; about 0.8-1.2 s here
+IMPORT_BUDGET_MS = float(os.environ.get("IMPORT_BUDGET_MS", 3000))
+
+# Only needed once an email is rendered or sent through SendGrid
+DEFERRED_MODULES = ("httpx", "jinja2")
+
+# Run in a fresh interpreter, so nothing is imported yet
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter() - started
+print(json.dumps({"import_ms": imported * 1000, "modules": sorted(sys.modules)}))
+"""
+
+
+def _cold_import() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=BACKEND_DIR,
+        env=os.environ.copy(),
+        capture_output=True,
+        text=True,
+        timeout=60
+    )
+    assert result.returncode == 0, result.stderr[-4000:]
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_cold_import_within_budget():
+    # Best of three, so one slow run on a busy machine doesn't fail the suite
+    runs = [_cold_import() for _ in range(3)]
+    import_ms = min(run["import_ms"] for run in runs)
+    assert import_ms <= IMPORT_BUDGET_MS, f"importing app.main took {import_ms:.0f} ms"
+
+    loaded = set(runs[0]["modules"])
+    assert not loaded.intersection(DEFERRED_MODULES)